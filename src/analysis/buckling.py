@@ -0,0 +1,125 @@
+from dataclasses import dataclass
+
+import numpy as np
+import scipy.linalg
+from numpy.typing import NDArray
+from scipy import sparse as sp
+from scipy.sparse.linalg import LinearOperator, eigsh
+
+from models.partition import as_dense
+from models.truss import Truss
+
+
+@dataclass
+class BucklingResult:
+    """Critical load factors of a truss and its buckling modes.
+
+    The nodal forces of the truss times a load factor buckle the truss.
+    mode_shapes holds one column per mode, scaled to a largest component
+    of 1 and arranged by node (rows 2i and 2i + 1 belong to node i), with
+    zeros on the restrained dofs. axial_forces are the element forces of
+    the linear analysis under the reference loads."""
+
+    load_factors: NDArray[np.float64]
+    mode_shapes: NDArray[np.float64]
+    axial_forces: NDArray[np.float64]
+
+    @property
+    def critical_load_factor(self) -> float:
+        return float(self.load_factors[0])
+
+    @property
+    def number_of_modes(self) -> int:
+        return len(self.load_factors)
+
+
+@dataclass
+class BucklingAnalysis:
+    """Lowest positive load factors lambda of (K + lambda K_G) phi = 0,
+    restricted to the free dofs, K_G being the geometric stiffness of the
+    axial forces of a linear static analysis of the truss.
+
+    With the default shift the problem is solved for mu = 1 / lambda as
+    -K_G phi = mu K phi by a Lanczos iteration (eigsh) on K^-1 K_G, i.e.
+    shift-invert about 0, which reuses the cached factorization of the
+    truss. A nonzero shift, an estimate of the load factor, finds the
+    modes closest to it in the buckling mode of eigsh instead, which
+    factorizes K + shift K_G once. Only systems too small for Lanczos are
+    solved densely."""
+
+    number_of_modes: int = 4
+    shift: float = 0.0
+    tolerance: float = 0.0
+
+    def run(self, truss: Truss) -> BucklingResult:
+        truss.set_nodal_displacements()
+        axial_forces = truss.get_element_results().axial_forces
+        partition = truss.get_partitioned_system()
+        free_dofs = partition.free_dofs
+        stiffness = partition.stiffness_ff
+        geometric = truss.get_geometric_stiffness_matrix(axial_forces)
+        geometric = (
+            sp.csr_matrix(geometric)[free_dofs][:, free_dofs]
+            if sp.issparse(geometric)
+            else geometric[np.ix_(free_dofs, free_dofs)]
+        )
+
+        size = len(free_dofs)
+        number_of_modes = min(self.number_of_modes, size)
+        if number_of_modes >= size - 1:
+            inverses, eigenvectors = scipy.linalg.eigh(
+                -as_dense(geometric), as_dense(stiffness)
+            )
+        elif self.shift == 0:
+            factorization = truss.factorize()
+            inverses, eigenvectors = eigsh(
+                -geometric,
+                k=number_of_modes,
+                M=stiffness,
+                Minv=LinearOperator(
+                    (size, size), matvec=factorization.solve, dtype=np.float64
+                ),
+                which="LA",
+                tol=self.tolerance,
+            )
+        else:
+            load_factors, eigenvectors = eigsh(
+                stiffness,
+                k=number_of_modes,
+                M=-geometric,
+                sigma=self.shift,
+                mode="buckling",
+                which="LM",
+                tol=self.tolerance,
+            )
+            inverses = 1 / load_factors
+
+        # Negative factors buckle the truss under reversed loads. Inverses
+        # at round-off level, against the ratio of the geometric to the
+        # elastic stiffness, belong to the dofs K_G does not couple.
+        scale = max(
+            np.abs(inverses).max(initial=0),
+            np.abs(geometric.diagonal()).max(initial=0)
+            / np.abs(stiffness.diagonal()).max(initial=1),
+        )
+        positive = np.flatnonzero(inverses > 1e-10 * scale)
+        if len(positive) == 0:
+            raise ValueError(
+                "The truss does not buckle, none of its members is "
+                "compressed by its nodal forces."
+            )
+        positive = positive[np.argsort(-inverses[positive])]
+        positive = positive[:number_of_modes]
+        eigenvectors = eigenvectors[:, positive]
+        largest = np.argmax(np.abs(eigenvectors), axis=0)
+        eigenvectors = (
+            eigenvectors / eigenvectors[largest, np.arange(len(positive))]
+        )
+
+        mode_shapes = np.zeros((truss.get_number_of_dofs(), len(positive)))
+        mode_shapes[free_dofs] = eigenvectors
+        return BucklingResult(
+            load_factors=1 / inverses[positive],
+            mode_shapes=mode_shapes[truss.node_store.dofs.ravel()],
+            axial_forces=axial_forces,
+        )
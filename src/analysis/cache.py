@@ -0,0 +1,174 @@
+import os
+import tempfile
+from pathlib import Path
+from typing import Callable, Optional, Union
+
+import numpy as np
+from numpy.typing import NDArray
+
+from models.factorization import (
+    BandedCholeskyFactorization,
+    CholeskyFactorization,
+    Factorization,
+)
+from models.io import load_results, save_results
+from models.solvers import get_solver
+from models.system_cache import CacheStats
+from models.truss import Truss
+
+PathLike = Union[str, Path]
+
+
+class AnalysisCache:
+    """Content addressed on-disk cache of linear analyses.
+
+    Results are stored in the binary results format under the fingerprint
+    of the truss, so a repeat analysis of an unchanged model is a file read
+    instead of a solve, in this process or any later one. With
+    store_factorizations the factorization is kept as well, keyed by the
+    fingerprint including the dof numbering and by the solver backend, so
+    that new load cases on a cached model skip the factorization. Only
+    the dense and banded Cholesky factors are stored, as plain arrays read
+    back without unpickling, not SuperLU or incomplete LU objects. The
+    results and factors are trusted as they are, so the directory must
+    only be writable by the user of the cache.
+
+    Entries are evicted least recently used first once the files exceed
+    max_bytes, recency being the modification time of the files."""
+
+    def __init__(
+        self,
+        directory: PathLike,
+        max_bytes: int = 1 << 30,
+        store_factorizations: bool = False,
+    ) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.store_factorizations = store_factorizations
+        self.stats = CacheStats()
+
+    def analyse(self, truss: Truss) -> bool:
+        """Set the displacements, stresses and reactions of the truss, from
+        the cache if this model has been analysed before. Returns whether
+        the results came from the cache."""
+
+        path = self.directory / f"{truss.fingerprint()}.results"
+        if self.__hit("results", path):
+            results = load_results(path)
+            truss.node_store.displacements[:] = results.displacements
+            truss.node_store.reactions[:] = results.reactions
+            truss.element_store.stresses[:] = results.stresses
+            return True
+
+        self.factorize(truss)
+        truss.set_nodal_displacements()
+        truss.set_element_stresses()
+        truss.set_reactions()
+        self.__write(path, lambda file: save_results(truss, file))
+        return False
+
+    def factorize(self, truss: Truss) -> Factorization:
+        """Factorize the truss, reusing a factorization stored on disk when
+        store_factorizations is enabled."""
+
+        if not self.store_factorizations:
+            return truss.factorize()
+
+        backend = get_solver(truss.solver).name
+        path = self.directory / (
+            f"{truss.fingerprint(include_dofs=True)}.{backend}.factorization"
+        )
+        if self.__hit("factorization", path):
+            factorization = _read_factorization(path)
+            truss.use_factorization(factorization)
+            return factorization
+
+        factorization = truss.factorize()
+        factor = factorization.stored_factor()
+        if factor is not None:
+            backend = factorization.backend
+            self.__write(
+                path, lambda file: _write_factor(file, backend, factor)
+            )
+        return factorization
+
+    def size(self) -> int:
+        """Total size in bytes of the cached files."""
+
+        return sum(path.stat().st_size for path in self.__entries())
+
+    def clear(self) -> None:
+        """Delete every cached file."""
+
+        for path in self.__entries():
+            path.unlink(missing_ok=True)
+
+    def __entries(self) -> list[Path]:
+        return [
+            path
+            for pattern in ("*.results", "*.factorization")
+            for path in self.directory.glob(pattern)
+        ]
+
+    def __hit(self, name: str, path: Path) -> bool:
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            self.stats.misses += 1
+            self.stats.entry_misses[name] = (
+                self.stats.entry_misses.get(name, 0) + 1
+            )
+            return False
+        self.stats.hits += 1
+        self.stats.entry_hits[name] = self.stats.entry_hits.get(name, 0) + 1
+        return True
+
+    def __write(self, path: Path, write: Callable[[Path], object]) -> None:
+        """Write through a temporary file, so that concurrent readers never
+        see a partial entry, then evict down to max_bytes."""
+
+        handle, temporary = tempfile.mkstemp(dir=self.directory)
+        os.close(handle)
+        try:
+            write(Path(temporary))
+            os.replace(temporary, path)
+        finally:
+            Path(temporary).unlink(missing_ok=True)
+        self.__evict(keep=path)
+
+    def __evict(self, keep: Optional[Path] = None) -> None:
+        entries = []
+        for path in self.__entries():
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries, key=lambda entry: entry[0]):
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            path.unlink(missing_ok=True)
+            total -= size
+
+
+_FACTORIZATIONS: dict[str, Callable[[NDArray[np.float64]], Factorization]] = {
+    "dense": CholeskyFactorization.from_factor,
+    "banded": BandedCholeskyFactorization.from_factor,
+}
+
+
+def _write_factor(
+    path: Path, backend: str, factor: NDArray[np.float64]
+) -> None:
+    # Through a file object, np.savez would append .npz to a path.
+    with open(path, "wb") as file:
+        np.savez(file, backend=backend, factor=factor)
+
+
+def _read_factorization(path: Path) -> Factorization:
+    with np.load(path, allow_pickle=False) as data:
+        return _FACTORIZATIONS[str(data["backend"])](data["factor"])
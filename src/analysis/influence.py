@@ -0,0 +1,187 @@
+from dataclasses import dataclass
+from typing import Sequence
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+from scipy import sparse as sp
+
+from models.truss import Truss
+
+
+@dataclass
+class AxleTrain:
+    """Axle loads of a moving vehicle and the distance of every axle behind
+    the leading one. Any sequences are accepted and stored as arrays."""
+
+    loads: NDArray[np.float64]
+    offsets: NDArray[np.float64]
+
+    def __post_init__(self) -> None:
+        self.loads = np.asarray(self.loads, dtype=np.float64).ravel()
+        self.offsets = np.asarray(self.offsets, dtype=np.float64).ravel()
+        if self.loads.shape != self.offsets.shape:
+            raise ValueError("Every axle needs a load and an offset.")
+
+
+@dataclass
+class Envelope:
+    """Extreme member forces of a moving load, together with the position
+    of the leading axle that causes them and whether the train was
+    crossing in reverse, its axles ahead of the leading one."""
+
+    max: NDArray[np.float64]
+    min: NDArray[np.float64]
+    max_position: NDArray[np.float64]
+    min_position: NDArray[np.float64]
+    max_reversed: NDArray[np.bool_]
+    min_reversed: NDArray[np.bool_]
+
+
+@dataclass
+class InfluenceLines:
+    """Member axial forces for a unit load at every node of a load path.
+
+    member_forces has one row per element and one column per path node,
+    positions holds the distance of every path node from the first one
+    along the path."""
+
+    path_nodes: NDArray[np.int64]
+    positions: NDArray[np.float64]
+    member_forces: NDArray[np.float64]
+
+    def interpolation(self, x: ArrayLike) -> sp.csr_matrix:
+        """Returns the (len(x), n_positions) matrix that interpolates the
+        influence ordinates linearly between the path nodes at the
+        positions x. Rows of positions off the path are empty."""
+
+        x = np.asarray(x, dtype=np.float64).ravel()
+        on_path = (x >= self.positions[0]) & (x <= self.positions[-1])
+        rows = np.flatnonzero(on_path)
+        panels = np.clip(
+            np.searchsorted(self.positions, x[rows], side="right") - 1,
+            0,
+            len(self.positions) - 2,
+        )
+        start = self.positions[panels]
+        ratio = (x[rows] - start) / (self.positions[panels + 1] - start)
+        return sp.csr_matrix(
+            (
+                np.concatenate((1 - ratio, ratio)),
+                (np.tile(rows, 2), np.concatenate((panels, panels + 1))),
+            ),
+            shape=(len(x), len(self.positions)),
+        )
+
+    def forces_at(self, x: ArrayLike) -> NDArray[np.float64]:
+        """Member forces, (n_elements, len(x)), of a unit load at the
+        positions x along the path."""
+
+        return (self.interpolation(x) @ self.member_forces.T).T
+
+    def envelope(
+        self,
+        train: AxleTrain,
+        both_directions: bool = True,
+        chunk_size: int = 1024,
+    ) -> Envelope:
+        """Envelope of the member forces while the train crosses the path.
+
+        The member forces are piecewise linear in the position of the
+        train, so their extremes occur when an axle is on a path node and
+        only these positions of the leading axle are evaluated. With
+        both_directions the train also crosses the other way round."""
+
+        offsets = [train.offsets]
+        if both_directions:
+            offsets.append(-train.offsets)
+        trains = [
+            (offset, np.unique(self.positions[:, np.newaxis] + offset))
+            for offset in offsets
+        ]
+        number_of_elements = self.member_forces.shape[0]
+        envelope = Envelope(
+            max=np.full(number_of_elements, -np.inf),
+            min=np.full(number_of_elements, np.inf),
+            max_position=np.zeros(number_of_elements),
+            min_position=np.zeros(number_of_elements),
+            max_reversed=np.zeros(number_of_elements, dtype=bool),
+            min_reversed=np.zeros(number_of_elements, dtype=bool),
+        )
+        for reversed_, (offset, leads) in enumerate(trains):
+            for start in range(0, len(leads), chunk_size):
+                lead = leads[start : start + chunk_size]
+                weights = sum(
+                    load * self.interpolation(lead - axle)
+                    for load, axle in zip(train.loads, offset)
+                )
+                forces = weights @ self.member_forces.T
+                self.__update(envelope, forces, lead, bool(reversed_))
+        return envelope
+
+    @staticmethod
+    def __update(
+        envelope: Envelope,
+        forces: NDArray[np.float64],
+        lead: NDArray[np.float64],
+        reversed_: bool,
+    ) -> None:
+        for extreme, pick, better in (
+            ("max", np.argmax, np.greater),
+            ("min", np.argmin, np.less),
+        ):
+            index = pick(forces, axis=0)
+            value = forces[index, np.arange(forces.shape[1])]
+            current = getattr(envelope, extreme)
+            improved = better(value, current)
+            current[improved] = value[improved]
+            getattr(envelope, f"{extreme}_position")[improved] = lead[
+                index[improved]
+            ]
+            getattr(envelope, f"{extreme}_reversed")[improved] = reversed_
+
+
+def influence_lines(
+    truss: Truss,
+    path_nodes: Sequence[int],
+    direction: ArrayLike = (0.0, -1.0),
+) -> InfluenceLines:
+    """Influence lines of the member axial forces for a unit load moving
+    along path_nodes, indices of nodes of the truss in travel order.
+
+    All the unit load positions form a single block of load cases that is
+    solved against one factorization of the truss. direction is the unit
+    vector of the load, downwards by default."""
+
+    nodes: NDArray[np.int64] = np.asarray(path_nodes, dtype=np.int64).ravel()
+    if len(nodes) < 2:
+        raise ValueError("A load path needs at least two nodes.")
+    unit = np.asarray(direction, dtype=np.float64)
+    unit = unit / np.linalg.norm(unit)
+
+    positions: NDArray[np.float64] = np.concatenate(
+        (
+            np.zeros(1),
+            np.cumsum(
+                np.linalg.norm(
+                    np.diff(truss.node_store.coordinates[nodes], axis=0),
+                    axis=1,
+                )
+            ),
+        )
+    )
+    if np.any(np.diff(positions) <= 0):
+        raise ValueError("The load path visits the same point twice.")
+
+    # The last, unloaded, case holds the effect of the settlements, which
+    # is removed from the unit load cases.
+    forces = np.zeros((truss.get_number_of_dofs(), len(nodes) + 1))
+    columns = np.arange(len(nodes))
+    forces[2 * nodes, columns] = unit[0]
+    forces[2 * nodes + 1, columns] = unit[1]
+    stresses = truss.solve_load_cases(forces).stresses
+    return InfluenceLines(
+        path_nodes=nodes,
+        positions=positions,
+        member_forces=(stresses[:, :-1] - stresses[:, -1:])
+        * truss.element_store.area[:, np.newaxis],
+    )
@@ -0,0 +1,102 @@
+from dataclasses import dataclass
+
+import numpy as np
+import scipy.linalg
+from numpy.typing import NDArray
+from scipy import sparse as sp
+from scipy.sparse.linalg import LinearOperator, eigsh
+
+from models.partition import as_dense
+from models.truss import Truss
+
+
+@dataclass
+class ModalResult:
+    """Natural frequencies and mass normalized mode shapes of a truss.
+
+    mode_shapes holds one column per mode, arranged by node (rows 2i and
+    2i + 1 belong to node i), with zeros on the restrained dofs."""
+
+    angular_frequencies: NDArray[np.float64]
+    mode_shapes: NDArray[np.float64]
+
+    @property
+    def frequencies(self) -> NDArray[np.float64]:
+        """Natural frequencies in Hz."""
+
+        return self.angular_frequencies / (2 * np.pi)
+
+    @property
+    def periods(self) -> NDArray[np.float64]:
+        return 1 / self.frequencies
+
+    @property
+    def number_of_modes(self) -> int:
+        return len(self.angular_frequencies)
+
+
+@dataclass
+class ModalAnalysis:
+    """Lowest natural frequencies of a truss from K phi = omega^2 M phi,
+    restricted to the free dofs.
+
+    The modes closest to shift (an eigenvalue omega^2, 0 for the lowest
+    ones) are found by a shift-invert Lanczos iteration (eigsh). With the
+    default shift the cached factorization of the truss is reused as the
+    inverse operator, otherwise K - shift M is factorized once. Only
+    systems too small for Lanczos are solved densely."""
+
+    number_of_modes: int = 6
+    lumped: bool = True
+    shift: float = 0.0
+    tolerance: float = 0.0
+
+    def run(self, truss: Truss) -> ModalResult:
+        partition = truss.get_partitioned_system()
+        free_dofs = partition.free_dofs
+        stiffness = partition.stiffness_ff
+        mass = truss.get_mass_matrix(self.lumped)
+        mass = (
+            sp.csr_matrix(mass)[free_dofs][:, free_dofs]
+            if sp.issparse(mass)
+            else mass[np.ix_(free_dofs, free_dofs)]
+        )
+        if not mass.diagonal().any():
+            raise ValueError(
+                "The truss has no mass, set the density of its elements."
+            )
+
+        size = len(free_dofs)
+        number_of_modes = min(self.number_of_modes, size)
+        if number_of_modes >= size - 1:
+            eigenvalues, eigenvectors = scipy.linalg.eigh(
+                as_dense(stiffness),
+                as_dense(mass),
+                subset_by_index=(0, number_of_modes - 1),
+            )
+        else:
+            inverse = None
+            if self.shift == 0:
+                factorization = truss.factorize()
+                inverse = LinearOperator(
+                    (size, size), matvec=factorization.solve, dtype=np.float64
+                )
+            eigenvalues, eigenvectors = eigsh(
+                stiffness,
+                k=number_of_modes,
+                M=mass,
+                sigma=self.shift,
+                which="LM",
+                OPinv=inverse,
+                tol=self.tolerance,
+            )
+            order = np.argsort(eigenvalues)
+            eigenvalues = eigenvalues[order]
+            eigenvectors = eigenvectors[:, order]
+
+        mode_shapes = np.zeros((truss.get_number_of_dofs(), number_of_modes))
+        mode_shapes[free_dofs] = eigenvectors
+        return ModalResult(
+            angular_frequencies=np.sqrt(np.clip(eigenvalues, 0, None)),
+            mode_shapes=mode_shapes[truss.node_store.dofs.ravel()],
+        )
@@ -0,0 +1,314 @@
+import time
+from dataclasses import dataclass, field
+from typing import Optional, Union
+
+import numpy as np
+from numpy.typing import NDArray
+from scipy import sparse as sp
+
+from models.kernels import CorotationalBatch, corotational_elements
+from models.solvers import SolverBackend, get_solver
+from models.truss import Truss
+
+
+@dataclass
+class LoadStep:
+    """Convergence history and timing of a single load step."""
+
+    step: int
+    load_factor: float
+    iterations: int
+    residual_norms: list[float]
+    cutbacks: int
+    time: float
+    converged: bool
+
+
+@dataclass
+class NonlinearResult:
+    """Final state of a geometrically nonlinear analysis.
+
+    displacements are arranged by node (rows 2i and 2i + 1 belong to node
+    i), axial_forces by element. load_factors and history hold the load
+    factor and the displacements after every converged step."""
+
+    displacements: NDArray[np.float64]
+    axial_forces: NDArray[np.float64]
+    load_factor: float
+    converged: bool
+    steps: list[LoadStep] = field(default_factory=list)
+    load_factors: list[float] = field(default_factory=list)
+    history: list[NDArray[np.float64]] = field(default_factory=list)
+
+
+class _StepFailed(Exception):
+    pass
+
+
+@dataclass
+class NewtonRaphson:
+    """Corotational Newton-Raphson analysis of large displacements under
+    the nodal forces of the truss scaled by a load factor from 0 to 1.
+
+    With load control the load factor grows by 1 / steps per step. With
+    arc_length the steps follow the equilibrium path at a constant
+    cylindrical arc length instead (Crisfield), so that limit points such
+    as snap-through can be passed, and the last step returns to load
+    control to finish exactly at a load factor of 1. A step that does not
+    converge within max_iterations is retried with half the increment up to
+    max_cutbacks times, under load control the increment then doubles back
+    towards 1 / steps after every converged step. The analysis stops after
+    max_steps steps, 10 * steps by default, if it has not reached a load
+    factor of 1 by then.
+
+    The sparsity pattern of the truss is restricted once to its free dofs,
+    so every iteration only refills the numeric tangent values computed by
+    the vectorized corotational kernel. The tangent is not positive
+    definite past limit points, hence the sparse LU default solver. Prescribed
+    displacements are imposed in full from the first step. The final state
+    is written back to the displacements, stresses and reactions of the
+    truss."""
+
+    truss: Truss
+    steps: int = 10
+    tolerance: float = 1e-8
+    max_iterations: int = 25
+    arc_length: bool = False
+    max_steps: Optional[int] = None
+    max_cutbacks: int = 5
+    solver: Union[str, SolverBackend] = "sparse"
+
+    def __post_init__(self) -> None:
+        truss = self.truss
+        partition = truss.get_partitioned_system()
+        self.free = partition.free_dofs
+        self.restrained = partition.restrained_dofs
+        self.pattern, self.keep = truss.get_sparsity_pattern().restrict(
+            self.free
+        )
+        self.reference = truss.node_store.scatter(truss.node_store.forces)
+        self.springs = truss.node_store.scatter(truss.node_store.springs)
+        self.backend = get_solver(self.solver)
+        self.scale = max(float(np.linalg.norm(self.reference[self.free])), 1)
+
+    def __state(
+        self, displacements: NDArray[np.float64]
+    ) -> tuple[CorotationalBatch, NDArray[np.float64]]:
+        """Returns the element state and the dof ordered internal forces."""
+
+        store = self.truss.node_store
+        batch = corotational_elements(
+            store.coordinates,
+            self.truss.element_store.connectivity,
+            self.truss.element_store.youngs_modulus,
+            self.truss.element_store.area,
+            store.gather(displacements),
+            store.dofs,
+        )
+        internal = np.bincount(
+            batch.tangent.dofs.ravel(),
+            weights=batch.internal_forces.ravel(),
+            minlength=store.number_of_dofs,
+        )
+        return batch, internal + self.springs * displacements
+
+    def __tangent(self, batch: CorotationalBatch) -> sp.csr_matrix:
+        tangent = self.pattern.assemble(
+            batch.tangent.stiffness.reshape(-1)[self.keep]
+        )
+        if np.any(self.springs):
+            tangent = tangent + sp.diags(self.springs[self.free])
+        return tangent
+
+    def __residual(
+        self, displacements: NDArray[np.float64], load_factor: float
+    ) -> tuple[CorotationalBatch, NDArray[np.float64], float]:
+        batch, internal = self.__state(displacements)
+        residual = (load_factor * self.reference - internal)[self.free]
+        return batch, residual, float(np.linalg.norm(residual)) / self.scale
+
+    def __load_control(
+        self,
+        displacements: NDArray[np.float64],
+        load_factor: float,
+        norms: list[float],
+    ) -> NDArray[np.float64]:
+        """Newton iterations at a fixed load factor."""
+
+        displacements = displacements.copy()
+        for _ in range(self.max_iterations + 1):
+            batch, residual, norm = self.__residual(displacements, load_factor)
+            norms.append(norm)
+            if norm <= self.tolerance:
+                return displacements
+            if len(norms) > self.max_iterations:
+                break
+            factorization = self.backend.factorize(self.__tangent(batch))
+            displacements[self.free] += factorization.solve(residual)
+        raise _StepFailed
+
+    def __arc_length(
+        self,
+        displacements: NDArray[np.float64],
+        load_factor: float,
+        arc: float,
+        previous: Optional[NDArray[np.float64]],
+        norms: list[float],
+    ) -> tuple[NDArray[np.float64], float]:
+        """Predictor along the tangent and corrector iterations on the
+        cylinder |delta u| = arc around the last converged state."""
+
+        reference = self.reference[self.free]
+        batch, _ = self.__state(displacements)
+        tangential = self.backend.factorize(self.__tangent(batch)).solve(
+            reference
+        )
+        sign = 1.0
+        if previous is not None and previous @ tangential < 0:
+            sign = -1.0
+        load_increment = float(sign * arc / np.linalg.norm(tangential))
+        increment = load_increment * tangential
+
+        for _ in range(self.max_iterations + 1):
+            trial = displacements.copy()
+            trial[self.free] += increment
+            batch, residual, norm = self.__residual(
+                trial, load_factor + load_increment
+            )
+            norms.append(norm)
+            if norm <= self.tolerance:
+                return trial, load_factor + load_increment
+            if len(norms) > self.max_iterations:
+                break
+
+            factorization = self.backend.factorize(self.__tangent(batch))
+            correction = factorization.solve(residual)
+            tangential = factorization.solve(reference)
+            shifted = increment + correction
+            a = tangential @ tangential
+            b = 2 * tangential @ shifted
+            c = shifted @ shifted - arc ** 2
+            discriminant = b ** 2 - 4 * a * c
+            if discriminant < 0:
+                break
+            roots = (-b + np.array([1, -1]) * np.sqrt(discriminant)) / (2 * a)
+            # Keep the root that continues in the direction of the step.
+            candidates = shifted + roots[:, np.newaxis] * tangential
+            best = int(np.argmax(candidates @ increment))
+            increment = candidates[best]
+            load_increment += float(roots[best])
+        raise _StepFailed
+
+    def run(self) -> NonlinearResult:
+        truss = self.truss
+        displacements = np.zeros(truss.get_number_of_dofs())
+        displacements[self.restrained] = truss.node_store.scatter(
+            truss.node_store.prescribed
+        )[self.restrained]
+        load_factor = 0.0
+        increment = 1 / self.steps
+        arc = 0.0
+        if self.arc_length:
+            # The arc of the first step matches a load increment of 1 / steps
+            # along the initial tangent.
+            batch, _ = self.__state(displacements)
+            tangential = self.backend.factorize(self.__tangent(batch)).solve(
+                self.reference[self.free]
+            )
+            arc = increment * float(np.linalg.norm(tangential))
+        previous: Optional[NDArray[np.float64]] = None
+        result = NonlinearResult(
+            displacements=np.zeros(0),
+            axial_forces=np.zeros(0),
+            load_factor=0.0,
+            converged=False,
+        )
+        # Cutbacks take extra steps, so the budget is not the step count.
+        max_steps = self.max_steps or 10 * self.steps
+
+        step = 0
+        while load_factor < 1 - 1e-12 and step < max_steps:
+            step += 1
+            start = time.perf_counter()
+            norms: list[float] = []
+            for cutbacks in range(self.max_cutbacks + 1):
+                norms = []
+                try:
+                    if self.arc_length and load_factor + increment < 1:
+                        state, factor = self.__arc_length(
+                            displacements, load_factor, arc, previous, norms
+                        )
+                    else:
+                        factor = min(load_factor + increment, 1.0)
+                        state = self.__load_control(
+                            displacements, factor, norms
+                        )
+                    break
+                except _StepFailed:
+                    increment /= 2
+                    arc /= 2
+            else:
+                result.steps.append(
+                    LoadStep(
+                        step=step,
+                        load_factor=load_factor,
+                        iterations=len(norms) - 1,
+                        residual_norms=norms,
+                        cutbacks=cutbacks,
+                        time=time.perf_counter() - start,
+                        converged=False,
+                    )
+                )
+                break
+
+            previous = (state - displacements)[self.free]
+            if self.arc_length and factor > load_factor:
+                # Estimate of the next load increment along the path.
+                increment = factor - load_factor
+            elif not self.arc_length:
+                increment = min(2 * increment, 1 / self.steps)
+            displacements, load_factor = state, factor
+            result.steps.append(
+                LoadStep(
+                    step=step,
+                    load_factor=load_factor,
+                    iterations=len(norms) - 1,
+                    residual_norms=norms,
+                    cutbacks=cutbacks,
+                    time=time.perf_counter() - start,
+                    converged=True,
+                )
+            )
+            result.load_factors.append(load_factor)
+            result.history.append(
+                truss.node_store.gather(displacements).ravel()
+            )
+
+        result.converged = load_factor >= 1 - 1e-12
+        result.load_factor = load_factor
+        self.__store(result, displacements)
+        return result
+
+    def __store(
+        self, result: NonlinearResult, displacements: NDArray[np.float64]
+    ) -> None:
+        """Write the final state to the result and to the truss."""
+
+        truss = self.truss
+        batch, internal = self.__state(displacements)
+        reactions = np.zeros_like(internal)
+        reactions[self.restrained] = (
+            internal - result.load_factor * self.reference
+        )[self.restrained]
+        # The springs on free dofs push back with -k u.
+        springs = self.springs[self.free]
+        reactions[self.free] = -springs * displacements[self.free]
+        result.displacements = truss.node_store.gather(displacements).ravel()
+        result.axial_forces = batch.axial_forces
+        truss.node_store.displacements[:] = truss.node_store.gather(
+            displacements
+        )
+        truss.node_store.reactions[:] = truss.node_store.gather(reactions)
+        truss.element_store.stresses[:] = (
+            batch.axial_forces / truss.element_store.area
+        )
@@ -0,0 +1,130 @@
+import time
+from dataclasses import dataclass, field
+from typing import Optional, Union
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
+from models.kernels import element_geometry
+from models.truss import Truss
+
+
+@dataclass
+class SizingIteration:
+    """Weight and timings of a single sizing iteration."""
+
+    iteration: int
+    weight: float
+    max_stress_ratio: float
+    max_area_change: float
+    assembly_time: float
+    solve_time: float
+    total_time: float
+
+
+@dataclass
+class SizingResult:
+    """Final areas and per iteration history of a sizing run."""
+
+    areas: NDArray[np.float64]
+    converged: bool
+    iterations: list[SizingIteration] = field(default_factory=list)
+
+    @property
+    def weight_history(self) -> NDArray[np.float64]:
+        return np.array([it.weight for it in self.iterations])
+
+
+@dataclass
+class FullyStressedDesign:
+    """Fully stressed sizing of the element areas of a truss.
+
+    Every iteration resizes each member with its stress ratio against the
+    allowable stress, A_new = A |stress| / allowable, taking the worst load
+    case and the worst member of each group. The truss is analysed in
+    place, so the sparsity pattern and the dof numbering are reused and
+    each iteration only costs a numeric re-assembly and a solve.
+
+    forces is an optional node ordered (n_dofs, n_cases) block of load
+    cases, it defaults to the nodal forces of the truss. groups assigns a
+    group label to every element, members of a group share an area. The
+    weight is density * sum(A * L)."""
+
+    truss: Truss
+    allowable_stress: Union[ArrayLike, float]
+    forces: Optional[NDArray[np.float64]] = None
+    groups: Optional[ArrayLike] = None
+    min_area: Union[ArrayLike, float] = 1e-8
+    max_area: Union[ArrayLike, float] = np.inf
+    density: float = 1.0
+    tolerance: float = 1e-4
+    max_iterations: int = 50
+
+    def __group_indices(self) -> NDArray[np.int64]:
+        """Returns the group index of every element."""
+
+        number_of_elements = len(self.truss.element_store)
+        if self.groups is None:
+            return np.arange(number_of_elements)
+        _, indices = np.unique(
+            np.asarray(self.groups).reshape(number_of_elements),
+            return_inverse=True,
+        )
+        return indices.astype(np.int64)
+
+    def run(self) -> SizingResult:
+        """Iterate until the largest relative change of the areas drops
+        below tolerance or max_iterations is reached."""
+
+        truss = self.truss
+        store = truss.element_store
+        lengths = element_geometry(
+            truss.node_store.coordinates, store.connectivity
+        ).lengths
+        groups = self.__group_indices()
+        forces = (
+            truss.node_store.forces.ravel()
+            if self.forces is None
+            else self.forces
+        )
+        result = SizingResult(areas=store.area.copy(), converged=False)
+
+        for iteration in range(1, self.max_iterations + 1):
+            start = time.perf_counter()
+            truss.assemble_stiffness_matrix()
+            assembled = time.perf_counter()
+            load_cases = truss.solve_load_cases(forces)
+            solved = time.perf_counter()
+
+            stress_ratio = np.max(
+                np.abs(load_cases.stresses)
+                / np.reshape(self.allowable_stress, (-1, 1)),
+                axis=1,
+            )
+            required = store.area * stress_ratio
+            group_area = np.zeros(groups.max(initial=-1) + 1)
+            np.maximum.at(group_area, groups, required)
+            areas = np.clip(group_area[groups], self.min_area, self.max_area)
+            change = float(
+                np.max(np.abs(areas - store.area) / store.area, initial=0)
+            )
+            store.area[:] = areas
+            store.touch_sections()
+
+            result.iterations.append(
+                SizingIteration(
+                    iteration=iteration,
+                    weight=float(self.density * np.sum(areas * lengths)),
+                    max_stress_ratio=float(stress_ratio.max(initial=0)),
+                    max_area_change=change,
+                    assembly_time=assembled - start,
+                    solve_time=solved - assembled,
+                    total_time=time.perf_counter() - start,
+                )
+            )
+            if change <= self.tolerance:
+                result.converged = True
+                break
+
+        result.areas = store.area.copy()
+        return result
@@ -0,0 +1,252 @@
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Any, Iterator, Optional, Sequence, Union
+
+import numpy as np
+from numpy.typing import NDArray
+
+from models.solvers import SolverBackend
+from models.store import TrussArrays
+from models.truss import Truss
+
+
+@dataclass
+class Variant:
+    """Section properties and nodal forces of one truss variant.
+
+    forces is node ordered, rows 2i and 2i + 1 hold the forces of node i."""
+
+    youngs_modulus: NDArray[np.float64]
+    area: NDArray[np.float64]
+    forces: NDArray[np.float64]
+
+
+class VariantSource:
+    """Produces the variants of a sweep by index.
+
+    variant is called in the worker processes with a generator seeded from
+    the sweep seed and the variant index only, so the results do not depend
+    on the worker count or the chunk size."""
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+    def variant(
+        self, index: int, rng: np.random.Generator, base: TrussArrays
+    ) -> Variant:
+        raise NotImplementedError
+
+
+class ParameterGrid(VariantSource):
+    """Cartesian product of scale factors applied to the base youngs
+    modulus, area and nodal forces."""
+
+    def __init__(
+        self,
+        youngs_modulus_factors: Sequence[float] = (1.0,),
+        area_factors: Sequence[float] = (1.0,),
+        force_factors: Sequence[float] = (1.0,),
+    ) -> None:
+        self.factors = list(
+            itertools.product(
+                youngs_modulus_factors, area_factors, force_factors
+            )
+        )
+
+    def __len__(self) -> int:
+        return len(self.factors)
+
+    def variant(
+        self, index: int, rng: np.random.Generator, base: TrussArrays
+    ) -> Variant:
+        youngs_modulus_factor, area_factor, force_factor = self.factors[index]
+        return Variant(
+            youngs_modulus=base.youngs_modulus * youngs_modulus_factor,
+            area=base.area * area_factor,
+            forces=base.forces.ravel() * force_factor,
+        )
+
+
+class RandomPerturbation(VariantSource):
+    """Monte Carlo sampler that perturbs the youngs modulus and the area of
+    every element and every nodal force with independent lognormal factors
+    of the given coefficients of variation."""
+
+    def __init__(
+        self,
+        samples: int,
+        youngs_modulus_cov: float = 0.0,
+        area_cov: float = 0.0,
+        force_cov: float = 0.0,
+    ) -> None:
+        self.samples = samples
+        self.youngs_modulus_cov = youngs_modulus_cov
+        self.area_cov = area_cov
+        self.force_cov = force_cov
+
+    def __len__(self) -> int:
+        return self.samples
+
+    @staticmethod
+    def __factors(
+        rng: np.random.Generator, cov: float, size: int
+    ) -> NDArray[np.float64]:
+        if cov == 0:
+            return np.ones(size)
+        sigma = np.sqrt(np.log1p(cov ** 2))
+        return rng.lognormal(-(sigma ** 2) / 2, sigma, size)
+
+    def variant(
+        self, index: int, rng: np.random.Generator, base: TrussArrays
+    ) -> Variant:
+        forces = base.forces.ravel()
+        return Variant(
+            youngs_modulus=base.youngs_modulus
+            * self.__factors(
+                rng, self.youngs_modulus_cov, len(base.youngs_modulus)
+            ),
+            area=base.area
+            * self.__factors(rng, self.area_cov, len(base.area)),
+            forces=forces * self.__factors(rng, self.force_cov, len(forces)),
+        )
+
+
+@dataclass
+class SweepResults:
+    """Aggregated results of a sweep, one row per variant. displacements
+    are node ordered and reactions follow Truss.get_supported_dofs."""
+
+    displacements: NDArray[np.float64]
+    stresses: NDArray[np.float64]
+    reactions: NDArray[np.float64]
+
+
+@dataclass
+class SweepChunk:
+    """Results of the variants start to stop - 1."""
+
+    start: int
+    stop: int
+    results: SweepResults
+
+
+# State of a worker process, set once by _initialize_worker so that the
+# tasks only carry the range of variants they have to run.
+_worker: dict[str, Any] = {}
+
+
+def _initialize_worker(
+    arrays: TrussArrays,
+    source: VariantSource,
+    seed: int,
+    sparse: bool,
+    solver: Union[str, SolverBackend],
+) -> None:
+    _worker["arrays"] = arrays
+    _worker["truss"] = Truss.from_arrays(arrays, sparse=sparse, solver=solver)
+    _worker["source"] = source
+    _worker["seed"] = seed
+
+
+def _run_chunk(start: int, stop: int) -> SweepChunk:
+    truss: Truss = _worker["truss"]
+    source: VariantSource = _worker["source"]
+    store = truss.element_store
+    displacements, stresses, reactions = [], [], []
+    for index in range(start, stop):
+        variant = source.variant(
+            index,
+            np.random.default_rng([_worker["seed"], index]),
+            _worker["arrays"],
+        )
+        store.youngs_modulus[:] = variant.youngs_modulus
+        store.area[:] = variant.area
+        store.touch_sections()
+        results = truss.solve_load_cases(variant.forces)
+        displacements.append(results.displacements[:, 0])
+        stresses.append(results.stresses[:, 0])
+        reactions.append(results.reactions[:, 0])
+    return SweepChunk(
+        start=start,
+        stop=stop,
+        results=SweepResults(
+            displacements=np.array(displacements),
+            stresses=np.array(stresses),
+            reactions=np.array(reactions),
+        ),
+    )
+
+
+@dataclass
+class Sweep:
+    """Parametric or Monte Carlo sweep over variants of a base truss.
+
+    The base arrays are sent to every worker once, when the worker starts,
+    and each task only carries the range of variant indices it has to
+    analyse. workers=1 runs the sweep in the calling process."""
+
+    truss: Truss
+    source: VariantSource
+    workers: Optional[int] = None
+    chunk_size: int = 64
+    seed: int = 0
+
+    def __worker_count(self) -> int:
+        return self.workers if self.workers else os.cpu_count() or 1
+
+    def __chunks(self) -> list[tuple[int, int]]:
+        return [
+            (start, min(start + self.chunk_size, len(self.source)))
+            for start in range(0, len(self.source), self.chunk_size)
+        ]
+
+    def iter_chunks(self) -> Iterator[SweepChunk]:
+        """Stream the chunks back as they complete, in any order."""
+
+        initargs = (
+            self.truss.to_arrays(),
+            self.source,
+            self.seed,
+            self.truss.sparse,
+            self.truss.solver,
+        )
+        if self.__worker_count() == 1:
+            _initialize_worker(*initargs)
+            for start, stop in self.__chunks():
+                yield _run_chunk(start, stop)
+            return
+
+        with ProcessPoolExecutor(
+            max_workers=self.__worker_count(),
+            initializer=_initialize_worker,
+            initargs=initargs,
+        ) as executor:
+            futures = [
+                executor.submit(_run_chunk, start, stop)
+                for start, stop in self.__chunks()
+            ]
+            for future in as_completed(futures):
+                yield future.result()
+
+    def run(self) -> SweepResults:
+        """Run every variant and aggregate the results in variant order."""
+
+        number_of_variants = len(self.source)
+        number_of_dofs = self.truss.get_number_of_dofs()
+        results = SweepResults(
+            displacements=np.zeros((number_of_variants, number_of_dofs)),
+            stresses=np.zeros(
+                (number_of_variants, len(self.truss.element_store))
+            ),
+            reactions=np.zeros(
+                (number_of_variants, len(self.truss.get_supported_dofs()))
+            ),
+        )
+        for chunk in self.iter_chunks():
+            rows = slice(chunk.start, chunk.stop)
+            results.displacements[rows] = chunk.results.displacements
+            results.stresses[rows] = chunk.results.stresses
+            results.reactions[rows] = chunk.results.reactions
+        return results
@@ -0,0 +1,176 @@
+"""Headless batch analysis of a set of truss model files.
+
+    python batch.py models/ more/*.npz --output results/ --workers 8
+
+Every model is analysed in a worker process and its displacements,
+stresses and reactions are written to the output directory. The
+plotting modules, and so matplotlib, are only imported with --plot."""
+
+import argparse
+import glob
+import os
+import resource
+import sys
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Optional
+
+import numpy as np
+
+from models.io import load_model
+from models.truss import Truss
+
+
+@dataclass
+class ModelSummary:
+    model: Path
+    output: Path
+    number_of_dofs: int
+    number_of_elements: int
+    seconds: float
+
+
+def find_models(patterns: Iterable[str]) -> list[Path]:
+    """Expand directories (every .npz they contain) and glob patterns to a
+    sorted list of model files."""
+
+    models: set[Path] = set()
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            models.update(Path(pattern).glob("*.npz"))
+        else:
+            models.update(Path(match) for match in glob.glob(pattern))
+    return sorted(models)
+
+
+def analyse_model(
+    model: Path, output_directory: Path, solver: str, plot: bool
+) -> ModelSummary:
+    """Analyse a single model file and write its results."""
+
+    start = time.perf_counter()
+    truss = load_model(model, sparse=True, solver=solver)
+    truss.set_nodal_displacements()
+    truss.set_element_stresses()
+    truss.set_reactions()
+
+    output = output_directory / f"{model.stem}.results.npz"
+    np.savez(
+        output,
+        displacements=truss.node_store.displacements,
+        stresses=truss.element_store.stresses,
+        reactions=truss.node_store.reactions,
+    )
+    if plot:
+        _plot(truss, output_directory / f"{model.stem}.png")
+
+    return ModelSummary(
+        model=model,
+        output=output,
+        number_of_dofs=truss.get_number_of_dofs(),
+        number_of_elements=len(truss.element_store),
+        seconds=time.perf_counter() - start,
+    )
+
+
+def _plot(truss: Truss, path: Path) -> None:
+    # Imported here so that matplotlib is only loaded when plotting.
+    from visualization.plotter import Plotter
+
+    Plotter(truss=truss, backend="Agg").plot_truss(path)
+
+
+def peak_rss_megabytes() -> float:
+    """Peak resident set size of this process and its finished workers."""
+
+    kilobytes = max(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    )
+    return kilobytes / 1024
+
+
+def parse_arguments(argv: Optional[list[str]]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Analyse a directory or glob of truss model files."
+    )
+    parser.add_argument(
+        "models", nargs="+", help="model files, directories or glob patterns"
+    )
+    parser.add_argument(
+        "-o", "--output", default="results", help="output directory"
+    )
+    parser.add_argument(
+        "-w", "--workers", type=int, default=os.cpu_count() or 1
+    )
+    parser.add_argument(
+        "--solver",
+        default="auto",
+        choices=["auto", "dense", "sparse", "banded", "cg"],
+    )
+    parser.add_argument(
+        "--plot", action="store_true", help="also save a plot of each model"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    arguments = parse_arguments(argv)
+    models = find_models(arguments.models)
+    if not models:
+        print("No model files found.", file=sys.stderr)
+        return 1
+
+    output_directory = Path(arguments.output)
+    output_directory.mkdir(parents=True, exist_ok=True)
+
+    start = time.perf_counter()
+    summaries: list[ModelSummary] = []
+    failures: list[tuple[Path, BaseException]] = []
+    with ProcessPoolExecutor(max_workers=arguments.workers) as executor:
+        futures: dict[Future[ModelSummary], Path] = {
+            executor.submit(
+                analyse_model,
+                model,
+                output_directory,
+                arguments.solver,
+                arguments.plot,
+            ): model
+            for model in models
+        }
+        # A corrupt or singular model must not abort the rest of the batch.
+        for future in as_completed(futures):
+            try:
+                summaries.append(future.result())
+            except Exception as error:
+                failures.append((futures[future], error))
+    elapsed = time.perf_counter() - start
+
+    for summary in sorted(summaries, key=lambda summary: summary.model):
+        print(
+            f"{summary.model}: {summary.number_of_dofs} dofs,"
+            f" {summary.number_of_elements} elements,"
+            f" {summary.seconds:.3f} s -> {summary.output}"
+        )
+    for model, failure in sorted(failures, key=lambda failure: failure[0]):
+        print(
+            f"{model}: failed, {type(failure).__name__}: {failure}",
+            file=sys.stderr,
+        )
+    total_dofs = sum(summary.number_of_dofs for summary in summaries)
+    print(
+        f"{len(summaries)} models in {elapsed:.3f} s:"
+        f" {len(summaries) / elapsed:.2f} models/s,"
+        f" {total_dofs / elapsed:.0f} dofs/s,"
+        f" peak RSS {peak_rss_megabytes():.1f} MB"
+    )
+    if failures:
+        print(f"{len(failures)} models failed.", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,224 @@
+"""Performance benchmarks over generated truss families.
+
+    python benchmark.py --dofs 10 1000 100000 1000000 -o bench.json
+    python benchmark.py -o new.json --compare bench.json
+
+Every phase of an analysis (generation, assembly, imposition of the
+boundary conditions, solve, stress recovery and reactions) is timed
+separately, best of --repeat runs from a cold system cache. A last run
+traces the allocations of every phase to record its peak memory. The
+results are written as JSON together with the commit and the library
+versions, so that the files of two commits can be compared."""
+
+import argparse
+import json
+import platform
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Iterator, Optional
+
+import numpy as np
+import scipy
+
+from models.generators import FAMILIES, generate
+from models.truss import Truss
+
+PHASES = ("assembly", "boundary_conditions", "solve", "stresses", "reactions")
+
+
+@dataclass
+class BenchmarkRecord:
+    """Best wall time and peak traced memory of every phase of one
+    benchmark case."""
+
+    family: str
+    requested_dofs: int
+    number_of_dofs: int
+    number_of_elements: int
+    backend: str
+    seconds: dict[str, float] = field(default_factory=dict)
+    peak_megabytes: dict[str, float] = field(default_factory=dict)
+
+
+def _phases(truss: Truss) -> dict[str, Callable[[], object]]:
+    # Every phase reuses the cached results of the previous ones, so it
+    # only measures its own work.
+    return {
+        "assembly": truss.assemble_stiffness_matrix,
+        "boundary_conditions": truss.impose_boundary_conditions,
+        "solve": truss.set_nodal_displacements,
+        "stresses": truss.set_element_stresses,
+        "reactions": truss.set_reactions,
+    }
+
+
+@contextmanager
+def _traced(peaks: dict[str, float], phase: str) -> Iterator[None]:
+    tracemalloc.start()
+    try:
+        yield
+    finally:
+        peaks[phase] = tracemalloc.get_traced_memory()[1] / 2 ** 20
+        tracemalloc.stop()
+
+
+def run_case(family: str, dofs: int, repeat: int = 3) -> BenchmarkRecord:
+    """Benchmark the analysis of a generated truss of about dofs dofs."""
+
+    seconds: dict[str, float] = {}
+    peaks: dict[str, float] = {}
+    start = time.perf_counter()
+    truss = generate(family, dofs)
+    seconds["generation"] = time.perf_counter() - start
+
+    for _ in range(repeat):
+        truss.invalidate()
+        for phase, run in _phases(truss).items():
+            start = time.perf_counter()
+            run()
+            elapsed = time.perf_counter() - start
+            seconds[phase] = min(seconds.get(phase, np.inf), elapsed)
+
+    with _traced(peaks, "generation"):
+        truss = generate(family, dofs)
+    for phase, run in _phases(truss).items():
+        with _traced(peaks, phase):
+            run()
+
+    return BenchmarkRecord(
+        family=family,
+        requested_dofs=dofs,
+        number_of_dofs=truss.get_number_of_dofs(),
+        number_of_elements=len(truss.element_store),
+        # Cached by the phases above, so this does not factorize again.
+        backend=truss.factorize().report.backend,
+        seconds=seconds,
+        peak_megabytes=peaks,
+    )
+
+
+def environment() -> dict[str, Optional[str]]:
+    """Commit and versions the benchmarks ran with."""
+
+    try:
+        commit: Optional[str] = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "date": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "scipy": scipy.__version__,
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+    }
+
+
+def compare(
+    baseline: list[dict], current: list[dict], threshold: float = 1.2
+) -> list[str]:
+    """Phases of the cases in both result lists that got slower than
+    threshold times their baseline time."""
+
+    previous = {
+        (record["family"], record["requested_dofs"]): record
+        for record in baseline
+    }
+    regressions = []
+    for record in current:
+        old = previous.get((record["family"], record["requested_dofs"]))
+        if old is None:
+            continue
+        for phase, seconds in record["seconds"].items():
+            before = old["seconds"].get(phase)
+            if before and seconds > threshold * before:
+                regressions.append(
+                    f"{record['family']} {record['requested_dofs']} dofs"
+                    f" {phase}: {before:.4f} s -> {seconds:.4f} s"
+                    f" ({seconds / before:.2f}x)"
+                )
+    return regressions
+
+
+def parse_arguments(argv: Optional[list[str]]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Benchmark the analysis of generated truss families."
+    )
+    parser.add_argument(
+        "--families", nargs="+", default=list(FAMILIES), choices=FAMILIES
+    )
+    parser.add_argument(
+        "--dofs",
+        nargs="+",
+        type=int,
+        default=[10, 100, 1_000, 10_000, 100_000],
+        help="approximate model sizes, up to 1000000",
+    )
+    parser.add_argument("-r", "--repeat", type=int, default=3)
+    parser.add_argument(
+        "-o", "--output", default="benchmark.json", help="results file"
+    )
+    parser.add_argument(
+        "--compare", help="results file of a baseline to compare against"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=1.2,
+        help="slowdown ratio reported as a regression",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    arguments = parse_arguments(argv)
+    records = []
+    for family in arguments.families:
+        for dofs in arguments.dofs:
+            record = run_case(family, dofs, arguments.repeat)
+            records.append(asdict(record))
+            phases = ", ".join(
+                f"{phase} {record.seconds[phase]:.4f} s" for phase in PHASES
+            )
+            print(
+                f"{family} {record.number_of_dofs} dofs ({record.backend}):"
+                f" {phases}"
+            )
+
+    results = {
+        "environment": environment(),
+        "peak_rss_megabytes": resource.getrusage(
+            resource.RUSAGE_SELF
+        ).ru_maxrss
+        / 1024,
+        "records": records,
+    }
+    Path(arguments.output).write_text(json.dumps(results, indent=2))
+
+    if arguments.compare:
+        baseline = json.loads(Path(arguments.compare).read_text())
+        regressions = compare(
+            baseline["records"], records, arguments.threshold
+        )
+        for regression in regressions:
+            print(f"Regression: {regression}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
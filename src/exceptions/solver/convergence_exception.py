@@ -0,0 +1,3 @@
+class ConvergenceException(Exception):
+    """Raised when an iterative solver does not reach the requested
+    tolerance within its iteration limit."""
@@ -0,0 +1,3 @@
+class ConnectivityException(Exception):
+    """Raised when an element references a node that the truss does not
+    contain."""
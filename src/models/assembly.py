@@ -0,0 +1,62 @@
+import numpy as np
+from numpy.typing import NDArray
+from scipy import sparse as sp
+
+
+class SparsityPattern:
+    """CSR structure of a global matrix for a fixed set of triplet
+    positions.
+
+    The symbolic work (sorting the triplets and summing the duplicates) is
+    done once. Every later assembly with the same connectivity and dof
+    numbering only scatters the numeric values into the CSR data array."""
+
+    def __init__(
+        self,
+        rows: NDArray[np.int64],
+        cols: NDArray[np.int64],
+        shape: tuple[int, int],
+    ) -> None:
+        self.shape = shape
+        keys = rows.astype(np.int64) * shape[1] + cols
+        unique_keys, self.slots = np.unique(keys, return_inverse=True)
+        self.indices = (unique_keys % shape[1]).astype(np.int32)
+        self.indptr = np.zeros(shape[0] + 1, dtype=np.int32)
+        np.cumsum(
+            np.bincount(unique_keys // shape[1], minlength=shape[0]),
+            out=self.indptr[1:],
+        )
+
+    @property
+    def nnz(self) -> int:
+        return len(self.indices)
+
+    def restrict(
+        self, dofs: NDArray[np.int64]
+    ) -> tuple["SparsityPattern", NDArray[np.bool_]]:
+        """Returns the pattern of the submatrix of the given rows and
+        columns, numbered in the order of dofs, together with the mask of
+        the triplets that fall in it. The submatrix is then assembled from
+        the masked values without slicing the global matrix."""
+
+        slot_rows = np.repeat(np.arange(self.shape[0]), np.diff(self.indptr))
+        position = np.full(self.shape[0], -1, dtype=np.int64)
+        position[dofs] = np.arange(len(dofs))
+        rows = position[slot_rows[self.slots]]
+        cols = position[self.indices[self.slots]]
+        keep = (rows >= 0) & (cols >= 0)
+        return (
+            SparsityPattern(
+                rows[keep], cols[keep], shape=(len(dofs), len(dofs))
+            ),
+            keep,
+        )
+
+    def assemble(self, values: NDArray[np.float64]) -> sp.csr_matrix:
+        """Returns the CSR matrix with the triplet values summed in their
+        slots."""
+
+        data = np.bincount(self.slots, weights=values, minlength=self.nnz)
+        return sp.csr_matrix(
+            (data, self.indices, self.indptr), shape=self.shape
+        )
@@ -9,6 +9,17 @@ class BoundaryCondition:
             f" is_free_in_y={self.is_free_in_y})"
         )
 
+    def __eq__(self, o: object) -> bool:
+        if isinstance(o, BoundaryCondition):
+            return (self.is_free_in_x, self.is_free_in_y) == (
+                o.is_free_in_x,
+                o.is_free_in_y,
+            )
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash((self.is_free_in_x, self.is_free_in_y))
+
 
 class FreeMoving(BoundaryCondition):
     def __init__(self) -> None:
@@ -52,3 +63,22 @@ class FullyRestricted(BoundaryCondition):
             f"FullyRestricted(is_free_in_x={self.is_free_in_x},"
             f" is_free_in_y={self.is_free_in_y})"
         )
+
+
+def boundary_condition_from_mask(
+    is_free_in_x: bool, is_free_in_y: bool
+) -> BoundaryCondition:
+    """Returns the boundary condition that corresponds to the free mask of
+    a node."""
+
+    return _BOUNDARY_CONDITIONS_BY_MASK[
+        (bool(is_free_in_x), bool(is_free_in_y))
+    ]()
+
+
+_BOUNDARY_CONDITIONS_BY_MASK = {
+    (True, True): FreeMoving,
+    (False, True): RestrictedInX,
+    (True, False): RestrictedInY,
+    (False, False): FullyRestricted,
+}
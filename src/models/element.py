@@ -1,71 +1,144 @@
-from dataclasses import dataclass
-from math import sqrt
 from typing import Union
 
 import numpy as np
 from numpy.typing import NDArray
 
+from .kernels import (
+    ElementGeometry,
+    axial_stresses,
+    direction_blocks,
+    element_geometry,
+    global_stiffness_matrices,
+)
 from .node import Node
+from .store import ElementStore
 from utils.flatten import flatten
 
 
-@dataclass
 class Element:
-    node1: Node
-    node2: Node
-    youngs_modulus: Union[np.float64, float]
-    area: Union[np.float64, float]
-    __stress: Union[np.float64, float] = np.float64(0)
+    """Handle of an element whose section properties and stress live in an
+    ElementStore.
+
+    Like Node, an element owns a single row store until it becomes part of
+    a truss, which then rebinds it to the store of the truss."""
+
+    __slots__ = ("_nodes", "_store", "_index")
+
+    def __init__(
+        self,
+        node1: Node,
+        node2: Node,
+        youngs_modulus: Union[np.float64, float],
+        area: Union[np.float64, float],
+        density: Union[np.float64, float] = 0.0,
+    ) -> None:
+        self._nodes = (node1, node2)
+        self._store = ElementStore(
+            [[0, 1]], [youngs_modulus], [area], density=[density]
+        )
+        self._index = 0
+
+    @classmethod
+    def view(
+        cls, store: ElementStore, index: int, node1: Node, node2: Node
+    ) -> "Element":
+        """Create a handle to an element that already lives in the store."""
+
+        element = cls.__new__(cls)
+        element._nodes = (node1, node2)
+        element.bind(store, index)
+        return element
+
+    def bind(self, store: ElementStore, index: int) -> None:
+        """Point the element to the row index of the store."""
+
+        self._store = store
+        self._index = index
+
+    @property
+    def store(self) -> ElementStore:
+        """The store the element reads and writes its data from."""
+
+        return self._store
+
+    @property
+    def index(self) -> int:
+        """The row of the element in its store."""
+
+        return self._index
+
+    @property
+    def node1(self) -> Node:
+        return self._nodes[0]
+
+    @property
+    def node2(self) -> Node:
+        return self._nodes[1]
+
+    @property
+    def youngs_modulus(self) -> np.float64:
+        return self._store.youngs_modulus[self._index]
+
+    @youngs_modulus.setter
+    def youngs_modulus(self, value: Union[np.float64, float]) -> None:
+        self._store.youngs_modulus[self._index] = value
+        self._store.touch_sections()
+
+    @property
+    def area(self) -> np.float64:
+        return self._store.area[self._index]
+
+    @area.setter
+    def area(self, value: Union[np.float64, float]) -> None:
+        self._store.area[self._index] = value
+        self._store.touch_sections()
+
+    @property
+    def density(self) -> np.float64:
+        return self._store.density[self._index]
+
+    @density.setter
+    def density(self, value: Union[np.float64, float]) -> None:
+        self._store.density[self._index] = value
+        self._store.touch_sections()
+
+    def __batch_arrays(
+        self,
+    ) -> tuple[NDArray[np.float64], NDArray[np.int64]]:
+        """Returns the coordinates and the connectivity of the element in
+        the layout the batched kernels expect."""
+
+        coordinates = np.array(
+            [[self.node1.x, self.node1.y], [self.node2.x, self.node2.y]],
+            dtype=np.float64,
+        )
+        return coordinates, np.array([[0, 1]], dtype=np.int64)
+
+    def __geometry(self) -> ElementGeometry:
+        return element_geometry(*self.__batch_arrays())
 
     def get_length(self) -> np.float64:
         """Returns the length of the element."""
 
-        return np.float64(
-            sqrt(
-                (self.node1.x - self.node2.x) ** 2
-                + (self.node1.y - self.node2.y) ** 2
-            )
-        )
+        return self.__geometry().lengths[0]
 
     def cos(self) -> np.float64:
         """Returns the cosine of the element with respect to the x axis."""
 
-        return (self.node2.x - self.node1.x) / self.get_length()
+        return self.__geometry().cos[0]
 
     def sin(self) -> np.float64:
         """Returns the sine of the element with the respect to the x axis."""
 
-        return (self.node2.y - self.node1.y) / self.get_length()
+        return self.__geometry().sin[0]
 
     def get_global_stiffness_matrix(self) -> NDArray[np.float64]:
         """Returns the global stiffness matrix of the element"""
 
-        s = self.sin()
-        c = self.cos()
-        matrix_helper = [
-            c ** 2,
-            c * s,
-            -(c ** 2),
-            -c * s,
-            c * s,
-            s ** 2,
-            -c * s,
-            -(s ** 2),
-            -(c ** 2),
-            -c * s,
-            c ** 2,
-            c * s,
-            -c * s,
-            -(s ** 2),
-            c * s,
-            s ** 2,
-        ]
-        return (
-            self.youngs_modulus
-            * self.area
-            / self.get_length()
-            * np.array(matrix_helper, dtype=np.float64).reshape(4, 4)
-        )
+        coordinates, connectivity = self.__batch_arrays()
+        return global_stiffness_matrices(
+            coordinates, connectivity, self.youngs_modulus, self.area
+        ).stiffness[0]
 
     def get_node_dofs(self) -> list[int]:
         """Returns a list with the indices that correspond to the degrees of
@@ -75,33 +148,12 @@ class Element:
         x2, y2 = self.node2.dofs
         return [x1, y1, x2, y2]
 
-    def get_transformation_matrix(self):
+    def get_transformation_matrix(self) -> NDArray[np.float64]:
         """Get the transformation matrix of the element from the local
         coordinate system to the global one."""
 
-        s = self.sin()
-        c = self.cos()
-        return np.array(
-            [
-                c ** 2,
-                c * s,
-                -(c ** 2),
-                -c * s,
-                c * s,
-                s ** 2,
-                -c * s,
-                -(s ** 2),
-                -(c ** 2),
-                -c * s,
-                c ** 2,
-                c * s,
-                -c * s,
-                -(s ** 2),
-                c * s,
-                s ** 2,
-            ],
-            dtype=np.float64,
-        ).reshape(4, 4)
+        geometry = self.__geometry()
+        return direction_blocks(geometry.cos, geometry.sin)[0]
 
     def __get_arranged_nodal_displacements(self) -> NDArray[np.float64]:
         """Get the nodal displacements vector of element's nodes."""
@@ -114,19 +166,23 @@ class Element:
         return np.array(nodal_displacements, dtype=np.float64)
 
     def set_stress(self) -> None:
-        """Compute the stress of the element and set in the private __stress member."""
-
-        c = self.cos()
-        s = self.sin()
-        transformation_matrix = np.array([-c, -s, c, s], dtype=np.float64)
-        nodal_displacements = self.__get_arranged_nodal_displacements()
-        self.__stress = (
-            self.youngs_modulus  # type: ignore
-            / self.get_length()
-            * (transformation_matrix @ nodal_displacements.T)
-        )
+        """Compute the stress of the element and store it."""
+
+        coordinates, connectivity = self.__batch_arrays()
+        self._store.stresses[self._index] = axial_stresses(
+            coordinates,
+            connectivity,
+            self.youngs_modulus,
+            self.__get_arranged_nodal_displacements(),
+        )[0]
 
     def get_stress(self) -> Union[np.float64, float]:
         """Return the stress of the element."""
 
-        return self.__stress
+        return self._store.stresses[self._index]
+
+    def __repr__(self) -> str:
+        return (
+            f"Element(node1={self.node1}, node2={self.node2},"
+            f" youngs_modulus={self.youngs_modulus}, area={self.area})"
+        )
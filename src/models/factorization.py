@@ -0,0 +1,249 @@
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Iterator, Optional
+
+import numpy as np
+import scipy.linalg
+from numpy.typing import NDArray
+from scipy import sparse as sp
+from scipy.sparse.linalg import spilu, splu
+
+from exceptions.solver.convergence_exception import ConvergenceException
+
+
+@dataclass
+class SolveReport:
+    """Timings and iteration count of a factorization and its last solve.
+
+    Direct factorizations report a single iteration per right hand side."""
+
+    backend: str
+    factorization_time: float = 0.0
+    solve_time: float = 0.0
+    iterations: int = 0
+    residual_norm: float = 0.0
+
+
+class Factorization:
+    """Factorization of a reduced stiffness matrix that can be reused to
+    solve for any number of right hand sides."""
+
+    backend = "base"
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self.report = SolveReport(backend=self.backend)
+
+    def solve(self, rhs: NDArray[np.float64]) -> NDArray[np.float64]:
+        """Solve for a (size,) vector or a (size, n_cases) block of right
+        hand sides."""
+
+        start = time.perf_counter()
+        solution = self._solve(np.asarray(rhs, dtype=np.float64))
+        self.report.solve_time = time.perf_counter() - start
+        return solution
+
+    def _solve(self, rhs: NDArray[np.float64]) -> NDArray[np.float64]:
+        raise NotImplementedError
+
+    def stored_factor(self) -> Optional[NDArray[np.float64]]:
+        """The array from_factor rebuilds this factorization from, None if
+        it cannot be stored as a plain array."""
+
+        return None
+
+    @contextmanager
+    def _factorizing(self) -> Iterator[None]:
+        """Record the wall time of the factorization step."""
+
+        start = time.perf_counter()
+        yield
+        self.report.factorization_time = time.perf_counter() - start
+
+
+class CholeskyFactorization(Factorization):
+    """Dense LAPACK Cholesky factorization, the reduced stiffness of a
+    stable truss is symmetric positive definite."""
+
+    backend = "dense"
+
+    def __init__(self, matrix: NDArray[np.float64]) -> None:
+        super().__init__(matrix.shape[0])
+        with self._factorizing():
+            self.factor = scipy.linalg.cho_factor(
+                matrix, lower=True, check_finite=False
+            )
+
+    def stored_factor(self) -> Optional[NDArray[np.float64]]:
+        return np.asarray(self.factor[0])
+
+    @classmethod
+    def from_factor(
+        cls, factor: NDArray[np.float64]
+    ) -> "CholeskyFactorization":
+        """Rebuild the factorization from the lower Cholesky factor of
+        another one, e.g. read from disk, without factorizing again."""
+
+        factorization = cls.__new__(cls)
+        Factorization.__init__(factorization, factor.shape[0])
+        factorization.factor = (factor, True)
+        return factorization
+
+    def _solve(self, rhs: NDArray[np.float64]) -> NDArray[np.float64]:
+        self.report.iterations = 1
+        return scipy.linalg.cho_solve(self.factor, rhs, check_finite=False)
+
+
+class SparseLUFactorization(Factorization):
+    """Sparse direct factorization (SuperLU) of a CSR/CSC matrix.
+
+    scipy does not ship a sparse Cholesky, the LU factors of the symmetric
+    matrix are reused in the same way."""
+
+    backend = "sparse"
+
+    def __init__(self, matrix: sp.spmatrix) -> None:
+        super().__init__(matrix.shape[0])
+        with self._factorizing():
+            self.factor = splu(sp.csc_matrix(matrix))
+
+    def _solve(self, rhs: NDArray[np.float64]) -> NDArray[np.float64]:
+        self.report.iterations = 1
+        return self.factor.solve(rhs)
+
+
+class BandedCholeskyFactorization(Factorization):
+    """Banded LAPACK Cholesky, storing only the lower band of the matrix.
+
+    Cost and memory grow with the bandwidth, so it pays off after the dofs
+    have been renumbered to reduce it, see Truss.reorder_dofs."""
+
+    backend = "banded"
+
+    def __init__(self, matrix: sp.spmatrix) -> None:
+        super().__init__(matrix.shape[0])
+        with self._factorizing():
+            lower = sp.tril(matrix, format="coo")
+            offsets = lower.row - lower.col
+            self.bandwidth = int(offsets.max(initial=0))
+            band = np.zeros((self.bandwidth + 1, self.size), dtype=np.float64)
+            np.add.at(band, (offsets, lower.col), lower.data)
+            self.factor = scipy.linalg.cholesky_banded(
+                band, lower=True, check_finite=False
+            )
+
+    def stored_factor(self) -> Optional[NDArray[np.float64]]:
+        return np.asarray(self.factor)
+
+    @classmethod
+    def from_factor(
+        cls, factor: NDArray[np.float64]
+    ) -> "BandedCholeskyFactorization":
+        """Rebuild the factorization from the lower banded Cholesky factor
+        of another one without factorizing again."""
+
+        factorization = cls.__new__(cls)
+        Factorization.__init__(factorization, factor.shape[1])
+        factorization.bandwidth = factor.shape[0] - 1
+        factorization.factor = factor
+        return factorization
+
+    def _solve(self, rhs: NDArray[np.float64]) -> NDArray[np.float64]:
+        self.report.iterations = 1
+        return scipy.linalg.cho_solve_banded(
+            (self.factor, True), rhs, check_finite=False
+        )
+
+
+class ConjugateGradientFactorization(Factorization):
+    """Preconditioned conjugate gradient "factorization".
+
+    Nothing is factorized, only the preconditioner is built once. Every
+    column of the right hand side is then solved iteratively until the
+    relative residual drops below tolerance.
+
+    preconditioner is "jacobi" (inverse diagonal), "ilu" (incomplete LU,
+    standing in for an incomplete Cholesky which scipy does not provide)
+    or None."""
+
+    backend = "cg"
+
+    def __init__(
+        self,
+        matrix: sp.spmatrix,
+        preconditioner: Optional[str] = "jacobi",
+        tolerance: float = 1e-10,
+        max_iterations: Optional[int] = None,
+    ) -> None:
+        super().__init__(matrix.shape[0])
+        self.matrix = sp.csr_matrix(matrix)
+        self.tolerance = tolerance
+        self.max_iterations = (
+            max_iterations if max_iterations is not None else 10 * self.size
+        )
+        with self._factorizing():
+            self.__build_preconditioner(preconditioner)
+
+    def __build_preconditioner(self, preconditioner: Optional[str]) -> None:
+        if preconditioner is None:
+            self.apply_preconditioner: Callable[
+                [NDArray[np.float64]], NDArray[np.float64]
+            ] = lambda residual: residual
+        elif preconditioner == "jacobi":
+            inverse_diagonal = 1 / self.matrix.diagonal()
+            self.apply_preconditioner = (
+                lambda residual: inverse_diagonal * residual
+            )
+        elif preconditioner == "ilu":
+            incomplete = spilu(
+                sp.csc_matrix(self.matrix), drop_tol=1e-4, fill_factor=10
+            )
+            self.apply_preconditioner = incomplete.solve
+        else:
+            raise ValueError(f"Unknown preconditioner {preconditioner!r}.")
+
+    def _solve(self, rhs: NDArray[np.float64]) -> NDArray[np.float64]:
+        columns = rhs.reshape(self.size, -1)
+        solution = np.zeros_like(columns)
+        self.report.iterations = 0
+        self.report.residual_norm = 0.0
+        for column in range(columns.shape[1]):
+            solution[:, column] = self.__conjugate_gradient(columns[:, column])
+        return solution.reshape(rhs.shape)
+
+    def __conjugate_gradient(
+        self, rhs: NDArray[np.float64]
+    ) -> NDArray[np.float64]:
+        solution = np.zeros_like(rhs)
+        rhs_norm = np.linalg.norm(rhs)
+        if rhs_norm == 0:
+            return solution
+
+        residual = rhs.copy()
+        preconditioned = self.apply_preconditioner(residual)
+        direction = preconditioned.copy()
+        residual_dot = residual @ preconditioned
+        for iteration in range(1, self.max_iterations + 1):
+            product = self.matrix @ direction
+            step = residual_dot / (direction @ product)
+            solution += step * direction
+            residual -= step * product
+            relative_residual = float(np.linalg.norm(residual) / rhs_norm)
+            if relative_residual <= self.tolerance:
+                self.report.iterations += iteration
+                self.report.residual_norm = max(
+                    self.report.residual_norm, relative_residual
+                )
+                return solution
+            preconditioned = self.apply_preconditioner(residual)
+            next_residual_dot = residual @ preconditioned
+            direction = (
+                preconditioned + next_residual_dot / residual_dot * direction
+            )
+            residual_dot = next_residual_dot
+
+        raise ConvergenceException(
+            f"Conjugate gradient did not converge in {self.max_iterations}"
+            f" iterations, relative residual {relative_residual:.3e}."
+        )
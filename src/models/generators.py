@@ -0,0 +1,244 @@
+"""Parametric truss families, built straight into arrays so that models
+with millions of dofs are generated in a fraction of a second.
+
+Every generator returns a statically stable truss with a pinned and a
+roller support, or a fully restrained base for the lattice, and a load on
+its nodes, ready to be solved."""
+
+from typing import Callable, Optional, Union
+
+import numpy as np
+from numpy.typing import NDArray
+from scipy.spatial import Delaunay
+
+from .solvers import SolverBackend
+from .store import TrussArrays
+from .truss import Truss
+
+YOUNGS_MODULUS = 2e11
+AREA = 1e-3
+LOAD = -1e3
+
+
+def _build(
+    coordinates: NDArray[np.float64],
+    connectivity: NDArray[np.int64],
+    free: NDArray[np.bool_],
+    forces: NDArray[np.float64],
+    sparse: bool,
+    solver: Union[str, SolverBackend],
+) -> Truss:
+    return Truss.from_arrays(
+        TrussArrays(
+            coordinates=coordinates,
+            connectivity=connectivity,
+            youngs_modulus=np.full(len(connectivity), YOUNGS_MODULUS),
+            area=np.full(len(connectivity), AREA),
+            free=free,
+            forces=forces,
+            prescribed=np.zeros_like(coordinates),
+            springs=np.zeros_like(coordinates),
+            dofs=np.arange(coordinates.size, dtype=np.int64).reshape(-1, 2),
+        ),
+        sparse=sparse,
+        solver=solver,
+        copy=False,
+    )
+
+
+def _girder(
+    bays: int,
+    height: float,
+    diagonals: Callable[[NDArray[np.int64], NDArray[np.int64]], NDArray],
+    sparse: bool,
+    solver: Union[str, SolverBackend],
+) -> Truss:
+    """Girder with bottom and top chords, verticals and the given
+    diagonals, pinned at its left and on a roller at its right end and
+    loaded at every bottom node."""
+
+    x = np.arange(bays + 1, dtype=np.float64)
+    coordinates = np.concatenate(
+        (
+            np.column_stack((x, np.zeros_like(x))),
+            np.column_stack((x, np.full_like(x, height))),
+        )
+    )
+    bottom = np.arange(bays + 1)
+    top = bottom + bays + 1
+    connectivity = np.concatenate(
+        (
+            np.column_stack((bottom[:-1], bottom[1:])),
+            np.column_stack((top[:-1], top[1:])),
+            np.column_stack((bottom, top)),
+            diagonals(bottom, top),
+        )
+    )
+    free = np.ones_like(coordinates, dtype=bool)
+    free[bottom[0]] = False
+    free[bottom[-1], 1] = False
+    forces = np.zeros_like(coordinates)
+    forces[bottom, 1] = LOAD
+    return _build(coordinates, connectivity, free, forces, sparse, solver)
+
+
+def _diagonals_towards_midspan(
+    bottom: NDArray[np.int64], top: NDArray[np.int64], rising: bool
+) -> NDArray[np.int64]:
+    """One diagonal per panel, mirrored about midspan. rising diagonals go
+    up towards midspan (Howe), the others down towards midspan (Pratt)."""
+
+    panels = np.arange(len(bottom) - 1)
+    left = panels < (len(bottom) - 1) / 2
+    up = left == rising
+    start = np.where(up, bottom[panels], top[panels])
+    end = np.where(up, top[panels + 1], bottom[panels + 1])
+    return np.column_stack((start, end))
+
+
+def pratt_truss(
+    bays: int,
+    height: float = 1.0,
+    sparse: bool = True,
+    solver: Union[str, SolverBackend] = "auto",
+) -> Truss:
+    """Pratt girder: verticals and diagonals sloping down to midspan."""
+
+    return _girder(
+        bays,
+        height,
+        lambda bottom, top: _diagonals_towards_midspan(bottom, top, False),
+        sparse,
+        solver,
+    )
+
+
+def howe_truss(
+    bays: int,
+    height: float = 1.0,
+    sparse: bool = True,
+    solver: Union[str, SolverBackend] = "auto",
+) -> Truss:
+    """Howe girder: verticals and diagonals rising to midspan."""
+
+    return _girder(
+        bays,
+        height,
+        lambda bottom, top: _diagonals_towards_midspan(bottom, top, True),
+        sparse,
+        solver,
+    )
+
+
+def warren_truss(
+    bays: int,
+    height: float = 1.0,
+    sparse: bool = True,
+    solver: Union[str, SolverBackend] = "auto",
+) -> Truss:
+    """Warren girder: no verticals, the top nodes sit above the middle of
+    the bottom panels and the diagonals alternate."""
+
+    x = np.arange(bays + 1, dtype=np.float64)
+    coordinates = np.concatenate(
+        (
+            np.column_stack((x, np.zeros_like(x))),
+            np.column_stack((x[:-1] + 0.5, np.full(bays, height))),
+        )
+    )
+    bottom = np.arange(bays + 1)
+    top = np.arange(bays) + bays + 1
+    connectivity = np.concatenate(
+        (
+            np.column_stack((bottom[:-1], bottom[1:])),
+            np.column_stack((top[:-1], top[1:])),
+            np.column_stack((bottom[:-1], top)),
+            np.column_stack((top, bottom[1:])),
+        )
+    )
+    free = np.ones_like(coordinates, dtype=bool)
+    free[bottom[0]] = False
+    free[bottom[-1], 1] = False
+    forces = np.zeros_like(coordinates)
+    forces[bottom, 1] = LOAD
+    return _build(coordinates, connectivity, free, forces, sparse, solver)
+
+
+def lattice_truss(
+    columns: int,
+    rows: int,
+    sparse: bool = True,
+    solver: Union[str, SolverBackend] = "auto",
+) -> Truss:
+    """Grid of columns x rows unit cells with cross bracing, fully
+    restrained along its base and loaded sideways and down at its top."""
+
+    x, y = np.meshgrid(
+        np.arange(columns + 1, dtype=np.float64),
+        np.arange(rows + 1, dtype=np.float64),
+    )
+    coordinates = np.column_stack((x.ravel(), y.ravel()))
+    index = np.arange(coordinates.shape[0]).reshape(rows + 1, columns + 1)
+    connectivity = np.concatenate(
+        (
+            np.column_stack((index[:, :-1].ravel(), index[:, 1:].ravel())),
+            np.column_stack((index[:-1, :].ravel(), index[1:, :].ravel())),
+            np.column_stack((index[:-1, :-1].ravel(), index[1:, 1:].ravel())),
+            np.column_stack((index[:-1, 1:].ravel(), index[1:, :-1].ravel())),
+        )
+    )
+    free = np.ones_like(coordinates, dtype=bool)
+    free[index[0]] = False
+    forces = np.zeros_like(coordinates)
+    forces[index[-1]] = (-LOAD, LOAD)
+    return _build(coordinates, connectivity, free, forces, sparse, solver)
+
+
+def delaunay_truss(
+    number_of_nodes: int,
+    seed: Optional[int] = 0,
+    sparse: bool = True,
+    solver: Union[str, SolverBackend] = "auto",
+) -> Truss:
+    """Random points in a square joined by the edges of their Delaunay
+    triangulation, pinned at the leftmost and on a roller at the rightmost
+    node and loaded down at every node."""
+
+    rng = np.random.default_rng(seed)
+    coordinates = rng.random((number_of_nodes, 2)) * np.sqrt(number_of_nodes)
+    simplices = Delaunay(coordinates).simplices
+    edges = np.concatenate(
+        (simplices[:, [0, 1]], simplices[:, [1, 2]], simplices[:, [2, 0]])
+    )
+    connectivity = np.unique(np.sort(edges, axis=1), axis=0).astype(np.int64)
+    free = np.ones_like(coordinates, dtype=bool)
+    free[np.argmin(coordinates[:, 0])] = False
+    free[np.argmax(coordinates[:, 0]), 1] = False
+    forces = np.zeros_like(coordinates)
+    forces[:, 1] = LOAD
+    return _build(coordinates, connectivity, free, forces, sparse, solver)
+
+
+# Builds a truss of each family with about the given number of dofs.
+FAMILIES: dict[str, Callable[[int], Truss]] = {
+    "pratt": lambda dofs: pratt_truss(max(dofs // 4 - 1, 2)),
+    "howe": lambda dofs: howe_truss(max(dofs // 4 - 1, 2)),
+    "warren": lambda dofs: warren_truss(max((dofs - 2) // 4, 1)),
+    "lattice": lambda dofs: lattice_truss(
+        max(int(np.sqrt(dofs / 2)) - 1, 1), max(int(np.sqrt(dofs / 2)) - 1, 1)
+    ),
+    "delaunay": lambda dofs: delaunay_truss(max(dofs // 2, 3)),
+}
+
+
+def generate(family: str, dofs: int) -> Truss:
+    """Build a truss of the named family with about the given number of
+    dofs, see FAMILIES."""
+
+    try:
+        return FAMILIES[family](dofs)
+    except KeyError:
+        raise ValueError(
+            f"Unknown truss family {family!r}, expected one of"
+            f" {', '.join(FAMILIES)}."
+        ) from None
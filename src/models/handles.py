@@ -0,0 +1,75 @@
+from typing import Sequence, Union, overload
+
+from .element import Element
+from .node import Node
+from .store import ElementStore, NodeStore
+
+
+class NodeHandles(Sequence[Node]):
+    """Sequence of the nodes of a store that creates each Node handle only
+    when it is first accessed, so that a truss built from arrays carries no
+    per node Python objects until they are needed."""
+
+    def __init__(self, store: NodeStore) -> None:
+        self.store = store
+        self.__handles: dict[int, Node] = {}
+
+    def __len__(self) -> int:
+        return len(self.store)
+
+    @overload
+    def __getitem__(self, index: int) -> Node:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[Node]:
+        ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Node, list[Node]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("node index out of range")
+        handle = self.__handles.get(index)
+        if handle is None:
+            handle = self.__handles[index] = Node.view(self.store, index)
+        return handle
+
+
+class ElementHandles(Sequence[Element]):
+    """Lazily created Element handles of a store, see NodeHandles."""
+
+    def __init__(self, store: ElementStore, nodes: NodeHandles) -> None:
+        self.store = store
+        self.nodes = nodes
+        self.__handles: dict[int, Element] = {}
+
+    def __len__(self) -> int:
+        return len(self.store)
+
+    @overload
+    def __getitem__(self, index: int) -> Element:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[Element]:
+        ...
+
+    def __getitem__(
+        self, index: Union[int, slice]
+    ) -> Union[Element, list[Element]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("element index out of range")
+        handle = self.__handles.get(index)
+        if handle is None:
+            node1, node2 = self.store.connectivity[index]
+            handle = self.__handles[index] = Element.view(
+                self.store, index, self.nodes[node1], self.nodes[node2]
+            )
+        return handle
@@ -0,0 +1,219 @@
+"""Phase level instrumentation of truss analyses.
+
+    with instrument(MemorySink()) as sink:
+        truss.set_nodal_displacements()
+    print(sink.totals())
+
+Inside instrument every named phase of the analysis (assembly, partition,
+factorization, solve, stresses, reactions) emits a PhaseRecord with its
+wall and CPU time, the sizes and nnz of its matrices and, with
+allocations=True, the memory it allocated as traced by tracemalloc.
+Outside of it a phase is a shared no-op context, so the instrumentation
+costs a context variable lookup per phase."""
+
+import json
+import logging
+import time
+import tracemalloc
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import IO, Any, Iterator, Optional, Union
+
+
+@dataclass
+class PhaseRecord:
+    """Measurements of a single run of a phase. path joins the names of
+    the enclosing phases, e.g. "solve/factorization"."""
+
+    name: str
+    path: str
+    wall_time: float = 0.0
+    cpu_time: float = 0.0
+    allocated_bytes: Optional[int] = None
+    peak_bytes: Optional[int] = None
+    gauges: dict[str, float] = field(default_factory=dict)
+
+
+class Sink:
+    """Receives the record of every finished phase."""
+
+    def emit(self, record: PhaseRecord) -> None:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+class MemorySink(Sink):
+    """Keeps the records in memory."""
+
+    def __init__(self) -> None:
+        self.records: list[PhaseRecord] = []
+
+    def emit(self, record: PhaseRecord) -> None:
+        self.records.append(record)
+
+    def totals(self) -> dict[str, float]:
+        """Total wall time per phase path."""
+
+        totals: dict[str, float] = {}
+        for record in self.records:
+            totals[record.path] = (
+                totals.get(record.path, 0.0) + record.wall_time
+            )
+        return totals
+
+
+class LoggingSink(Sink):
+    """Logs one line per record."""
+
+    def __init__(
+        self,
+        logger: Union[str, logging.Logger] = "truss.instrumentation",
+        level: int = logging.INFO,
+    ) -> None:
+        self.logger = (
+            logging.getLogger(logger) if isinstance(logger, str) else logger
+        )
+        self.level = level
+
+    def emit(self, record: PhaseRecord) -> None:
+        gauges = " ".join(f"{k}={v:g}" for k, v in record.gauges.items())
+        self.logger.log(
+            self.level,
+            "%s wall=%.6fs cpu=%.6fs %s",
+            record.path,
+            record.wall_time,
+            record.cpu_time,
+            gauges,
+        )
+
+
+class JsonLinesSink(Sink):
+    """Writes one JSON object per record to a file."""
+
+    def __init__(self, file: Union[str, Path, IO[str]]) -> None:
+        self.__owned = isinstance(file, (str, Path))
+        self.file: IO[str] = (
+            open(file, "a") if isinstance(file, (str, Path)) else file
+        )
+
+    def emit(self, record: PhaseRecord) -> None:
+        self.file.write(json.dumps(asdict(record)) + "\n")
+
+    def close(self) -> None:
+        if self.__owned:
+            self.file.close()
+        else:
+            self.file.flush()
+
+
+class _NullPhase:
+    def __enter__(self) -> "_NullPhase":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        pass
+
+    def gauge(self, name: str, value: float) -> None:
+        pass
+
+
+_NULL_PHASE = _NullPhase()
+
+
+class Instrumentation:
+    """The sinks and the stack of open phases of an instrumented block."""
+
+    def __init__(self, sinks: list[Sink], allocations: bool) -> None:
+        self.sinks = sinks
+        self.allocations = allocations
+        self.stack: list[_Phase] = []
+
+    def emit(self, record: PhaseRecord) -> None:
+        for sink in self.sinks:
+            sink.emit(record)
+
+
+class _Phase:
+    def __init__(self, instrumentation: Instrumentation, name: str) -> None:
+        self.instrumentation = instrumentation
+        parent = instrumentation.stack[-1] if instrumentation.stack else None
+        self.record: PhaseRecord = PhaseRecord(
+            name=name,
+            path=f"{parent.record.path}/{name}" if parent else name,
+        )
+        self.peak = 0
+
+    def gauge(self, name: str, value: float) -> None:
+        """Record a size, e.g. the number of dofs or nnz of a matrix."""
+
+        self.record.gauges[name] = value
+
+    def __enter__(self) -> "_Phase":
+        stack = self.instrumentation.stack
+        if self.instrumentation.allocations:
+            self.allocated, peak = tracemalloc.get_traced_memory()
+            # Keep the peak the parent reached so far before resetting it.
+            if stack:
+                stack[-1].peak = max(stack[-1].peak, peak)
+            tracemalloc.reset_peak()
+        stack.append(self)
+        self.cpu = time.process_time()
+        self.wall = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.record.wall_time = time.perf_counter() - self.wall
+        self.record.cpu_time = time.process_time() - self.cpu
+        stack = self.instrumentation.stack
+        stack.pop()
+        if self.instrumentation.allocations:
+            current, peak = tracemalloc.get_traced_memory()
+            # The peak of a nested phase resets the peak of its parents.
+            self.peak = max(self.peak, peak)
+            self.record.allocated_bytes = current - self.allocated
+            self.record.peak_bytes = self.peak - self.allocated
+            if stack:
+                stack[-1].peak = max(stack[-1].peak, self.peak)
+        self.instrumentation.emit(self.record)
+
+
+_active: ContextVar[Optional[Instrumentation]] = ContextVar(
+    "instrumentation", default=None
+)
+
+
+def phase(name: str) -> Union[_Phase, _NullPhase]:
+    """Context manager that measures the named phase when instrumentation
+    is enabled. Its gauge method records sizes of the phase."""
+
+    instrumentation = _active.get()
+    if instrumentation is None:
+        return _NULL_PHASE
+    return _Phase(instrumentation, name)
+
+
+@contextmanager
+def instrument(*sinks: Sink, allocations: bool = False) -> Iterator[Sink]:
+    """Enable the instrumentation in this block, and in the tasks started
+    from it, emitting to the given sinks, by default a new MemorySink.
+    Yields the first sink and closes them all on exit. With allocations
+    the memory allocated by every phase is traced, which slows down Python
+    code considerably."""
+
+    sinks = sinks or (MemorySink(),)
+    started = allocations and not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    token = _active.set(Instrumentation(list(sinks), allocations))
+    try:
+        yield sinks[0]
+    finally:
+        _active.reset(token)
+        if started:
+            tracemalloc.stop()
+        for sink in sinks:
+            sink.close()
@@ -0,0 +1,443 @@
+import json
+from dataclasses import asdict, fields
+from itertools import islice
+from pathlib import Path
+from typing import Literal, Optional, Union
+
+import numpy as np
+from numpy.typing import NDArray
+
+from .load_cases import LoadCaseResults
+from .solvers import SolverBackend
+from .store import TrussArrays
+from .truss import Truss
+from exceptions.trussassembler.connectivity_exception import (
+    ConnectivityException,
+)
+
+PathLike = Union[str, Path]
+MmapMode = Literal["r+", "r", "w+", "c"]
+
+
+def save_model(truss: Truss, path: PathLike) -> None:
+    """Save the arrays that describe the truss in an .npz model file."""
+
+    np.savez(path, **asdict(truss.to_arrays()))
+
+
+def load_model(
+    path: PathLike,
+    sparse: bool = True,
+    solver: Union[str, SolverBackend] = "auto",
+) -> Truss:
+    """Load a truss from an .npz model file written by save_model."""
+
+    with np.load(path) as model:
+        # Fields added to TrussArrays later, e.g. density, keep their
+        # defaults when loading older model files.
+        arrays = TrussArrays(
+            **{
+                field.name: model[field.name]
+                for field in fields(TrussArrays)
+                if field.name in model.files
+            }
+        )
+    return Truss.from_arrays(arrays, sparse=sparse, solver=solver)
+
+
+NODE_COLUMNS = {
+    "x": None,
+    "y": None,
+    "free_x": 1.0,
+    "free_y": 1.0,
+    "fx": 0.0,
+    "fy": 0.0,
+    "ux": 0.0,
+    "uy": 0.0,
+    "kx": 0.0,
+    "ky": 0.0,
+}
+ELEMENT_COLUMNS = {
+    "node1": None,
+    "node2": None,
+    # Missing section properties are taken from the defaults of load_truss.
+    "youngs_modulus": np.nan,
+    "area": np.nan,
+    "density": 0.0,
+}
+
+
+def read_csv_table(
+    path: PathLike,
+    columns: dict[str, Optional[float]],
+    chunk_size: int = 100_000,
+) -> dict[str, NDArray[np.float64]]:
+    """Read the named columns of a CSV table with a header row in chunks
+    of chunk_size rows into preallocated arrays.
+
+    columns maps every column to its default, which fills the column when
+    the table does not contain it. Columns without a default are required.
+    Columns of the table that are not asked for are ignored."""
+
+    with open(path, newline="") as table:
+        header = [name.strip() for name in table.readline().split(",")]
+        number_of_rows = sum(1 for line in table if line.strip())
+
+    missing = [
+        name
+        for name, default in columns.items()
+        if default is None and name not in header
+    ]
+    if missing:
+        raise ValueError(
+            f"The table {path} has no column(s) {', '.join(missing)}."
+        )
+    present = [name for name in columns if name in header]
+    usecols = [header.index(name) for name in present]
+    values = {
+        name: np.full(number_of_rows, default, dtype=np.float64)
+        for name, default in columns.items()
+        if name not in header
+    }
+    values.update(
+        {name: np.empty(number_of_rows, dtype=np.float64) for name in present}
+    )
+
+    with open(path, newline="") as table:
+        table.readline()
+        rows = (line for line in table if line.strip())
+        start = 0
+        while start < number_of_rows:
+            chunk = np.loadtxt(
+                islice(rows, chunk_size),
+                delimiter=",",
+                usecols=usecols,
+                ndmin=2,
+            )
+            stop = start + chunk.shape[0]
+            for column, name in enumerate(present):
+                values[name][start:stop] = chunk[:, column]
+            start = stop
+    return values
+
+
+def validate_connectivity(
+    connectivity: NDArray[np.integer],
+    number_of_nodes: int,
+    chunk_size: int = 1_000_000,
+) -> None:
+    """Check chunk by chunk that every element connects two different nodes
+    of the truss.
+
+    Raises:
+        ConnectivityException: If an element references a node that does
+        not exist or both of its ends are the same node."""
+
+    invalid = 0
+    first: Optional[int] = None
+    for start in range(0, len(connectivity), chunk_size):
+        chunk = np.asarray(connectivity[start : start + chunk_size])
+        bad = (
+            (chunk < 0).any(axis=1)
+            | (chunk >= number_of_nodes).any(axis=1)
+            | (chunk[:, 0] == chunk[:, 1])
+        )
+        if bad.any():
+            invalid += int(np.count_nonzero(bad))
+            if first is None:
+                first = start + int(np.flatnonzero(bad)[0])
+    if first is not None:
+        raise ConnectivityException(
+            f"{invalid} element(s) reference missing nodes or connect a node"
+            f" to itself, the first is element {first} with nodes"
+            f" {tuple(int(i) for i in connectivity[first])}."
+        )
+
+
+def _load_array_file(
+    path: Path, mmap_mode: Optional[MmapMode]
+) -> dict[str, NDArray]:
+    if path.suffix == ".npy":
+        return {"": np.load(path, mmap_mode=mmap_mode)}
+    with np.load(path) as arrays:
+        return {name: arrays[name] for name in arrays.files}
+
+
+def _read_nodes(
+    path: Path, chunk_size: int, mmap_mode: Optional[MmapMode]
+) -> dict[str, NDArray]:
+    if path.suffix == ".csv":
+        table = read_csv_table(path, NODE_COLUMNS, chunk_size)
+        return {
+            "coordinates": np.column_stack((table["x"], table["y"])),
+            "free": np.column_stack((table["free_x"], table["free_y"])) != 0,
+            "forces": np.column_stack((table["fx"], table["fy"])),
+            "prescribed": np.column_stack((table["ux"], table["uy"])),
+            "springs": np.column_stack((table["kx"], table["ky"])),
+        }
+    arrays = _load_array_file(path, mmap_mode)
+    if "" in arrays:
+        return {"coordinates": arrays[""]}
+    return arrays
+
+
+def _read_elements(
+    path: Path, chunk_size: int, mmap_mode: Optional[MmapMode]
+) -> dict[str, NDArray]:
+    if path.suffix == ".csv":
+        table = read_csv_table(path, ELEMENT_COLUMNS, chunk_size)
+        arrays: dict[str, NDArray] = {
+            "connectivity": np.column_stack(
+                (table["node1"], table["node2"])
+            ).astype(np.int64)
+        }
+        for name in ("youngs_modulus", "area"):
+            if not np.isnan(table[name]).all():
+                arrays[name] = table[name]
+        arrays["density"] = table["density"]
+        return arrays
+    arrays = _load_array_file(path, mmap_mode)
+    if "" in arrays:
+        return {"connectivity": arrays[""]}
+    return arrays
+
+
+def load_truss(
+    nodes_path: PathLike,
+    elements_path: PathLike,
+    youngs_modulus: Optional[float] = None,
+    area: Optional[float] = None,
+    chunk_size: int = 100_000,
+    mmap_mode: Optional[MmapMode] = "r",
+    sparse: bool = True,
+    solver: Union[str, SolverBackend] = "auto",
+) -> Truss:
+    """Load a truss from a node and an element table without creating any
+    Node or Element objects.
+
+    The tables are CSV files with a header row (see NODE_COLUMNS and
+    ELEMENT_COLUMNS), .npy files holding the (n, 2) coordinates or
+    connectivity, or .npz files holding arrays named after the TrussArrays
+    fields. CSV files are read in chunks of chunk_size rows. .npy files are
+    memory-mapped with mmap_mode and used by the truss without a copy when
+    their dtype already matches; pass mmap_mode="c" to allow writes that
+    stay in memory or None to read them completely. youngs_modulus and area
+    are the defaults for tables that do not contain these properties.
+
+    Raises:
+        ValueError: If a table misses a required column or property.
+        ConnectivityException: If an element references a node that does
+        not exist or connects a node to itself."""
+
+    nodes = _read_nodes(Path(nodes_path), chunk_size, mmap_mode)
+    elements = _read_elements(Path(elements_path), chunk_size, mmap_mode)
+    for name, default in (
+        ("youngs_modulus", youngs_modulus),
+        ("area", area),
+    ):
+        if name not in elements:
+            if default is None:
+                raise ValueError(
+                    f"The element table {elements_path} has no {name} and no"
+                    " default was given."
+                )
+            elements[name] = np.full(
+                len(elements["connectivity"]), default, dtype=np.float64
+            )
+
+    number_of_nodes = len(nodes["coordinates"])
+    number_of_elements = len(elements["connectivity"])
+    validate_connectivity(elements["connectivity"], number_of_nodes)
+    shape = (number_of_nodes, 2)
+    arrays = TrussArrays(
+        coordinates=nodes["coordinates"],
+        connectivity=elements["connectivity"],
+        youngs_modulus=elements["youngs_modulus"],
+        area=elements["area"],
+        free=nodes.get("free", np.ones(shape, dtype=bool)),
+        forces=nodes.get("forces", np.zeros(shape)),
+        prescribed=nodes.get("prescribed", np.zeros(shape)),
+        springs=nodes.get("springs", np.zeros(shape)),
+        dofs=np.arange(2 * number_of_nodes, dtype=np.int64).reshape(-1, 2),
+        density=elements.get("density", np.zeros(number_of_elements)),
+    )
+    return Truss.from_arrays(arrays, sparse=sparse, solver=solver, copy=False)
+
+
+RESULTS_MAGIC = b"TRUSSRES"
+RESULTS_FORMAT_VERSION = 1
+_ALIGNMENT = 64
+_PREAMBLE = np.dtype([("version", "<u4"), ("header_length", "<u4")])
+
+
+def _aligned(offset: int) -> int:
+    return -(-offset // _ALIGNMENT) * _ALIGNMENT
+
+
+def save_results(
+    truss: Truss,
+    path: PathLike,
+    load_cases: Optional[LoadCaseResults] = None,
+) -> None:
+    """Save the displacements, reactions and stresses set on the truss, and
+    optionally a block of load cases, in a binary results file.
+
+    The file starts with RESULTS_MAGIC, the format version and the length
+    of a JSON header that lists the dtype, shape and offset of every array.
+    The arrays follow as raw columns aligned to 64 bytes. Load cases are
+    stored case by case, so that a single case is contiguous on disk."""
+
+    columns: dict[str, NDArray] = {
+        "displacements": truss.node_store.displacements,
+        "reactions": truss.node_store.reactions,
+        "stresses": truss.element_store.stresses,
+        "supported_dofs": np.asarray(
+            truss.get_supported_dofs(), dtype=np.int64
+        ),
+    }
+    if load_cases is not None:
+        columns.update(
+            case_displacements=load_cases.displacements.T,
+            case_stresses=load_cases.stresses.T,
+            case_reactions=load_cases.reactions.T,
+        )
+    arrays: dict[str, NDArray] = {
+        name: np.ascontiguousarray(array).astype(
+            array.dtype.newbyteorder("<"), copy=False
+        )
+        for name, array in columns.items()
+    }
+
+    offsets: dict[str, int] = {}
+    offset = 0
+    for name, array in arrays.items():
+        offsets[name] = offset
+        offset = _aligned(offset + array.nbytes)
+    header: dict[str, dict[str, dict[str, object]]] = {
+        "arrays": {
+            name: {
+                "dtype": array.dtype.str,
+                "shape": list(array.shape),
+                "offset": offsets[name],
+            }
+            for name, array in arrays.items()
+        }
+    }
+    encoded = json.dumps(header).encode()
+    start = _aligned(len(RESULTS_MAGIC) + _PREAMBLE.itemsize + len(encoded))
+
+    with open(path, "wb") as file:
+        file.write(RESULTS_MAGIC)
+        file.write(
+            np.array(
+                (RESULTS_FORMAT_VERSION, len(encoded)), dtype=_PREAMBLE
+            ).tobytes()
+        )
+        file.write(encoded)
+        for name, array in arrays.items():
+            file.seek(start + offsets[name])
+            array.tofile(file)
+
+
+class ResultsFile:
+    """Read-only, memory-mapped view of a results file written by
+    save_results. Arrays are only mapped when they are accessed, so slicing
+    one load case or a range of members reads just that part of the file.
+
+    Raises:
+        ValueError: If the file is not a results file or was written by a
+        newer version of the format."""
+
+    def __init__(self, path: PathLike) -> None:
+        self.path = Path(path)
+        with open(self.path, "rb") as file:
+            if file.read(len(RESULTS_MAGIC)) != RESULTS_MAGIC:
+                raise ValueError(f"{path} is not a truss results file.")
+            preamble = np.frombuffer(
+                file.read(_PREAMBLE.itemsize), dtype=_PREAMBLE
+            )[0]
+            self.version = int(preamble["version"])
+            if self.version > RESULTS_FORMAT_VERSION:
+                raise ValueError(
+                    f"{path} uses results format version {self.version},"
+                    f" only versions up to {RESULTS_FORMAT_VERSION} are"
+                    " supported."
+                )
+            header = json.loads(file.read(int(preamble["header_length"])))
+        self._start = _aligned(
+            len(RESULTS_MAGIC)
+            + _PREAMBLE.itemsize
+            + int(preamble["header_length"])
+        )
+        self._layout: dict[str, dict] = header["arrays"]
+        self._arrays: dict[str, NDArray] = {}
+
+    @property
+    def names(self) -> list[str]:
+        return list(self._layout)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._layout
+
+    def __getitem__(self, name: str) -> NDArray:
+        if name not in self._arrays:
+            layout = self._layout[name]
+            shape = tuple(layout["shape"])
+            if 0 in shape:
+                array = np.empty(shape, dtype=layout["dtype"])
+            else:
+                array = np.memmap(
+                    self.path,
+                    dtype=layout["dtype"],
+                    mode="r",
+                    offset=self._start + layout["offset"],
+                    shape=shape,
+                )
+            self._arrays[name] = array
+        return self._arrays[name]
+
+    @property
+    def displacements(self) -> NDArray[np.float64]:
+        return self["displacements"]
+
+    @property
+    def reactions(self) -> NDArray[np.float64]:
+        return self["reactions"]
+
+    @property
+    def stresses(self) -> NDArray[np.float64]:
+        return self["stresses"]
+
+    @property
+    def supported_dofs(self) -> NDArray[np.int64]:
+        return self["supported_dofs"]
+
+    @property
+    def number_of_cases(self) -> int:
+        if "case_displacements" not in self:
+            return 0
+        return self._layout["case_displacements"]["shape"][0]
+
+    @property
+    def load_cases(self) -> LoadCaseResults:
+        """The block of load cases as column views of the mapped arrays."""
+
+        if not self.number_of_cases:
+            raise KeyError(f"{self.path} contains no load cases.")
+        return LoadCaseResults(
+            displacements=self["case_displacements"].T,
+            stresses=self["case_stresses"].T,
+            reactions=self["case_reactions"].T,
+        )
+
+    def load_case(self, index: int) -> LoadCaseResults:
+        """Returns the results of a single load case, which are read from
+        a contiguous part of the file."""
+
+        return self.load_cases.case(index)
+
+
+def load_results(path: PathLike) -> ResultsFile:
+    """Open a results file written by save_results."""
+
+    return ResultsFile(path)
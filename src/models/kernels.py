@@ -0,0 +1,311 @@
+from dataclasses import dataclass
+from typing import Optional, Union
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
+# Position of each entry of the 4x4 element block in the flattened
+# outer product of the direction vector [-c, -s, c, s] with itself.
+_BLOCK_ROWS = np.repeat(np.arange(4), 4)
+_BLOCK_COLS = np.tile(np.arange(4), 4)
+
+
+@dataclass
+class ElementGeometry:
+    """Lengths and direction cosines of a batch of elements."""
+
+    lengths: NDArray[np.float64]
+    cos: NDArray[np.float64]
+    sin: NDArray[np.float64]
+
+
+@dataclass
+class ElementStiffnessBatch:
+    """Global stiffness blocks of a batch of elements together with the
+    dofs each block row/column corresponds to."""
+
+    stiffness: NDArray[np.float64]
+    dofs: NDArray[np.int64]
+
+    def triplets(
+        self,
+    ) -> tuple[NDArray[np.int64], NDArray[np.int64], NDArray[np.float64]]:
+        """Returns the (rows, cols, values) triplets of the blocks, ready
+        to be scattered in the global stiffness matrix."""
+
+        rows, cols = block_indices(self.dofs)
+        return rows, cols, self.stiffness.reshape(-1)
+
+
+def block_indices(
+    dofs: NDArray[np.int64],
+) -> tuple[NDArray[np.int64], NDArray[np.int64]]:
+    """Returns the global (rows, cols) of every entry of the 4x4 blocks of
+    elements with the given (n_elements, 4) dofs, in block order."""
+
+    return dofs[:, _BLOCK_ROWS].ravel(), dofs[:, _BLOCK_COLS].ravel()
+
+
+def element_dofs(
+    connectivity: ArrayLike,
+    node_dofs: Optional[ArrayLike] = None,
+) -> NDArray[np.int64]:
+    """Returns an (n_elements, 4) array with the dofs of the two nodes of
+    each element.
+
+    node_dofs maps every node to its (x, y) dofs. When it is omitted the
+    dofs of node i are 2i and 2i + 1."""
+
+    connectivity = np.asarray(connectivity, dtype=np.int64).reshape(-1, 2)
+    if node_dofs is None:
+        dofs = np.empty((connectivity.shape[0], 4), dtype=np.int64)
+        dofs[:, 0::2] = 2 * connectivity
+        dofs[:, 1::2] = 2 * connectivity + 1
+        return dofs
+    node_dofs = np.asarray(node_dofs, dtype=np.int64).reshape(-1, 2)
+    return node_dofs[connectivity].reshape(-1, 4)
+
+
+def element_geometry(
+    coordinates: ArrayLike, connectivity: ArrayLike
+) -> ElementGeometry:
+    """Returns the lengths and the direction cosines of every element."""
+
+    coordinates = np.asarray(coordinates, dtype=np.float64).reshape(-1, 2)
+    connectivity = np.asarray(connectivity, dtype=np.int64).reshape(-1, 2)
+    delta = coordinates[connectivity[:, 1]] - coordinates[connectivity[:, 0]]
+    lengths = np.sqrt(delta[:, 0] ** 2 + delta[:, 1] ** 2)
+    return ElementGeometry(
+        lengths=lengths,
+        cos=delta[:, 0] / lengths,
+        sin=delta[:, 1] / lengths,
+    )
+
+
+def direction_blocks(
+    cos: NDArray[np.float64], sin: NDArray[np.float64]
+) -> NDArray[np.float64]:
+    """Returns the (n_elements, 4, 4) blocks of the products of the
+    direction cosines, i.e. the element stiffness matrices without the
+    EA/L factor."""
+
+    direction = np.stack((-cos, -sin, cos, sin), axis=1)
+    return direction[:, :, np.newaxis] * direction[:, np.newaxis, :]
+
+
+def global_stiffness_matrices(
+    coordinates: ArrayLike,
+    connectivity: ArrayLike,
+    youngs_modulus: Union[ArrayLike, float],
+    area: Union[ArrayLike, float],
+    node_dofs: Optional[ArrayLike] = None,
+) -> ElementStiffnessBatch:
+    """Returns the global stiffness matrices of a batch of elements.
+
+    coordinates is an (n_nodes, 2) array, connectivity an (n_elements, 2)
+    array with the node indices of each element and youngs_modulus, area
+    are scalars or arrays with one entry per element."""
+
+    geometry = element_geometry(coordinates, connectivity)
+    axial_stiffness = (
+        np.asarray(youngs_modulus, dtype=np.float64)
+        * np.asarray(area, dtype=np.float64)
+        / geometry.lengths
+    )
+    stiffness = axial_stiffness[:, np.newaxis, np.newaxis] * direction_blocks(
+        geometry.cos, geometry.sin
+    )
+    return ElementStiffnessBatch(
+        stiffness=stiffness, dofs=element_dofs(connectivity, node_dofs)
+    )
+
+
+def geometric_stiffness_matrices(
+    coordinates: ArrayLike,
+    connectivity: ArrayLike,
+    axial_forces: ArrayLike,
+    node_dofs: Optional[ArrayLike] = None,
+) -> ElementStiffnessBatch:
+    """Returns the geometric stiffness matrices, N/L z z^T, of a batch of
+    elements under the axial forces N (tension positive), z being the
+    transverse direction vector of each element. They share the block
+    layout, hence the sparsity pattern, of the stiffness matrices."""
+
+    geometry = element_geometry(coordinates, connectivity)
+    forces = np.asarray(axial_forces, dtype=np.float64) / geometry.lengths
+    return ElementStiffnessBatch(
+        stiffness=forces[:, np.newaxis, np.newaxis]
+        * direction_blocks(-geometry.sin, geometry.cos),
+        dofs=element_dofs(connectivity, node_dofs),
+    )
+
+
+# Consistent mass matrix of a bar over rho * A * L / 6, the same in local
+# and global axes since it couples only parallel dofs.
+_CONSISTENT_MASS = (
+    np.array(
+        [
+            [2.0, 0.0, 1.0, 0.0],
+            [0.0, 2.0, 0.0, 1.0],
+            [1.0, 0.0, 2.0, 0.0],
+            [0.0, 1.0, 0.0, 2.0],
+        ]
+    )
+    / 6
+)
+
+
+def element_masses(
+    coordinates: ArrayLike,
+    connectivity: ArrayLike,
+    density: Union[ArrayLike, float],
+    area: Union[ArrayLike, float],
+) -> NDArray[np.float64]:
+    """Returns the mass, density * area * length, of every element."""
+
+    lengths = element_geometry(coordinates, connectivity).lengths
+    return (
+        np.asarray(density, dtype=np.float64)
+        * np.asarray(area, dtype=np.float64)
+        * lengths
+    )
+
+
+def consistent_mass_matrices(
+    coordinates: ArrayLike,
+    connectivity: ArrayLike,
+    density: Union[ArrayLike, float],
+    area: Union[ArrayLike, float],
+    node_dofs: Optional[ArrayLike] = None,
+) -> ElementStiffnessBatch:
+    """Returns the consistent mass matrices of a batch of elements, in the
+    same block layout as their stiffness matrices so that both share the
+    sparsity pattern. The lumped mass matrices are diagonal, half of the
+    element mass on each dof, see element_masses."""
+
+    masses = element_masses(coordinates, connectivity, density, area)
+    return ElementStiffnessBatch(
+        stiffness=masses[:, np.newaxis, np.newaxis] * _CONSISTENT_MASS,
+        dofs=element_dofs(connectivity, node_dofs),
+    )
+
+
+def axial_strains(
+    coordinates: ArrayLike,
+    connectivity: ArrayLike,
+    displacements: ArrayLike,
+    node_dofs: Optional[ArrayLike] = None,
+) -> NDArray[np.float64]:
+    """Returns the axial strains of a batch of elements.
+
+    displacements is a dof ordered (n_dofs,) vector or an (n_dofs, n_cases)
+    block, the result has the same number of dimensions with one row per
+    element. All the elements are gathered and multiplied at once."""
+
+    geometry = element_geometry(coordinates, connectivity)
+    displacements = np.asarray(displacements, dtype=np.float64)
+    dofs = element_dofs(connectivity, node_dofs)
+    # (n_elements, 4) or (n_elements, 4, n_cases)
+    element_displacements = displacements[dofs]
+    direction = np.stack(
+        (-geometry.cos, -geometry.sin, geometry.cos, geometry.sin), axis=1
+    )
+    elongation = np.einsum("ej,ej...->e...", direction, element_displacements)
+    return (
+        broadcast_per_element(1 / geometry.lengths, elongation.ndim)
+        * elongation
+    )
+
+
+def axial_stresses(
+    coordinates: ArrayLike,
+    connectivity: ArrayLike,
+    youngs_modulus: Union[ArrayLike, float],
+    displacements: ArrayLike,
+    node_dofs: Optional[ArrayLike] = None,
+) -> NDArray[np.float64]:
+    """Returns the axial stresses of a batch of elements, see
+    axial_strains."""
+
+    strains = axial_strains(
+        coordinates, connectivity, displacements, node_dofs
+    )
+    return broadcast_per_element(youngs_modulus, strains.ndim) * strains
+
+
+@dataclass
+class CorotationalBatch:
+    """State of a batch of elements in their deformed configuration:
+    axial forces, internal nodal force vectors (n_elements, 4) and tangent
+    stiffness blocks, all in global axes."""
+
+    axial_forces: NDArray[np.float64]
+    internal_forces: NDArray[np.float64]
+    tangent: ElementStiffnessBatch
+
+
+def corotational_elements(
+    coordinates: ArrayLike,
+    connectivity: ArrayLike,
+    youngs_modulus: Union[ArrayLike, float],
+    area: Union[ArrayLike, float],
+    displacements: ArrayLike,
+    node_dofs: Optional[ArrayLike] = None,
+) -> CorotationalBatch:
+    """Returns the corotational state of a batch of elements for the node
+    ordered (n_nodes, 2) displacements.
+
+    The element frame follows the deformed chord, the engineering strain
+    is (l - L) / L and the tangent is the material stiffness EA/L b b^T
+    plus the geometric stiffness N/l z z^T, b and z being the axial and
+    the transverse direction vectors of the deformed element."""
+
+    coordinates = np.asarray(coordinates, dtype=np.float64).reshape(-1, 2)
+    connectivity = np.asarray(connectivity, dtype=np.int64).reshape(-1, 2)
+    displacements = np.asarray(displacements, dtype=np.float64).reshape(-1, 2)
+    chords = coordinates[connectivity[:, 1]] - coordinates[connectivity[:, 0]]
+    relative = (
+        displacements[connectivity[:, 1]] - displacements[connectivity[:, 0]]
+    )
+    lengths = np.hypot(chords[:, 0], chords[:, 1])
+    deformed = chords + relative
+    current_lengths = np.hypot(deformed[:, 0], deformed[:, 1])
+    # l - L from (l^2 - L^2) / (l + L), free of the cancellation of the
+    # difference of two nearly equal lengths under small strains.
+    elongations = np.einsum("ij,ij->i", 2 * chords + relative, relative) / (
+        current_lengths + lengths
+    )
+    axial_stiffness = (
+        np.asarray(youngs_modulus, dtype=np.float64)
+        * np.asarray(area, dtype=np.float64)
+        / lengths
+    )
+    axial_forces = axial_stiffness * elongations
+    cos, sin = (deformed / current_lengths[:, np.newaxis]).T
+    axial = np.stack((-cos, -sin, cos, sin), axis=1)
+    material = direction_blocks(cos, sin)
+    geometric = direction_blocks(-sin, cos)
+    tangent = (
+        axial_stiffness[:, np.newaxis, np.newaxis] * material
+        + (axial_forces / current_lengths)[:, np.newaxis, np.newaxis]
+        * geometric
+    )
+    return CorotationalBatch(
+        axial_forces=axial_forces,
+        internal_forces=axial_forces[:, np.newaxis] * axial,
+        tangent=ElementStiffnessBatch(
+            stiffness=tangent, dofs=element_dofs(connectivity, node_dofs)
+        ),
+    )
+
+
+def broadcast_per_element(
+    values: Union[ArrayLike, float], ndim: int
+) -> NDArray[np.float64]:
+    """Reshape per element values to broadcast against an array with one
+    row per element and ndim dimensions."""
+
+    values = np.asarray(values, dtype=np.float64)
+    if values.ndim == 0:
+        return values
+    return values.reshape((-1,) + (1,) * (ndim - 1))
@@ -0,0 +1,30 @@
+from dataclasses import dataclass
+
+import numpy as np
+from numpy.typing import NDArray
+
+
+@dataclass
+class LoadCaseResults:
+    """Results of a block of load cases, one column per load case.
+
+    displacements are arranged by node (rows 2i and 2i + 1 belong to node
+    i), stresses by element and reactions by supported dof, in the order of
+    Truss.get_supported_dofs."""
+
+    displacements: NDArray[np.float64]
+    stresses: NDArray[np.float64]
+    reactions: NDArray[np.float64]
+
+    @property
+    def number_of_cases(self) -> int:
+        return self.displacements.shape[1]
+
+    def case(self, index: int) -> "LoadCaseResults":
+        """Returns the results of a single load case."""
+
+        return LoadCaseResults(
+            displacements=self.displacements[:, index : index + 1],
+            stresses=self.stresses[:, index : index + 1],
+            reactions=self.reactions[:, index : index + 1],
+        )
@@ -1,8 +1,13 @@
 import itertools
-from dataclasses import dataclass
+from dataclasses import astuple, dataclass
 from typing import NamedTuple
 
-from .boundary_conditions import BoundaryCondition, FreeMoving
+from .boundary_conditions import (
+    BoundaryCondition,
+    FreeMoving,
+    boundary_condition_from_mask,
+)
+from .store import NodeStore
 
 
 class Dofs(NamedTuple):
@@ -10,25 +15,47 @@ class Dofs(NamedTuple):
     y: int
 
 
-@dataclass
+@dataclass(frozen=True)
 class NodalForce:
     fx: float = 0
     fy: float = 0
 
 
-@dataclass
+@dataclass(frozen=True)
 class Reaction:
     fx: float = 0
     fy: float = 0
 
 
-@dataclass
+@dataclass(frozen=True)
 class NodalDisplacement:
     x: float = 0
     y: float = 0
 
 
+@dataclass(frozen=True)
+class SpringSupport:
+    """Stiffness of an elastic support in each direction."""
+
+    kx: float = 0
+    ky: float = 0
+
+
 class Node:
+    """Handle of a node whose data live in a NodeStore.
+
+    A node owns a single row store until it becomes part of a truss. The
+    truss then copies the node in its own store and rebinds the handle, so
+    every read or write of the node goes to the arrays of the truss and the
+    dofs are numbered per truss.
+
+    The force, settlement, spring, nodal displacements and reaction of a
+    node are read from its row of the store into frozen values, so they
+    are changed by assigning a new value, node.force = NodalForce(0, -5e4),
+    and not in place."""
+
+    __slots__ = ("id", "_store", "_index")
+
     id_iter = itertools.count()
     number_of_dofs = 2
 
@@ -38,15 +65,130 @@ class Node:
         y: float,
         boundary_condition: BoundaryCondition = FreeMoving(),
         force: NodalForce = NodalForce(),
+        settlement: NodalDisplacement = NodalDisplacement(),
+        spring: SpringSupport = SpringSupport(),
     ) -> None:
-        self.x = x
-        self.y = y
         self.id: int = next(self.id_iter)
-        self.dofs: Dofs = Dofs(x=2 * self.id, y=2 * self.id + 1)
+        self._store = NodeStore([[x, y]])
+        self._index = 0
         self.boundary_condition = boundary_condition
         self.force = force
-        self.nodal_displacements = NodalDisplacement(0, 0)
-        self.reaction: Reaction = Reaction(0, 0)
+        self.settlement = settlement
+        self.spring = spring
+
+    @classmethod
+    def view(cls, store: NodeStore, index: int) -> "Node":
+        """Create a handle to a node that already lives in the store."""
+
+        node = cls.__new__(cls)
+        node.id = next(cls.id_iter)
+        node.bind(store, index)
+        return node
+
+    def bind(self, store: NodeStore, index: int) -> None:
+        """Point the node to the row index of the store."""
+
+        self._store = store
+        self._index = index
+
+    @property
+    def store(self) -> NodeStore:
+        """The store the node reads and writes its data from."""
+
+        return self._store
+
+    @property
+    def index(self) -> int:
+        """The row of the node in its store."""
+
+        return self._index
+
+    @property
+    def x(self) -> float:
+        return float(self._store.coordinates[self._index, 0])
+
+    @x.setter
+    def x(self, value: float) -> None:
+        self._store.coordinates[self._index, 0] = value
+        self._store.touch_geometry()
+
+    @property
+    def y(self) -> float:
+        return float(self._store.coordinates[self._index, 1])
+
+    @y.setter
+    def y(self, value: float) -> None:
+        self._store.coordinates[self._index, 1] = value
+        self._store.touch_geometry()
+
+    @property
+    def dofs(self) -> Dofs:
+        x, y = self._store.dofs[self._index]
+        return Dofs(x=int(x), y=int(y))
+
+    @property
+    def boundary_condition(self) -> BoundaryCondition:
+        is_free_in_x, is_free_in_y = self._store.free[self._index]
+        return boundary_condition_from_mask(is_free_in_x, is_free_in_y)
+
+    @boundary_condition.setter
+    def boundary_condition(self, value: BoundaryCondition) -> None:
+        self._store.free[self._index] = (
+            value.is_free_in_x,
+            value.is_free_in_y,
+        )
+        self._store.touch_boundary_conditions()
+
+    @property
+    def force(self) -> NodalForce:
+        fx, fy = self._store.forces[self._index]
+        return NodalForce(float(fx), float(fy))
+
+    @force.setter
+    def force(self, value: NodalForce) -> None:
+        self._store.forces[self._index] = (value.fx, value.fy)
+
+    @property
+    def settlement(self) -> NodalDisplacement:
+        """The prescribed displacement of the restrained dofs of the node.
+        It is ignored in the directions the node is free to move."""
+
+        x, y = self._store.prescribed[self._index]
+        return NodalDisplacement(float(x), float(y))
+
+    @settlement.setter
+    def settlement(self, value: NodalDisplacement) -> None:
+        self._store.prescribed[self._index] = (value.x, value.y)
+
+    @property
+    def spring(self) -> SpringSupport:
+        """The elastic support of the node."""
+
+        kx, ky = self._store.springs[self._index]
+        return SpringSupport(float(kx), float(ky))
+
+    @spring.setter
+    def spring(self, value: SpringSupport) -> None:
+        self._store.springs[self._index] = (value.kx, value.ky)
+        self._store.touch_boundary_conditions()
+
+    @property
+    def nodal_displacements(self) -> NodalDisplacement:
+        x, y = self._store.displacements[self._index]
+        return NodalDisplacement(float(x), float(y))
+
+    @nodal_displacements.setter
+    def nodal_displacements(self, value: NodalDisplacement) -> None:
+        self._store.displacements[self._index] = (value.x, value.y)
+
+    @property
+    def reaction(self) -> Reaction:
+        fx, fy = self._store.reactions[self._index]
+        return Reaction(float(fx), float(fy))
+
+    @reaction.setter
+    def reaction(self, value: Reaction) -> None:
+        self._store.reactions[self._index] = (value.fx, value.fy)
 
     def is_supported(self) -> bool:
         """Check if the node is supported."""
@@ -78,14 +220,14 @@ class Node:
 
     def __key(
         self,
-    ) -> tuple[float, float, int, Dofs, BoundaryCondition, NodalForce]:
+    ) -> tuple[float, float, int, Dofs, BoundaryCondition, tuple]:
         return (
             self.x,
             self.y,
             self.id,
             self.dofs,
             self.boundary_condition,
-            self.force,
+            astuple(self.force),
         )
 
     def __hash__(self) -> int:
@@ -0,0 +1,168 @@
+from dataclasses import dataclass
+from typing import Optional, Union
+
+import numpy as np
+from numpy.typing import NDArray
+from scipy import sparse as sp
+
+StiffnessMatrix = Union[NDArray[np.float64], sp.csr_matrix]
+
+
+def as_dense(
+    matrix: Union[NDArray[np.float64], sp.spmatrix]
+) -> NDArray[np.float64]:
+    """Returns a dense array of a dense or sparse matrix."""
+
+    if isinstance(matrix, np.ndarray):
+        return matrix
+    return np.asarray(matrix.toarray())
+
+
+@dataclass
+class PartitionedSystem:
+    """Global stiffness matrix partitioned in free (f) and restrained (r)
+    dofs.
+
+    The dofs are permuted once so that the free ones come first, which
+    makes every block a view of the permuted matrix for dense systems and a
+    contiguous slice for sparse ones."""
+
+    free_dofs: NDArray[np.int64]
+    restrained_dofs: NDArray[np.int64]
+    stiffness_ff: StiffnessMatrix
+    stiffness_fr: StiffnessMatrix
+    stiffness_rf: StiffnessMatrix
+    stiffness_rr: StiffnessMatrix
+
+    @classmethod
+    def from_stiffness(
+        cls,
+        stiffness: StiffnessMatrix,
+        free_dofs: NDArray[np.int64],
+        restrained_dofs: NDArray[np.int64],
+        springs: Optional[NDArray[np.float64]] = None,
+    ) -> "PartitionedSystem":
+        """Partition the global stiffness matrix.
+
+        springs is an optional dof ordered vector with the stiffness of
+        elastic supports, which is added to the diagonal in the same pass."""
+
+        order = np.concatenate((free_dofs, restrained_dofs))
+        number_of_free_dofs = len(free_dofs)
+
+        if sp.issparse(stiffness):
+            if springs is not None and np.any(springs):
+                stiffness = stiffness + sp.diags(springs, format="csr")
+            permuted = sp.csr_matrix(stiffness[order][:, order])
+            free_rows = permuted[:number_of_free_dofs]
+            restrained_rows = permuted[number_of_free_dofs:]
+            return cls(
+                free_dofs=free_dofs,
+                restrained_dofs=restrained_dofs,
+                stiffness_ff=free_rows[:, :number_of_free_dofs],
+                stiffness_fr=free_rows[:, number_of_free_dofs:],
+                stiffness_rf=restrained_rows[:, :number_of_free_dofs],
+                stiffness_rr=restrained_rows[:, number_of_free_dofs:],
+            )
+
+        permuted = stiffness[np.ix_(order, order)]
+        if springs is not None and np.any(springs):
+            permuted[np.diag_indices_from(permuted)] += springs[order]
+        return cls(
+            free_dofs=free_dofs,
+            restrained_dofs=restrained_dofs,
+            stiffness_ff=permuted[:number_of_free_dofs, :number_of_free_dofs],
+            stiffness_fr=permuted[:number_of_free_dofs, number_of_free_dofs:],
+            stiffness_rf=permuted[number_of_free_dofs:, :number_of_free_dofs],
+            stiffness_rr=permuted[number_of_free_dofs:, number_of_free_dofs:],
+        )
+
+    def updated(
+        self,
+        rows: NDArray[np.int64],
+        cols: NDArray[np.int64],
+        values: NDArray[np.float64],
+    ) -> "PartitionedSystem":
+        """Returns a new system with the (rows, cols, values) triplets of
+        global dofs added to its blocks, e.g. the stiffness change of a
+        few elements, without re-partitioning the global matrix."""
+
+        order = np.concatenate((self.free_dofs, self.restrained_dofs))
+        position = np.empty_like(order)
+        position[order] = np.arange(len(order))
+        rows, cols = position[rows], position[cols]
+        number_of_free_dofs = len(self.free_dofs)
+
+        if sp.issparse(self.stiffness_ff):
+            delta = sp.csr_matrix(
+                (values, (rows, cols)), shape=(len(order), len(order))
+            )
+            free_rows = delta[:number_of_free_dofs]
+            restrained_rows = delta[number_of_free_dofs:]
+            return PartitionedSystem(
+                free_dofs=self.free_dofs,
+                restrained_dofs=self.restrained_dofs,
+                stiffness_ff=sp.csr_matrix(
+                    self.stiffness_ff + free_rows[:, :number_of_free_dofs]
+                ),
+                stiffness_fr=sp.csr_matrix(
+                    self.stiffness_fr + free_rows[:, number_of_free_dofs:]
+                ),
+                stiffness_rf=sp.csr_matrix(
+                    self.stiffness_rf
+                    + restrained_rows[:, :number_of_free_dofs]
+                ),
+                stiffness_rr=sp.csr_matrix(
+                    self.stiffness_rr
+                    + restrained_rows[:, number_of_free_dofs:]
+                ),
+            )
+
+        permuted = np.block(
+            [
+                [self.stiffness_ff, self.stiffness_fr],
+                [self.stiffness_rf, self.stiffness_rr],
+            ]
+        )
+        np.add.at(permuted, (rows, cols), values)
+        return PartitionedSystem(
+            free_dofs=self.free_dofs,
+            restrained_dofs=self.restrained_dofs,
+            stiffness_ff=permuted[:number_of_free_dofs, :number_of_free_dofs],
+            stiffness_fr=permuted[:number_of_free_dofs, number_of_free_dofs:],
+            stiffness_rf=permuted[number_of_free_dofs:, :number_of_free_dofs],
+            stiffness_rr=permuted[number_of_free_dofs:, number_of_free_dofs:],
+        )
+
+    def reduce_forces(
+        self,
+        forces: NDArray[np.float64],
+        prescribed: NDArray[np.float64],
+    ) -> NDArray[np.float64]:
+        """Returns the right hand side of the free dofs, f_f - K_fr @ u_r.
+
+        forces is dof ordered, prescribed holds the displacements of the
+        restrained dofs. Both may carry one column per load case."""
+
+        free_forces = forces[self.free_dofs]
+        if not np.any(prescribed):
+            return free_forces
+        return free_forces - self.__matmul(self.stiffness_fr, prescribed)
+
+    def reactions(
+        self,
+        free_displacements: NDArray[np.float64],
+        prescribed: NDArray[np.float64],
+    ) -> NDArray[np.float64]:
+        """Returns the reactions of the restrained dofs,
+        K_rf @ u_f + K_rr @ u_r."""
+
+        return self.__matmul(
+            self.stiffness_rf, free_displacements
+        ) + self.__matmul(self.stiffness_rr, prescribed)
+
+    @staticmethod
+    def __matmul(
+        matrix: StiffnessMatrix, vector: NDArray[np.float64]
+    ) -> NDArray[np.float64]:
+        return np.asarray(matrix @ vector)
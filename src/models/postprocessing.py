@@ -0,0 +1,117 @@
+from dataclasses import dataclass
+from typing import Optional, Union
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
+from .kernels import broadcast_per_element, axial_strains
+
+QUANTITIES = ("strains", "stresses", "axial_forces", "utilization")
+
+
+@dataclass
+class ElementResults:
+    """Axial results of every element, one row per element and, for
+    several load cases, one column per load case.
+
+    utilization is |stress| / allowable stress and is None when no
+    allowable stress was given."""
+
+    strains: NDArray[np.float64]
+    stresses: NDArray[np.float64]
+    axial_forces: NDArray[np.float64]
+    utilization: Optional[NDArray[np.float64]] = None
+
+    def get(self, quantity: str) -> NDArray[np.float64]:
+        """Returns the array of the quantity by name."""
+
+        if quantity not in QUANTITIES:
+            raise ValueError(
+                f"Unknown quantity {quantity!r}, expected one of"
+                f" {QUANTITIES}."
+            )
+        values = getattr(self, quantity)
+        if values is None:
+            raise ValueError(
+                f"{quantity} is not available, pass an allowable stress."
+            )
+        return values
+
+    def max(
+        self, quantity: str = "stresses"
+    ) -> tuple[NDArray[np.int64], NDArray[np.float64]]:
+        """Returns the index of the element with the largest value of the
+        quantity and the value itself, per load case."""
+
+        values = self.get(quantity)
+        indices = np.argmax(values, axis=0)
+        return (
+            indices,
+            np.take_along_axis(values, np.expand_dims(indices, 0), axis=0)[0],
+        )
+
+    def min(
+        self, quantity: str = "stresses"
+    ) -> tuple[NDArray[np.int64], NDArray[np.float64]]:
+        """Returns the index of the element with the smallest value of the
+        quantity and the value itself, per load case."""
+
+        values = self.get(quantity)
+        indices = np.argmin(values, axis=0)
+        return (
+            indices,
+            np.take_along_axis(values, np.expand_dims(indices, 0), axis=0)[0],
+        )
+
+    def top_k(
+        self,
+        k: int,
+        quantity: str = "utilization",
+        absolute: bool = True,
+    ) -> NDArray[np.int64]:
+        """Returns the indices of the k critical elements, those with the
+        largest (absolute) value of the quantity, in descending order.
+
+        The selection is a partial sort, O(n_elements) per load case."""
+
+        values = self.get(quantity)
+        if absolute:
+            values = np.abs(values)
+        k = min(k, values.shape[0])
+        if k <= 0:
+            return np.empty((0,) + values.shape[1:], dtype=np.int64)
+        candidates = np.argpartition(-values, k - 1, axis=0)[:k]
+        order = np.argsort(
+            -np.take_along_axis(values, candidates, axis=0), axis=0
+        )
+        return np.take_along_axis(candidates, order, axis=0)
+
+
+def element_results(
+    coordinates: ArrayLike,
+    connectivity: ArrayLike,
+    youngs_modulus: Union[ArrayLike, float],
+    area: Union[ArrayLike, float],
+    displacements: ArrayLike,
+    node_dofs: Optional[ArrayLike] = None,
+    allowable_stress: Optional[Union[ArrayLike, float]] = None,
+) -> ElementResults:
+    """Recover the strain, the stress, the axial force and the utilization
+    of every element from one displacement vector, or from an
+    (n_dofs, n_cases) block of them, in a single gather and multiply."""
+
+    strains = axial_strains(
+        coordinates, connectivity, displacements, node_dofs
+    )
+    stresses = broadcast_per_element(youngs_modulus, strains.ndim) * strains
+    return ElementResults(
+        strains=strains,
+        stresses=stresses,
+        axial_forces=broadcast_per_element(area, strains.ndim) * stresses,
+        utilization=(
+            None
+            if allowable_stress is None
+            else np.abs(stresses)
+            / broadcast_per_element(allowable_stress, strains.ndim)
+        ),
+    )
@@ -0,0 +1,88 @@
+from dataclasses import dataclass
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+from scipy import sparse as sp
+from scipy.sparse.csgraph import reverse_cuthill_mckee
+
+from .kernels import element_dofs
+
+
+@dataclass
+class BandStatistics:
+    """Bandwidth and profile (envelope size) of the lower triangle of the
+    stiffness matrix for a given dof numbering."""
+
+    bandwidth: int
+    profile: int
+
+
+@dataclass
+class ReorderingReport:
+    """Band statistics before and after renumbering the dofs.
+
+    node_order lists the nodes in their new numbering order, so that node
+    node_order[k] owns the dofs 2k and 2k + 1."""
+
+    method: str
+    before: BandStatistics
+    after: BandStatistics
+    node_order: NDArray[np.int64]
+
+
+def node_adjacency(
+    connectivity: ArrayLike, number_of_nodes: int
+) -> sp.csr_matrix:
+    """Returns the symmetric node adjacency graph of the elements."""
+
+    connectivity = np.asarray(connectivity, dtype=np.int64).reshape(-1, 2)
+    rows = np.concatenate((connectivity[:, 0], connectivity[:, 1]))
+    cols = np.concatenate((connectivity[:, 1], connectivity[:, 0]))
+    return sp.csr_matrix(
+        (np.ones(len(rows), dtype=np.int8), (rows, cols)),
+        shape=(number_of_nodes, number_of_nodes),
+    )
+
+
+def reverse_cuthill_mckee_order(
+    connectivity: ArrayLike, number_of_nodes: int
+) -> NDArray[np.int64]:
+    """Returns the reverse Cuthill-McKee order of the nodes."""
+
+    return np.asarray(
+        reverse_cuthill_mckee(
+            node_adjacency(connectivity, number_of_nodes),
+            symmetric_mode=True,
+        ),
+        dtype=np.int64,
+    )
+
+
+def dofs_from_node_order(node_order: ArrayLike) -> NDArray[np.int64]:
+    """Returns the (n_nodes, 2) dof map that numbers the nodes in
+    node_order."""
+
+    node_order = np.asarray(node_order, dtype=np.int64)
+    rank = np.empty_like(node_order)
+    rank[node_order] = np.arange(len(node_order))
+    return np.stack((2 * rank, 2 * rank + 1), axis=1)
+
+
+def band_statistics(
+    connectivity: ArrayLike, node_dofs: ArrayLike
+) -> BandStatistics:
+    """Returns the bandwidth and the profile of the stiffness matrix that
+    the elements produce with the dof map node_dofs."""
+
+    node_dofs = np.asarray(node_dofs, dtype=np.int64).reshape(-1, 2)
+    dofs = element_dofs(connectivity, node_dofs)
+    number_of_dofs = node_dofs.size
+    # The first (leftmost) column of every row within the lower triangle.
+    first_column = np.arange(number_of_dofs, dtype=np.int64)
+    element_first_dof = dofs.min(axis=1)
+    np.minimum.at(first_column, dofs.ravel(), np.repeat(element_first_dof, 4))
+    row_widths = np.arange(number_of_dofs) - first_column
+    return BandStatistics(
+        bandwidth=int(row_widths.max(initial=0)),
+        profile=int(row_widths.sum()),
+    )
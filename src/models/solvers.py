@@ -0,0 +1,159 @@
+from typing import Optional, Sequence, Union
+
+import numpy as np
+from numpy.typing import NDArray
+from scipy import sparse as sp
+
+from .factorization import (
+    BandedCholeskyFactorization,
+    CholeskyFactorization,
+    ConjugateGradientFactorization,
+    Factorization,
+    SparseLUFactorization,
+)
+
+Matrix = Union[NDArray[np.float64], sp.spmatrix]
+
+
+class SolverBackend:
+    """Strategy that factorizes the reduced stiffness matrix of a truss.
+
+    The returned Factorization solves any number of right hand sides and
+    keeps a SolveReport with its wall times and iteration count."""
+
+    name = "base"
+
+    def factorize(self, matrix: Matrix) -> Factorization:
+        raise NotImplementedError
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}()"
+
+
+class DenseSolver(SolverBackend):
+    """Dense LAPACK Cholesky. O(n^3), fine up to a few thousand dofs."""
+
+    name = "dense"
+
+    def factorize(self, matrix: Matrix) -> Factorization:
+        if not isinstance(matrix, np.ndarray):
+            matrix = matrix.toarray()
+        return CholeskyFactorization(np.asarray(matrix))
+
+
+class SparseDirectSolver(SolverBackend):
+    """Sparse direct LU (SuperLU)."""
+
+    name = "sparse"
+
+    def factorize(self, matrix: Matrix) -> Factorization:
+        return SparseLUFactorization(sp.csc_matrix(matrix))
+
+
+class BandedSolver(SolverBackend):
+    """Banded Cholesky, suited to matrices with a small bandwidth."""
+
+    name = "banded"
+
+    def factorize(self, matrix: Matrix) -> Factorization:
+        return BandedCholeskyFactorization(sp.coo_matrix(matrix))
+
+
+class ConjugateGradientSolver(SolverBackend):
+    """Preconditioned conjugate gradient, see
+    ConjugateGradientFactorization for the available preconditioners."""
+
+    name = "cg"
+
+    def __init__(
+        self,
+        preconditioner: Optional[str] = "jacobi",
+        tolerance: float = 1e-10,
+        max_iterations: Optional[int] = None,
+    ) -> None:
+        self.preconditioner = preconditioner
+        self.tolerance = tolerance
+        self.max_iterations = max_iterations
+
+    def factorize(self, matrix: Matrix) -> Factorization:
+        return ConjugateGradientFactorization(
+            sp.csr_matrix(matrix),
+            preconditioner=self.preconditioner,
+            tolerance=self.tolerance,
+            max_iterations=self.max_iterations,
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"ConjugateGradientSolver(preconditioner={self.preconditioner!r},"
+            f" tolerance={self.tolerance},"
+            f" max_iterations={self.max_iterations})"
+        )
+
+
+class AutoSolver(SolverBackend):
+    """Picks a backend from the size and the sparsity of the matrix.
+
+    Small systems, or denser than dense_density, are solved with the dense
+    backend, systems up to direct_limit dofs with the sparse direct one and
+    larger ones with conjugate gradient."""
+
+    name = "auto"
+
+    def __init__(
+        self,
+        dense_limit: int = 2000,
+        dense_density: float = 0.2,
+        direct_limit: int = 500_000,
+    ) -> None:
+        self.dense_limit = dense_limit
+        self.dense_density = dense_density
+        self.direct_limit = direct_limit
+
+    def select(self, matrix: Matrix) -> SolverBackend:
+        """Returns the backend that suits the matrix."""
+
+        size = matrix.shape[0]
+        if size <= self.dense_limit:
+            return DenseSolver()
+
+        nonzeros = (
+            np.count_nonzero(matrix)
+            if isinstance(matrix, np.ndarray)
+            else matrix.nnz
+        )
+        if nonzeros / size ** 2 >= self.dense_density:
+            return DenseSolver()
+        if size <= self.direct_limit:
+            return SparseDirectSolver()
+        return ConjugateGradientSolver()
+
+    def factorize(self, matrix: Matrix) -> Factorization:
+        return self.select(matrix).factorize(matrix)
+
+
+_BACKENDS: Sequence[type[SolverBackend]] = (
+    DenseSolver,
+    SparseDirectSolver,
+    BandedSolver,
+    ConjugateGradientSolver,
+    AutoSolver,
+)
+
+SOLVERS: dict[str, type[SolverBackend]] = {
+    solver.name: solver for solver in _BACKENDS
+}
+
+
+def get_solver(solver: Union[str, SolverBackend]) -> SolverBackend:
+    """Returns the backend registered under solver, or solver itself if it
+    already is a backend."""
+
+    if isinstance(solver, SolverBackend):
+        return solver
+    try:
+        return SOLVERS[solver]()
+    except KeyError:
+        raise ValueError(
+            f"Unknown solver {solver!r}, expected one of {sorted(SOLVERS)}."
+        )
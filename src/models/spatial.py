@@ -0,0 +1,166 @@
+"""Spatial queries over node coordinates and trusses built from segments.
+
+    truss = truss_from_segments(segments, 2e11, 1e-3, tolerance=1e-6)
+    index = SpatialIndex(truss.node_store.coordinates)
+    supports = index.in_box((0, -1), (0, 1))
+    truss.node_store.free[supports] = False
+    truss.node_store.touch_boundary_conditions()
+
+The index is a KD-tree, so building it costs O(n log n) and a query
+O(log n) plus the size of its answer."""
+
+from typing import Union
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+from scipy import sparse as sp
+from scipy.sparse.csgraph import connected_components
+from scipy.spatial import cKDTree
+
+from .solvers import SolverBackend
+from .store import TrussArrays
+from .truss import Truss
+
+
+class SpatialIndex:
+    """KD-tree over (n_nodes, 2) coordinates. Queries return node indices,
+    the rows of the coordinates."""
+
+    def __init__(self, coordinates: ArrayLike) -> None:
+        self.coordinates = np.asarray(coordinates, dtype=np.float64).reshape(
+            -1, 2
+        )
+        self.tree = cKDTree(self.coordinates)
+
+    def __len__(self) -> int:
+        return len(self.coordinates)
+
+    def nearest(
+        self, points: ArrayLike, max_distance: float = np.inf
+    ) -> tuple[NDArray[np.float64], NDArray[np.int64]]:
+        """Returns the distance to and the index of the node nearest to
+        each of the (n_points, 2) points. Points without a node within
+        max_distance get an infinite distance and the index len(self)."""
+
+        distances, indices = self.tree.query(
+            np.asarray(points, dtype=np.float64),
+            distance_upper_bound=max_distance,
+        )
+        return distances, np.asarray(indices, dtype=np.int64)
+
+    def within(
+        self, point: ArrayLike, radius: float, norm: float = 2
+    ) -> NDArray[np.int64]:
+        """Returns the sorted indices of the nodes within radius of the
+        point, measured with the given Minkowski norm."""
+
+        indices = self.tree.query_ball_point(
+            np.asarray(point, dtype=np.float64), radius, p=norm
+        )
+        return np.sort(np.asarray(indices, dtype=np.int64))
+
+    def in_box(self, lower: ArrayLike, upper: ArrayLike) -> NDArray[np.int64]:
+        """Returns the sorted indices of the nodes inside the axis aligned
+        box between the lower and the upper corner, boundary included."""
+
+        lower = np.asarray(lower, dtype=np.float64)
+        upper = np.asarray(upper, dtype=np.float64)
+        half = (upper - lower) / 2
+        if np.any(half < 0):
+            raise ValueError("The lower corner of the box is above the upper.")
+        # The square around the box is a ball of the max norm, the nodes in
+        # it are then clipped to the box.
+        candidates = self.within(lower + half, float(half.max()), np.inf)
+        coordinates = self.coordinates[candidates]
+        inside = np.all(
+            (coordinates >= lower) & (coordinates <= upper), axis=1
+        )
+        return candidates[inside]
+
+
+def merge_coincident(
+    coordinates: ArrayLike, tolerance: float
+) -> tuple[NDArray[np.float64], NDArray[np.int64]]:
+    """Merge the points closer than tolerance to each other.
+
+    Returns the merged (n_unique, 2) coordinates, numbered in the order
+    the points first appear and placed at the first point of every group,
+    and the index of the merged point of every input point. Merging is
+    transitive, a chain of points each within tolerance of the next one
+    becomes a single point."""
+
+    coordinates = np.asarray(coordinates, dtype=np.float64).reshape(-1, 2)
+    count = len(coordinates)
+    pairs = cKDTree(coordinates).query_pairs(tolerance, output_type="ndarray")
+    _, labels = connected_components(
+        sp.csr_matrix(
+            (np.ones(len(pairs)), (pairs[:, 0], pairs[:, 1])),
+            shape=(count, count),
+        ),
+        directed=False,
+    )
+    # Renumber the groups by their first point.
+    _, first, inverse = np.unique(
+        labels, return_index=True, return_inverse=True
+    )
+    order = np.argsort(first)
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+    return coordinates[first[order]], rank[inverse].astype(np.int64)
+
+
+def truss_from_segments(
+    segments: ArrayLike,
+    youngs_modulus: Union[ArrayLike, float],
+    area: Union[ArrayLike, float],
+    tolerance: float = 1e-9,
+    density: Union[ArrayLike, float] = 0.0,
+    sparse: bool = False,
+    solver: Union[str, SolverBackend] = "auto",
+) -> Truss:
+    """Build a truss from line segments, an (n_segments, 2, 2) or
+    (n_segments, 4) array of their end points (x1, y1, x2, y2).
+
+    Endpoints closer than tolerance become a single node. Segments that
+    collapse to a point or repeat another one are dropped, along with the
+    nodes left without a segment, the section properties given per segment
+    follow the segments that are kept. All the nodes are free and
+    unloaded."""
+
+    segments = np.asarray(segments, dtype=np.float64).reshape(-1, 4)
+    coordinates, nodes = merge_coincident(segments.reshape(-1, 2), tolerance)
+    connectivity = nodes.reshape(-1, 2)
+
+    ends = np.sort(connectivity, axis=1)
+    _, kept = np.unique(ends, axis=0, return_index=True)
+    kept = np.sort(kept[ends[kept, 0] != ends[kept, 1]])
+    # Drop the nodes left only on dropped segments.
+    used = np.zeros(len(coordinates), dtype=bool)
+    used[connectivity[kept]] = True
+    renumber = np.cumsum(used) - 1
+    coordinates = coordinates[used]
+    connectivity = renumber[connectivity[kept]]
+
+    def per_segment(values: Union[ArrayLike, float]) -> NDArray[np.float64]:
+        values = np.asarray(values, dtype=np.float64)
+        if values.ndim == 0:
+            return np.full(len(kept), float(values))
+        return values.ravel()[kept]
+
+    return Truss.from_arrays(
+        TrussArrays(
+            coordinates=coordinates,
+            connectivity=connectivity,
+            youngs_modulus=per_segment(youngs_modulus),
+            area=per_segment(area),
+            free=np.ones_like(coordinates, dtype=bool),
+            forces=np.zeros_like(coordinates),
+            prescribed=np.zeros_like(coordinates),
+            springs=np.zeros_like(coordinates),
+            dofs=np.arange(coordinates.size, dtype=np.int64).reshape(-1, 2),
+            density=per_segment(density),
+        ),
+        sparse=sparse,
+        solver=solver,
+        copy=False,
+    )
@@ -0,0 +1,215 @@
+from dataclasses import dataclass
+from typing import Optional, Union
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
+
+def _as_array(
+    values: ArrayLike, dtype: type, shape: tuple[int, ...], copy: bool
+) -> NDArray:
+    """Returns values as an array of the given dtype and shape. Without copy
+    an array (or memory map) that already matches is used as is."""
+
+    if np.ndim(values) == 0:
+        return np.full(shape, values, dtype=dtype)
+    array = np.array(values, dtype=dtype, copy=True) if copy else values
+    array = np.asanyarray(array, dtype=dtype)
+    if array.shape == shape:
+        return array
+    if array.size == np.prod(shape):
+        return array.reshape(shape)
+    return np.broadcast_to(array, shape).copy()
+
+
+class NodeStore:
+    """Struct-of-arrays storage of the nodes of a truss.
+
+    Every nodal quantity is kept in a contiguous (n_nodes, 2) array, with
+    the x component in the first column and the y component in the second.
+    The dofs are numbered per store, so node i owns the dofs dofs[i].
+
+    geometry_version and boundary_condition_version are bumped on every
+    change of the coordinates/dofs and of the free masks or the springs
+    respectively, so that cached systems built from them can be
+    invalidated. Code that writes to the arrays directly must call the
+    matching touch method.
+
+    With copy=False the given arrays are used without a copy when their
+    dtype and shape already match, e.g. read-only memory maps of huge
+    models."""
+
+    def __init__(
+        self,
+        coordinates: ArrayLike,
+        free: Optional[ArrayLike] = None,
+        forces: Optional[ArrayLike] = None,
+        prescribed: Optional[ArrayLike] = None,
+        springs: Optional[ArrayLike] = None,
+        copy: bool = True,
+    ) -> None:
+        number_of_nodes = np.size(coordinates) // 2
+        shape = (number_of_nodes, 2)
+        self.coordinates: NDArray[np.float64] = _as_array(
+            coordinates, np.float64, shape, copy
+        )
+        self.free: NDArray[np.bool_] = _as_array(
+            True if free is None else free, bool, shape, copy
+        )
+        self.forces: NDArray[np.float64] = _as_array(
+            0.0 if forces is None else forces, np.float64, shape, copy
+        )
+        # Prescribed displacements (settlements) of the restrained dofs and
+        # stiffness of the elastic supports.
+        self.prescribed: NDArray[np.float64] = _as_array(
+            0.0 if prescribed is None else prescribed, np.float64, shape, copy
+        )
+        self.springs: NDArray[np.float64] = _as_array(
+            0.0 if springs is None else springs, np.float64, shape, copy
+        )
+        self.displacements: NDArray[np.float64] = np.zeros(
+            shape, dtype=np.float64
+        )
+        self.reactions: NDArray[np.float64] = np.zeros(shape, dtype=np.float64)
+        self.dofs: NDArray[np.int64] = np.arange(
+            2 * number_of_nodes, dtype=np.int64
+        ).reshape(shape)
+        self.geometry_version = 0
+        self.boundary_condition_version = 0
+
+    def __len__(self) -> int:
+        return self.coordinates.shape[0]
+
+    def touch_geometry(self) -> None:
+        """Mark the coordinates or the dof numbering as changed."""
+
+        self.geometry_version += 1
+
+    def touch_boundary_conditions(self) -> None:
+        """Mark the free masks or the springs as changed."""
+
+        self.boundary_condition_version += 1
+
+    @property
+    def number_of_dofs(self) -> int:
+        """The total degrees of freedom of the stored nodes."""
+
+        return 2 * len(self)
+
+    def get_free_dofs(self) -> NDArray[np.int64]:
+        """Returns the dofs that are free to move, in ascending order."""
+
+        return np.sort(self.dofs[self.free])
+
+    def get_restrained_dofs(self) -> NDArray[np.int64]:
+        """Returns the dofs that are supported, in ascending order."""
+
+        return np.sort(self.dofs[~self.free])
+
+    def scatter(self, values: NDArray[np.float64]) -> NDArray[np.float64]:
+        """Arranges an (n_nodes, 2) nodal array in a dof ordered vector."""
+
+        vector = np.zeros(self.number_of_dofs, dtype=np.float64)
+        vector[self.dofs.ravel()] = values.ravel()
+        return vector
+
+    def gather(self, vector: NDArray[np.float64]) -> NDArray[np.float64]:
+        """Arranges a dof ordered vector in an (n_nodes, 2) nodal array."""
+
+        return np.asarray(vector, dtype=np.float64).ravel()[self.dofs]
+
+
+class ElementStore:
+    """Struct-of-arrays storage of the elements of a truss.
+
+    connectivity holds the indices of the two nodes of every element in the
+    node store of the truss. section_version is bumped on every change of
+    the section properties, see NodeStore also for copy. density is the
+    mass per unit volume, which only the mass matrix depends on."""
+
+    def __init__(
+        self,
+        connectivity: ArrayLike,
+        youngs_modulus: ArrayLike,
+        area: ArrayLike,
+        density: ArrayLike = 0.0,
+        copy: bool = True,
+    ) -> None:
+        number_of_elements = np.size(connectivity) // 2
+        self.connectivity: NDArray[np.int64] = _as_array(
+            connectivity, np.int64, (number_of_elements, 2), copy
+        )
+        self.youngs_modulus: NDArray[np.float64] = _as_array(
+            youngs_modulus, np.float64, (number_of_elements,), copy
+        )
+        self.area: NDArray[np.float64] = _as_array(
+            area, np.float64, (number_of_elements,), copy
+        )
+        self.density: NDArray[np.float64] = _as_array(
+            density, np.float64, (number_of_elements,), copy
+        )
+        self.stresses: NDArray[np.float64] = np.zeros(
+            number_of_elements, dtype=np.float64
+        )
+        self.section_version = 0
+
+    def __len__(self) -> int:
+        return self.connectivity.shape[0]
+
+    def touch_sections(self) -> None:
+        """Mark the youngs modulus, the area or the density as changed."""
+
+        self.section_version += 1
+
+
+@dataclass
+class TrussArrays:
+    """Plain array description of a truss, cheap to pickle and to build a
+    truss from without per member Python objects. See NodeStore and
+    ElementStore for the layout of the arrays."""
+
+    coordinates: NDArray[np.float64]
+    connectivity: NDArray[np.int64]
+    youngs_modulus: NDArray[np.float64]
+    area: NDArray[np.float64]
+    free: NDArray[np.bool_]
+    forces: NDArray[np.float64]
+    prescribed: NDArray[np.float64]
+    springs: NDArray[np.float64]
+    dofs: NDArray[np.int64]
+    density: Union[NDArray[np.float64], float] = 0.0
+
+    @classmethod
+    def from_stores(
+        cls, nodes: NodeStore, elements: ElementStore
+    ) -> "TrussArrays":
+        return cls(
+            coordinates=nodes.coordinates.copy(),
+            connectivity=elements.connectivity.copy(),
+            youngs_modulus=elements.youngs_modulus.copy(),
+            area=elements.area.copy(),
+            free=nodes.free.copy(),
+            forces=nodes.forces.copy(),
+            prescribed=nodes.prescribed.copy(),
+            springs=nodes.springs.copy(),
+            dofs=nodes.dofs.copy(),
+            density=elements.density.copy(),
+        )
+
+    def to_stores(self, copy: bool = True) -> tuple[NodeStore, ElementStore]:
+        nodes = NodeStore(
+            self.coordinates,
+            free=self.free,
+            forces=self.forces,
+            prescribed=self.prescribed,
+            springs=self.springs,
+            copy=copy,
+        )
+        nodes.dofs[:] = self.dofs
+        return nodes, ElementStore(
+            self.connectivity,
+            self.youngs_modulus,
+            self.area,
+            density=self.density,
+            copy=copy,
+        )
@@ -0,0 +1,71 @@
+from dataclasses import dataclass, field
+from typing import Any, Callable, Hashable, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+@dataclass
+class CacheStats:
+    """Hit and miss counters of a SystemCache."""
+
+    hits: int = 0
+    misses: int = 0
+    entry_hits: dict[str, int] = field(default_factory=dict)
+    entry_misses: dict[str, int] = field(default_factory=dict)
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class SystemCache:
+    """Cache of the assembled system of a truss.
+
+    Every entry is stored together with the key it was built for, usually a
+    tuple of the store versions it depends on. An entry is rebuilt only when
+    its key changes."""
+
+    def __init__(self) -> None:
+        self.stats = CacheStats()
+        self.__entries: dict[str, tuple[Hashable, Any]] = {}
+
+    def get(self, name: str, key: Hashable, build: Callable[[], T]) -> T:
+        """Returns the entry name if it was built for key, otherwise builds
+        it and caches it."""
+
+        entry = self.__entries.get(name)
+        if entry is not None and entry[0] == key:
+            self.stats.hits += 1
+            self.stats.entry_hits[name] = (
+                self.stats.entry_hits.get(name, 0) + 1
+            )
+            return entry[1]
+
+        self.stats.misses += 1
+        self.stats.entry_misses[name] = (
+            self.stats.entry_misses.get(name, 0) + 1
+        )
+        value = build()
+        self.__entries[name] = (key, value)
+        return value
+
+    def put(self, name: str, key: Hashable, value: Any) -> None:
+        """Store value as the entry name built for key."""
+
+        self.__entries[name] = (key, value)
+
+    def peek(self, name: str) -> Optional[Any]:
+        """Returns the last value built for the entry name, without
+        checking its key or counting a lookup."""
+
+        entry = self.__entries.get(name)
+        return entry[1] if entry is not None else None
+
+    def clear(self) -> None:
+        """Drop every cached entry."""
+
+        self.__entries.clear()
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.__entries
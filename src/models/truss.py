@@ -1,150 +1,833 @@
-from dataclasses import dataclass, field
+import hashlib
+from dataclasses import astuple, dataclass, field
+from typing import Iterable, Iterator, Optional, Sequence, Union
 
 import numpy as np
-from numpy.typing import NDArray
+from numpy.typing import ArrayLike, NDArray
+from scipy import sparse as sp
 
+from .assembly import SparsityPattern
 from .element import Element
+from .factorization import Factorization, SolveReport
+from .handles import ElementHandles, NodeHandles
+from .instrumentation import phase
+from .kernels import (
+    ElementStiffnessBatch,
+    block_indices,
+    consistent_mass_matrices,
+    direction_blocks,
+    element_dofs,
+    element_geometry,
+    element_masses,
+    geometric_stiffness_matrices,
+    global_stiffness_matrices,
+)
+from .load_cases import LoadCaseResults
 from .node import Dofs, NodalDisplacement, Node
-from utils.flatten import flatten
+from .partition import PartitionedSystem, StiffnessMatrix
+from .postprocessing import ElementResults, element_results
+from .reordering import (
+    BandStatistics,
+    ReorderingReport,
+    band_statistics,
+    dofs_from_node_order,
+    reverse_cuthill_mckee_order,
+)
+from .solvers import SolverBackend, get_solver
+from .store import ElementStore, NodeStore, TrussArrays
+from .system_cache import CacheStats, SystemCache
+from .updates import LowRankUpdatedFactorization
+from exceptions.trussassembler.connectivity_exception import (
+    ConnectivityException,
+)
 
 
 @dataclass
 class _ImposeBoundaryConditionsResults:
-    stiffness: NDArray[np.float64]
+    stiffness: StiffnessMatrix
     force: NDArray[np.float64]
 
 
 @dataclass
 class Truss:
-    """2D Truss"""
+    """2D Truss
+
+    When sparse is set, the global stiffness matrix is assembled in CSR
+    format and the whole analysis works on the sparse matrix, so memory
+    grows with the number of elements instead of the square of the dofs.
+
+    The assembled stiffness, the free/restrained dofs, the reduced system
+    and its factorization are cached. They are rebuilt only when the
+    geometry, the section properties or the boundary conditions change, so
+    changing the forces keeps the factorization.
+
+    solver selects the backend that factorizes the reduced stiffness, either
+    by name ("dense", "sparse", "cg", "auto") or as a SolverBackend.
+    """
+
+    elements: Sequence[Element]
+    nodes: Sequence[Node]
+    sparse: bool = False
+    solver: Union[str, SolverBackend] = "auto"
+    node_store: NodeStore = field(init=False, repr=False, compare=False)
+    element_store: ElementStore = field(init=False, repr=False, compare=False)
+    cache: SystemCache = field(init=False, repr=False, compare=False)
+
+    @property
+    def cache_stats(self) -> CacheStats:
+        """Hit and miss counters of the cached system."""
+
+        return self.cache.stats
+
+    def invalidate(self) -> None:
+        """Drop the cached system. Needed only after writing to the store
+        arrays directly instead of through the node and element handles."""
+
+        self.cache.clear()
+
+    def __assembly_key(self) -> tuple[int, int, bool]:
+        return (
+            self.node_store.geometry_version,
+            self.element_store.section_version,
+            self.sparse,
+        )
+
+    def __partition_key(self) -> tuple[int, int]:
+        return (
+            self.node_store.geometry_version,
+            self.node_store.boundary_condition_version,
+        )
+
+    def __system_key(self) -> tuple[int, int, bool, int]:
+        return self.__assembly_key() + (
+            self.node_store.boundary_condition_version,
+        )
+
+    @property
+    def solve_report(self) -> Optional[SolveReport]:
+        """Timings and iterations of the last factorization and solve, None
+        if nothing has been solved yet."""
+
+        factorization = self.cache.peek("factorization")
+        return factorization.report if factorization is not None else None
+
+    def __free_dofs(self) -> NDArray[np.int64]:
+        return self.cache.get(
+            "free_dofs",
+            self.__partition_key(),
+            self.node_store.get_free_dofs,
+        )
+
+    def __restrained_dofs(self) -> NDArray[np.int64]:
+        return self.cache.get(
+            "restrained_dofs",
+            self.__partition_key(),
+            self.node_store.get_restrained_dofs,
+        )
+
+    def __spring_dofs(self) -> tuple[NDArray[np.int64], NDArray[np.float64]]:
+        """The free dofs on elastic supports and their spring stiffness."""
+
+        def build() -> tuple[NDArray[np.int64], NDArray[np.float64]]:
+            springs = self.node_store.scatter(self.node_store.springs)
+            free_dofs = self.__free_dofs()
+            dofs = free_dofs[springs[free_dofs] != 0]
+            return dofs, springs[dofs]
+
+        return self.cache.get("spring_dofs", self.__partition_key(), build)
 
-    elements: list[Element]
-    nodes: list[Node]
-    dof_to_nodal_displacements_map: dict[Dofs, NodalDisplacement] = field(
-        init=False
-    )
+    @property
+    def dof_to_nodal_displacements_map(
+        self,
+    ) -> dict[Dofs, NodalDisplacement]:
+        """Map of the dofs of each node to its nodal displacements."""
+
+        return {node.dofs: node.nodal_displacements for node in self.nodes}
 
     def get_number_of_dofs(self) -> int:
         """Get the total degrees of freedom of the truss."""
 
-        return len(self.nodes) * Node.number_of_dofs
+        return self.node_store.number_of_dofs
 
     def get_force_vector(self) -> NDArray:
-        """Arrange the force vector. Returns a column force vector"""
+        """Arrange the force vector. Returns a column force vector
 
-        forces = flatten(
-            [[node.force.fx, node.force.fy] for node in self.nodes]
-        )
-        return np.array(forces, dtype=np.float64).reshape(
+        Its rows are in dof order, like the rows of the stiffness matrix.
+        Once reorder_dofs has run this is not the node order that
+        solve_load_cases takes, node_store.gather maps it back."""
+
+        return self.node_store.scatter(self.node_store.forces).reshape(
             self.get_number_of_dofs(), 1
         )
 
     def get_free_dofs(self) -> list[int]:
         """Get the free moving dofs of the truss."""
 
-        return flatten([node.get_free_dofs() for node in self.nodes])
+        return self.__free_dofs().tolist()
 
     def get_supported_dofs(self) -> list[int]:
-        """Get the dofs of the truss that are supported."""
+        """Get the dofs of the truss that are supported, the restrained
+        ones followed by the free dofs on elastic supports."""
 
-        return flatten([node.get_restrained_dofs() for node in self.nodes])
+        return np.concatenate(
+            (self.__restrained_dofs(), self.__spring_dofs()[0])
+        ).tolist()
 
     def __get_nodal_displacements(self) -> NDArray[np.float64]:
         """Get the nodal displacements vector of truss."""
 
-        return np.array(
-            flatten(
-                [
-                    [
-                        node.nodal_displacements.x,
-                        node.nodal_displacements.y,
-                    ]
-                    for node in self.nodes
-                ]
-            ),
-            dtype=np.float64,
+        return self.node_store.scatter(self.node_store.displacements)
+
+    def get_band_statistics(self) -> BandStatistics:
+        """Get the bandwidth and the profile of the stiffness matrix with
+        the current dof numbering."""
+
+        return band_statistics(
+            self.element_store.connectivity, self.node_store.dofs
+        )
+
+    def reorder_dofs(self, method: str = "rcm") -> ReorderingReport:
+        """Renumber the dofs to reduce the bandwidth of the stiffness
+        matrix.
+
+        method is "rcm" (reverse Cuthill-McKee over the element
+        connectivity graph) or "natural" to go back to node order. The node
+        and element data keep their order, only the dofs they map to
+        change, so every nodal result still maps to the original nodes."""
+
+        number_of_nodes = len(self.node_store)
+        if method == "rcm":
+            node_order = reverse_cuthill_mckee_order(
+                self.element_store.connectivity, number_of_nodes
+            )
+        elif method == "natural":
+            node_order = np.arange(number_of_nodes, dtype=np.int64)
+        else:
+            raise ValueError(f"Unknown reordering method {method!r}.")
+
+        before = self.get_band_statistics()
+        self.node_store.dofs[:] = dofs_from_node_order(node_order)
+        self.node_store.touch_geometry()
+        return ReorderingReport(
+            method=method,
+            before=before,
+            after=self.get_band_statistics(),
+            node_order=node_order,
+        )
+
+    def get_element_stiffness_batch(self) -> ElementStiffnessBatch:
+        """Get the global stiffness matrices of all the elements, computed
+        in a single batch, together with their dofs."""
+
+        return global_stiffness_matrices(
+            self.node_store.coordinates,
+            self.element_store.connectivity,
+            self.element_store.youngs_modulus,
+            self.element_store.area,
+            self.node_store.dofs,
         )
 
     def get_stiffness_matrix(self) -> NDArray:
         """Get the global stiffness matrix of the truss."""
 
         number_of_dofs = self.get_number_of_dofs()
-        stiffness = np.zeros(
-            (number_of_dofs, number_of_dofs), dtype=np.float64
+        with phase("assembly") as measured:
+            measured.gauge("dofs", number_of_dofs)
+            stiffness = np.zeros(
+                (number_of_dofs, number_of_dofs), dtype=np.float64
+            )
+            rows, cols, values = self.get_element_stiffness_batch().triplets()
+            np.add.at(stiffness, (rows, cols), values)
+
+        return stiffness
+
+    def get_sparse_stiffness_matrix(self) -> sp.csr_matrix:
+        """Get the global stiffness matrix of the truss in CSR format.
+
+        The element contributions are collected in triplet (COO) form and
+        the duplicate entries of the shared dofs are summed in their CSR
+        slots. The sparsity pattern is cached, so as long as the geometry
+        and the dof numbering stay the same only the numeric values are
+        recomputed."""
+
+        with phase("assembly") as measured:
+            batch = self.get_element_stiffness_batch()
+            stiffness = self.get_sparsity_pattern().assemble(
+                batch.stiffness.reshape(-1)
+            )
+            measured.gauge("dofs", stiffness.shape[0])
+            measured.gauge("nnz", stiffness.nnz)
+        return stiffness
+
+    def get_sparsity_pattern(self) -> SparsityPattern:
+        """Get the CSR structure shared by the global stiffness, mass and
+        tangent matrices. It is cached until the geometry or the dof
+        numbering change."""
+
+        return self.cache.get(
+            "sparsity_pattern",
+            self.node_store.geometry_version,
+            lambda: SparsityPattern(
+                *block_indices(
+                    element_dofs(
+                        self.element_store.connectivity, self.node_store.dofs
+                    )
+                ),
+                shape=(self.get_number_of_dofs(), self.get_number_of_dofs()),
+            ),
         )
 
-        for element in self.elements:
-            dofs = element.get_node_dofs()
-            element_global_stiffness = element.get_global_stiffness_matrix()
-            stiffness[np.ix_(dofs, dofs)] += element_global_stiffness
+    def get_mass_matrix(self, lumped: bool = True) -> StiffnessMatrix:
+        """Get the global mass matrix from the density and the area of the
+        elements, in the format selected by the sparse flag of the truss.
+
+        The lumped matrix is diagonal with half of the mass of every
+        element on each of its dofs. The consistent one shares the sparsity
+        pattern of the stiffness matrix. The matrix is cached until the
+        geometry or the sections change."""
+
+        return self.cache.get(
+            "mass",
+            self.__assembly_key() + (lumped,),
+            lambda: self.__mass(lumped),
+        )
 
+    def __mass(self, lumped: bool) -> StiffnessMatrix:
+        number_of_dofs = self.get_number_of_dofs()
+        with phase("mass") as measured:
+            measured.gauge("dofs", number_of_dofs)
+            if lumped:
+                masses = element_masses(
+                    self.node_store.coordinates,
+                    self.element_store.connectivity,
+                    self.element_store.density,
+                    self.element_store.area,
+                )
+                diagonal = np.bincount(
+                    element_dofs(
+                        self.element_store.connectivity, self.node_store.dofs
+                    ).ravel(),
+                    weights=np.repeat(masses / 2, 4),
+                    minlength=number_of_dofs,
+                )
+                return (
+                    sp.diags(diagonal, format="csr")
+                    if self.sparse
+                    else np.diag(diagonal)
+                )
+
+            batch = consistent_mass_matrices(
+                self.node_store.coordinates,
+                self.element_store.connectivity,
+                self.element_store.density,
+                self.element_store.area,
+                self.node_store.dofs,
+            )
+            if self.sparse:
+                return self.get_sparsity_pattern().assemble(
+                    batch.stiffness.reshape(-1)
+                )
+            mass = np.zeros((number_of_dofs, number_of_dofs))
+            rows, cols, values = batch.triplets()
+            np.add.at(mass, (rows, cols), values)
+            return mass
+
+    def get_geometric_stiffness_matrix(
+        self, axial_forces: Optional[ArrayLike] = None
+    ) -> StiffnessMatrix:
+        """Get the global geometric stiffness matrix for the given element
+        axial forces, by default those of the current nodal displacements,
+        in the format selected by the sparse flag of the truss."""
+
+        if axial_forces is None:
+            axial_forces = self.get_element_results().axial_forces
+        batch = geometric_stiffness_matrices(
+            self.node_store.coordinates,
+            self.element_store.connectivity,
+            axial_forces,
+            self.node_store.dofs,
+        )
+        if self.sparse:
+            return self.get_sparsity_pattern().assemble(
+                batch.stiffness.reshape(-1)
+            )
+        number_of_dofs = self.get_number_of_dofs()
+        stiffness = np.zeros((number_of_dofs, number_of_dofs))
+        rows, cols, values = batch.triplets()
+        np.add.at(stiffness, (rows, cols), values)
         return stiffness
 
+    def assemble_stiffness_matrix(self) -> StiffnessMatrix:
+        """Get the global stiffness matrix in the format selected by the
+        sparse flag of the truss. The matrix is cached and must not be
+        modified in place."""
+
+        return self.cache.get(
+            "stiffness",
+            self.__assembly_key(),
+            lambda: (
+                self.get_sparse_stiffness_matrix()
+                if self.sparse
+                else self.get_stiffness_matrix()
+            ),
+        )
+
+    def get_partitioned_system(self) -> PartitionedSystem:
+        """Get the stiffness matrix partitioned in free and restrained dofs,
+        with the stiffness of the elastic supports added to its diagonal.
+        The partition is cached until the stiffness or the boundary
+        conditions change."""
+
+        return self.cache.get(
+            "partition", self.__system_key(), self.__partition
+        )
+
+    def __partition(self) -> PartitionedSystem:
+        stiffness = self.assemble_stiffness_matrix()
+        with phase("partition") as measured:
+            partition = PartitionedSystem.from_stiffness(
+                stiffness,
+                self.__free_dofs(),
+                self.__restrained_dofs(),
+                self.node_store.scatter(self.node_store.springs),
+            )
+            measured.gauge("free_dofs", len(partition.free_dofs))
+            stiffness_ff = partition.stiffness_ff
+            if not isinstance(stiffness_ff, np.ndarray):
+                measured.gauge("nnz", stiffness_ff.nnz)
+        return partition
+
+    def __get_prescribed_displacements(self) -> NDArray[np.float64]:
+        """Get the prescribed displacements of the supported dofs."""
+
+        return self.node_store.scatter(self.node_store.prescribed)[
+            self.__restrained_dofs()
+        ]
+
     def impose_boundary_conditions(self) -> _ImposeBoundaryConditionsResults:
         """Impose boundary conditions to the stiffness matrix and the force vector"""
 
-        stiffness = self.get_stiffness_matrix()
-        force_vector = self.get_force_vector()
+        with phase("boundary_conditions"):
+            partition = self.get_partitioned_system()
+            return _ImposeBoundaryConditionsResults(
+                stiffness=partition.stiffness_ff,
+                force=partition.reduce_forces(
+                    self.get_force_vector(),
+                    self.__get_prescribed_displacements().reshape(-1, 1),
+                ),
+            )
 
-        restrained_dofs = self.get_supported_dofs()
+    def solve_for_displacements(self) -> NDArray:
+        """Return the displacement of the free moving dofs."""
 
-        for axis in range(2):
-            stiffness = np.delete(
-                stiffness,
-                [dof for dof in restrained_dofs],
-                axis=axis,
+        with phase("solve"):
+            factorization = self.factorize()
+            force = self.impose_boundary_conditions().force
+            with phase("substitution") as measured:
+                displacements = factorization.solve(force)
+                measured.gauge("iterations", factorization.report.iterations)
+            return displacements
+
+    def fingerprint(self, include_dofs: bool = False) -> str:
+        """Content hash of the model: coordinates, connectivity, youngs
+        modulus, area, boundary conditions, settlements, springs and loads.
+
+        Unlike Node.__hash__ it does not depend on the process wide node
+        ids, so the same model hashes the same in every run. The dof
+        numbering only matters to the factorization and is included on
+        request."""
+
+        digest = hashlib.sha256()
+        arrays = [
+            self.node_store.coordinates,
+            self.node_store.free,
+            self.node_store.forces,
+            self.node_store.prescribed,
+            self.node_store.springs,
+            self.element_store.connectivity,
+            self.element_store.youngs_modulus,
+            self.element_store.area,
+        ]
+        if include_dofs:
+            arrays.append(self.node_store.dofs)
+        for array in arrays:
+            array = np.ascontiguousarray(array)
+            digest.update(f"{array.dtype.str}{array.shape}".encode())
+            digest.update(array.data)
+        return digest.hexdigest()
+
+    def use_factorization(self, factorization: Factorization) -> None:
+        """Adopt a factorization of the current reduced stiffness, e.g. one
+        read from disk, instead of factorizing it again."""
+
+        self.cache.put(
+            "factorization",
+            self.__system_key() + (self.solver,),
+            factorization,
+        )
+
+    def factorize(self) -> Factorization:
+        """Factorize the reduced stiffness matrix once, so that it can be
+        reused for any number of load cases. The factorization is cached
+        until the stiffness or the boundary conditions change."""
+
+        return self.cache.get(
+            "factorization",
+            self.__system_key() + (self.solver,),
+            self.__factorize,
+        )
+
+    def __factorize(self) -> Factorization:
+        stiffness = self.impose_boundary_conditions().stiffness
+        with phase("factorization") as measured:
+            factorization = get_solver(self.solver).factorize(stiffness)
+            measured.gauge("size", factorization.size)
+        return factorization
+
+    def update_elements(
+        self,
+        indices: ArrayLike,
+        area: Optional[Union[ArrayLike, float]] = None,
+        youngs_modulus: Optional[Union[ArrayLike, float]] = None,
+        remove: bool = False,
+        max_updates: int = 20,
+        drift_tolerance: float = 1e-8,
+    ) -> Factorization:
+        """Change the area and/or the youngs modulus of a few elements, or
+        remove them (zero area), updating the cached factorization instead
+        of refactorizing.
+
+        Each changed element adds a rank-1 term to the reduced stiffness,
+        which is solved through the Sherman-Morrison-Woodbury identity. The
+        truss is refactorized once the updates exceed max_updates or when
+        the relative residual of a probe solve exceeds drift_tolerance.
+        The cached global stiffness and its partition are refreshed with
+        the stiffness change of the updated elements only, so neither the
+        following solves, which need K_fr and K_rr for the settlements and
+        the reactions, nor a refactorization re-assemble the truss.
+        Every element may appear only once in indices. Returns the
+        factorization now in use."""
+
+        indices = np.atleast_1d(np.asarray(indices, dtype=np.int64))
+        if len(np.unique(indices)) < len(indices):
+            raise ValueError("The element indices to update repeat.")
+        factorization = self.factorize()
+        stiffness = self.assemble_stiffness_matrix()
+        partition = self.get_partitioned_system()
+        if not isinstance(factorization, LowRankUpdatedFactorization):
+            factorization = LowRankUpdatedFactorization(
+                factorization, self.get_partitioned_system().stiffness_ff
             )
 
-        force_vector = np.delete(
-            force_vector,
-            [dof for dof in restrained_dofs],
-            axis=0,
+        connectivity = self.element_store.connectivity[indices]
+        geometry = element_geometry(self.node_store.coordinates, connectivity)
+        store = self.element_store
+        previous = store.youngs_modulus[indices] * store.area[indices]
+        if youngs_modulus is not None:
+            store.youngs_modulus[indices] = youngs_modulus
+        if area is not None:
+            store.area[indices] = area
+        if remove:
+            store.area[indices] = 0
+        store.touch_sections()
+
+        changes = (
+            store.youngs_modulus[indices] * store.area[indices] - previous
+        ) / geometry.lengths
+        delta = ElementStiffnessBatch(
+            stiffness=changes[:, np.newaxis, np.newaxis]
+            * direction_blocks(geometry.cos, geometry.sin),
+            dofs=element_dofs(connectivity, self.node_store.dofs),
         )
+        rows, cols, values = delta.triplets()
+        if sp.issparse(stiffness):
+            stiffness = sp.csr_matrix(
+                stiffness
+                + sp.csr_matrix((values, (rows, cols)), shape=stiffness.shape)
+            )
+        else:
+            stiffness = stiffness.copy()
+            np.add.at(stiffness, (rows, cols), values)
+        self.cache.put("stiffness", self.__assembly_key(), stiffness)
+        self.cache.put(
+            "partition",
+            self.__system_key(),
+            partition.updated(rows, cols, values),
+        )
+
+        if factorization.rank + len(indices) > max_updates:
+            return self.factorize()
 
-        return _ImposeBoundaryConditionsResults(
-            stiffness=stiffness,
-            force=force_vector,
+        free_dofs = self.__free_dofs()
+        dofs = element_dofs(connectivity, self.node_store.dofs)
+        positions = np.minimum(
+            np.searchsorted(free_dofs, dofs), len(free_dofs) - 1
+        )
+        is_free = free_dofs[positions] == dofs
+        direction = np.stack(
+            (-geometry.cos, -geometry.sin, geometry.cos, geometry.sin), axis=1
         )
+        vectors = np.zeros((len(free_dofs), len(indices)), dtype=np.float64)
+        columns = np.broadcast_to(
+            np.arange(len(indices))[:, np.newaxis], dofs.shape
+        )
+        np.add.at(
+            vectors,
+            (positions[is_free], columns[is_free]),
+            direction[is_free],
+        )
+        factorization.add_terms(vectors, changes)
 
-    def solve_for_displacements(self) -> NDArray:
-        """Return the displacement of the free moving dofs."""
-        imposed_system = self.impose_boundary_conditions()
-        return np.linalg.solve(imposed_system.stiffness, imposed_system.force)
+        probe = np.ones(len(free_dofs), dtype=np.float64)
+        drift = factorization.relative_residual(
+            probe, factorization.solve(probe)
+        )
+        factorization.report.residual_norm = drift
+        if drift > drift_tolerance:
+            return self.factorize()
+        self.cache.put(
+            "factorization",
+            self.__system_key() + (self.solver,),
+            factorization,
+        )
+        return factorization
+
+    def solve_load_cases(
+        self,
+        forces: NDArray[np.float64],
+        factorization: Optional[Factorization] = None,
+    ) -> LoadCaseResults:
+        """Solve a block of load cases against a single factorization.
+
+        forces is an (n_dofs,) vector or an (n_dofs, n_cases) block with one
+        column per load case, where rows 2i and 2i + 1 hold the x and y
+        forces of node i, as in node_store.forces.ravel(). This is not the
+        dof order of get_force_vector once the dofs are reordered. The
+        displacements are returned in the same node order whatever the dof
+        numbering is. Each extra load case only costs a pair of triangular
+        solves."""
+
+        if factorization is None:
+            factorization = self.factorize()
+        with phase("load_cases") as measured:
+            measured.gauge(
+                "cases", np.size(forces) // self.get_number_of_dofs()
+            )
+            return self.__solve_load_cases(forces, factorization)
+
+    def __solve_load_cases(
+        self, forces: NDArray[np.float64], factorization: Factorization
+    ) -> LoadCaseResults:
+        node_dofs = self.node_store.dofs.ravel()
+        nodal_forces = np.asarray(forces, dtype=np.float64).reshape(
+            self.get_number_of_dofs(), -1
+        )
+        forces = np.empty_like(nodal_forces)
+        forces[node_dofs] = nodal_forces
+        partition = self.get_partitioned_system()
+        prescribed = self.__get_prescribed_displacements()[:, np.newaxis]
+        free_displacements = factorization.solve(
+            partition.reduce_forces(forces, prescribed)
+        )
+        displacements = np.zeros_like(forces)
+        displacements[partition.free_dofs] = free_displacements
+        displacements[partition.restrained_dofs] = prescribed
+        return LoadCaseResults(
+            displacements=displacements[node_dofs],
+            stresses=self.get_element_results(
+                displacements[node_dofs]
+            ).stresses,
+            reactions=np.concatenate(
+                (
+                    partition.reactions(
+                        free_displacements,
+                        np.broadcast_to(
+                            prescribed, (len(prescribed), forces.shape[1])
+                        ),
+                    ),
+                    self.__spring_reactions(displacements),
+                )
+            ),
+        )
+
+    def iter_load_cases(
+        self, forces: Iterable[NDArray[np.float64]]
+    ) -> Iterator[LoadCaseResults]:
+        """Stream load cases through a single factorization, yielding the
+        results of each force vector as soon as it is solved."""
+
+        factorization = self.factorize()
+        for force in forces:
+            yield self.solve_load_cases(force, factorization)
 
     def set_nodal_displacements(self) -> None:
         """Set the computed nodal displacements to each node."""
 
-        displacements = self.solve_for_displacements().flatten()
-        for free_dof, displacement in zip(self.get_free_dofs(), displacements):
-            if free_dof % 2 == 0:
-                # dof in x direction
-                node_idx = int(free_dof / 2)
-                node = self.nodes[node_idx]
-                node.nodal_displacements.x = displacement
-            else:
-                # dof in y direction
-                node_idx = int((free_dof - 1) / 2)
-                node = self.nodes[node_idx]
-                node.nodal_displacements.y = displacement
+        displacements = np.zeros(self.get_number_of_dofs(), dtype=np.float64)
+        displacements[
+            self.__free_dofs()
+        ] = self.solve_for_displacements().ravel()
+        displacements[
+            self.__restrained_dofs()
+        ] = self.__get_prescribed_displacements()
+        self.node_store.displacements[:] = self.node_store.gather(
+            displacements
+        )
+
+    def get_element_results(
+        self,
+        displacements: Optional[NDArray[np.float64]] = None,
+        allowable_stress: Optional[Union[NDArray[np.float64], float]] = None,
+    ) -> ElementResults:
+        """Get the strain, the stress, the axial force and the utilization
+        of every element.
+
+        displacements defaults to the nodal displacements of the truss. It
+        may also be the node ordered displacements block of
+        solve_load_cases, to get the results of every load case at once."""
+
+        if displacements is None:
+            displacements = self.node_store.displacements.ravel()
+        return element_results(
+            self.node_store.coordinates,
+            self.element_store.connectivity,
+            self.element_store.youngs_modulus,
+            self.element_store.area,
+            displacements,
+            allowable_stress=allowable_stress,
+        )
 
     def set_element_stresses(self) -> None:
         """Set elements' stress"""
 
-        for element in self.elements:
-            element.set_stress()
+        with phase("stresses") as measured:
+            measured.gauge("elements", len(self.element_store))
+            self.element_store.stresses[
+                :
+            ] = self.get_element_results().stresses
 
     def get_reactions(self) -> NDArray[np.float64]:
-        """Get the reaction forces for each supported node."""
+        """Get the reaction forces of the supported dofs, in the order of
+        get_supported_dofs. The force of a spring on a free dof is -k u."""
+
+        partition = self.get_partitioned_system()
+        with phase("reactions"):
+            nodal_displacements = self.__get_nodal_displacements()
+            return np.concatenate(
+                (
+                    partition.reactions(
+                        nodal_displacements[partition.free_dofs],
+                        nodal_displacements[partition.restrained_dofs],
+                    ),
+                    self.__spring_reactions(nodal_displacements),
+                )
+            )
 
-        stiffness_at_supported_dofs = self.get_stiffness_matrix()[
-            np.ix_(self.get_supported_dofs())
-        ]
-        nodal_displacements = self.__get_nodal_displacements().T
-        return stiffness_at_supported_dofs @ nodal_displacements
+    def __spring_reactions(
+        self, displacements: NDArray[np.float64]
+    ) -> NDArray[np.float64]:
+        """Forces of the springs on the free dofs for dof ordered
+        displacements, a vector or one column per load case."""
+
+        dofs, springs = self.__spring_dofs()
+        return -springs.reshape((-1,) + (1,) * (displacements.ndim - 1)) * (
+            displacements[dofs]
+        )
+
+    def set_reactions(self) -> None:
+        """Set the reaction forces of the supported nodes."""
+
+        reactions = np.zeros(self.get_number_of_dofs(), dtype=np.float64)
+        reactions[self.get_supported_dofs()] = self.get_reactions()
+        self.node_store.reactions[:] = self.node_store.gather(reactions)
+
+    @classmethod
+    def from_arrays(
+        cls,
+        arrays: TrussArrays,
+        sparse: bool = False,
+        solver: Union[str, SolverBackend] = "auto",
+        copy: bool = True,
+    ) -> "Truss":
+        """Build a truss straight from its arrays. The Node and Element
+        handles are only created when they are accessed. Without copy the
+        stores share the arrays, e.g. memory maps, where possible."""
+
+        node_store, element_store = arrays.to_stores(copy=copy)
+        nodes = NodeHandles(node_store)
+        return cls(
+            elements=ElementHandles(element_store, nodes),
+            nodes=nodes,
+            sparse=sparse,
+            solver=solver,
+        )
+
+    def to_arrays(self) -> TrussArrays:
+        """Get a copy of the arrays that describe the truss."""
+
+        return TrussArrays.from_stores(self.node_store, self.element_store)
 
     def __post_init__(self) -> None:
-        self.dof_to_nodal_displacements_map = {}
-        for node in self.nodes:
-            self.dof_to_nodal_displacements_map[
-                node.dofs
-            ] = node.nodal_displacements
+        self.cache = SystemCache()
+        if isinstance(self.nodes, NodeHandles) and isinstance(
+            self.elements, ElementHandles
+        ):
+            self.node_store = self.nodes.store
+            self.element_store = self.elements.store
+            if len(self.element_store) and (
+                self.element_store.connectivity.min() < 0
+                or self.element_store.connectivity.max()
+                >= len(self.node_store)
+            ):
+                raise ConnectivityException(
+                    "The connectivity references nodes that are not part of"
+                    " the truss."
+                )
+            return
+
+        self.node_store = NodeStore(
+            coordinates=[[node.x, node.y] for node in self.nodes],
+            free=[
+                [
+                    node.boundary_condition.is_free_in_x,
+                    node.boundary_condition.is_free_in_y,
+                ]
+                for node in self.nodes
+            ],
+            forces=[[node.force.fx, node.force.fy] for node in self.nodes],
+            prescribed=[astuple(node.settlement) for node in self.nodes],
+            springs=[astuple(node.spring) for node in self.nodes],
+        )
+        for index, node in enumerate(self.nodes):
+            self.node_store.displacements[index] = astuple(
+                node.nodal_displacements
+            )
+            self.node_store.reactions[index] = astuple(node.reaction)
+            node.bind(self.node_store, index)
+
+        node_indices = {id(node): idx for idx, node in enumerate(self.nodes)}
+        connectivity: list[list[int]] = []
+        for element in self.elements:
+            try:
+                connectivity.append(
+                    [
+                        node_indices[id(element.node1)],
+                        node_indices[id(element.node2)],
+                    ]
+                )
+            except KeyError:
+                raise ConnectivityException(
+                    f"{element} references a node that is not part of the"
+                    " truss."
+                )
+        self.element_store = ElementStore(
+            connectivity=connectivity,
+            youngs_modulus=[
+                element.youngs_modulus for element in self.elements
+            ],
+            area=[element.area for element in self.elements],
+            density=[element.density for element in self.elements],
+        )
+        for index, element in enumerate(self.elements):
+            self.element_store.stresses[index] = element.get_stress()
+            element.bind(self.element_store, index)
@@ -0,0 +1,92 @@
+import numpy as np
+from numpy.typing import NDArray
+
+from .factorization import Factorization
+from .partition import StiffnessMatrix
+
+
+class LowRankUpdatedFactorization(Factorization):
+    """Factorization of K + U C U^T reusing the factorization of K.
+
+    Every changed member contributes a rank-1 term (the change of its EA/L
+    times the outer product of its direction vector), so its solves go
+    through the Sherman-Morrison-Woodbury identity
+
+        x = y - Z (C^-1 + U^T Z)^-1 U^T y,  y = K^-1 b,  Z = K^-1 U
+
+    which costs a solve with the base factorization plus a small dense solve
+    of the size of the rank."""
+
+    backend = "woodbury"
+
+    def __init__(
+        self, base: Factorization, base_matrix: StiffnessMatrix
+    ) -> None:
+        super().__init__(base.size)
+        self.base = base
+        self.base_matrix = base_matrix
+        self.report.factorization_time = base.report.factorization_time
+        self.vectors = np.zeros((self.size, 0), dtype=np.float64)
+        self.coefficients = np.zeros(0, dtype=np.float64)
+        self.__solved_vectors = np.zeros((self.size, 0), dtype=np.float64)
+        self.__capacitance = np.zeros((0, 0), dtype=np.float64)
+
+    @property
+    def rank(self) -> int:
+        return len(self.coefficients)
+
+    def add_terms(
+        self,
+        vectors: NDArray[np.float64],
+        coefficients: NDArray[np.float64],
+    ) -> None:
+        """Add the terms vectors[:, i] * coefficients[i] * vectors[:, i]^T.
+        Terms with a zero coefficient are skipped."""
+
+        keep = coefficients != 0
+        vectors = vectors[:, keep]
+        coefficients = coefficients[keep]
+        if not len(coefficients):
+            return
+
+        self.vectors = np.hstack((self.vectors, vectors))
+        self.coefficients = np.concatenate((self.coefficients, coefficients))
+        self.__solved_vectors = np.hstack(
+            (
+                self.__solved_vectors,
+                self.base.solve(vectors).reshape(self.size, -1),
+            )
+        )
+        self.__capacitance = np.diag(
+            1 / self.coefficients
+        ) + self.vectors.T @ (self.__solved_vectors)
+
+    def matvec(self, vector: NDArray[np.float64]) -> NDArray[np.float64]:
+        """Multiply the updated matrix with a vector or a block."""
+
+        return np.asarray(self.base_matrix @ vector) + self.vectors @ (
+            self.coefficients.reshape((-1,) + (1,) * (vector.ndim - 1))
+            * (self.vectors.T @ vector)
+        )
+
+    def relative_residual(
+        self,
+        rhs: NDArray[np.float64],
+        solution: NDArray[np.float64],
+    ) -> float:
+        """Returns ||b - (K + U C U^T) x|| / ||b||."""
+
+        rhs_norm = np.linalg.norm(rhs)
+        if rhs_norm == 0:
+            return 0.0
+        return float(np.linalg.norm(rhs - self.matvec(solution)) / rhs_norm)
+
+    def _solve(self, rhs: NDArray[np.float64]) -> NDArray[np.float64]:
+        solution = self.base.solve(rhs)
+        self.report.iterations = 1
+        if not self.rank:
+            return solution
+        correction = np.linalg.solve(
+            self.__capacitance, self.vectors.T @ solution
+        )
+        return solution - self.__solved_vectors @ correction
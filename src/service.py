@@ -0,0 +1,368 @@
+"""Local truss analysis service.
+
+    python service.py --socket /tmp/truss.sock
+    python service.py --port 8765
+
+Requests and responses are JSON objects, one per line, over a Unix socket
+or a local TCP port; no network access beyond the given address is needed.
+A request holds an "op" and, optionally, an "id" that is echoed in its
+response. Requests on a connection are served concurrently, so responses
+may arrive out of order.
+
+    {"op": "load", "path": "model.npz"}
+        -> {"model": "<fingerprint>", "number_of_dofs": ...}
+    {"op": "solve", "model": "<fingerprint>", "forces": [[...], ...]}
+        -> {"displacements": [[...]], "stresses": [[...]],
+            "reactions": [[...]]}
+    {"op": "metrics"}
+        -> latency histograms, queue depth and batch counters
+
+forces holds one node ordered force vector (rows 2i and 2i + 1 are the x
+and y forces of node i) or a list of them, and the results hold one row per
+load case. Loaded models and their factorizations stay warm in memory up
+to --models, least recently used first out. Solve requests that arrive
+together for the same model are merged into a single multi right hand side
+solve, which runs in a thread pool off the event loop."""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Optional
+
+import numpy as np
+from numpy.typing import NDArray
+
+from models.io import load_model
+from models.load_cases import LoadCaseResults
+from models.truss import Truss
+
+# Upper bounds of the latency histogram buckets in seconds, the last bucket
+# collects everything slower.
+LATENCY_BUCKETS = (
+    0.0005,
+    0.001,
+    0.002,
+    0.005,
+    0.01,
+    0.02,
+    0.05,
+    0.1,
+    0.2,
+    0.5,
+    1.0,
+    2.0,
+    5.0,
+)
+
+
+@dataclass
+class LatencyHistogram:
+    """Latency histogram with fixed bucket bounds."""
+
+    bounds: tuple[float, ...] = LATENCY_BUCKETS
+    counts: list[int] = field(init=False)
+    count: int = 0
+    total: float = 0.0
+
+    def __post_init__(self) -> None:
+        self.counts = [0] * (len(self.bounds) + 1)
+
+    def observe(self, seconds: float) -> None:
+        self.counts[int(np.searchsorted(self.bounds, seconds))] += 1
+        self.count += 1
+        self.total += seconds
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket that holds the q-quantile, inf if it
+        falls in the overflow bucket."""
+
+        if not self.count:
+            return 0.0
+        bucket = int(
+            np.searchsorted(np.cumsum(self.counts), q * self.count, "left")
+        )
+        return self.bounds[bucket] if bucket < len(self.bounds) else np.inf
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "bounds": list(self.bounds),
+            "counts": self.counts,
+            "count": self.count,
+            "mean": self.total / self.count if self.count else 0.0,
+            "p50": self.quantile(0.5),
+            "p99": self.quantile(0.99),
+        }
+
+
+@dataclass
+class _PendingSolve:
+    forces: NDArray[np.float64]
+    future: "asyncio.Future[LoadCaseResults]"
+
+
+@dataclass
+class _WarmModel:
+    truss: Truss
+    pending: list[_PendingSolve] = field(default_factory=list)
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+
+class AnalysisService:
+    """Serves analysis requests from warm models, merging the concurrent
+    load cases of a model into one solve.
+
+    A solve request first waits batch_window seconds for more requests on
+    the same model, then every pending load case is stacked into a single
+    force block. Only one block per model is solved at a time, requests
+    arriving meanwhile form the next block."""
+
+    def __init__(
+        self,
+        max_models: int = 16,
+        workers: int = 4,
+        batch_window: float = 0.002,
+        solver: str = "auto",
+    ) -> None:
+        self.max_models = max_models
+        self.batch_window = batch_window
+        self.solver = solver
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+        self.models: OrderedDict[str, _WarmModel] = OrderedDict()
+        self.latency: dict[str, LatencyHistogram] = {}
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+        self.batches = 0
+        self.batched_cases = 0
+        # The event loop only keeps weak references to its tasks.
+        self.__flushes: set[asyncio.Task] = set()
+
+    async def handle(self, request: dict[str, Any]) -> dict[str, Any]:
+        """Serve a single request, errors are returned as {"error": ...}."""
+
+        start = time.perf_counter()
+        op = request.get("op")
+        try:
+            if op == "load":
+                response = await self.load(request["path"])
+            elif op == "solve":
+                response = await self.solve(
+                    request["model"], request["forces"]
+                )
+            elif op == "metrics":
+                response = self.metrics()
+            else:
+                raise ValueError(f"Unknown op {op!r}.")
+        except Exception as error:
+            response = {"error": f"{type(error).__name__}: {error}"}
+        self.latency.setdefault(str(op), LatencyHistogram()).observe(
+            time.perf_counter() - start
+        )
+        if "id" in request:
+            response["id"] = request["id"]
+        return response
+
+    async def load(self, path: str) -> dict[str, Any]:
+        """Load a model file and factorize it in the thread pool."""
+
+        loop = asyncio.get_running_loop()
+        truss = await loop.run_in_executor(
+            self.executor, self.__load_and_factorize, Path(path)
+        )
+        model = truss.fingerprint()
+        if model not in self.models:
+            self.models[model] = _WarmModel(truss)
+        self.models.move_to_end(model)
+        while len(self.models) > self.max_models:
+            self.models.popitem(last=False)
+        return {
+            "model": model,
+            "number_of_dofs": truss.get_number_of_dofs(),
+            "number_of_elements": len(truss.element_store),
+        }
+
+    def __load_and_factorize(self, path: Path) -> Truss:
+        truss = load_model(path, sparse=True, solver=self.solver)
+        truss.factorize()
+        return truss
+
+    async def solve(self, model: str, forces: Any) -> dict[str, Any]:
+        """Queue the load cases for the next merged solve of the model."""
+
+        warm = self.models.get(model)
+        if warm is None:
+            raise KeyError(f"Model {model} is not loaded.")
+        self.models.move_to_end(model)
+        block = np.atleast_2d(np.asarray(forces, dtype=np.float64)).T
+        if block.shape[0] != warm.truss.get_number_of_dofs():
+            raise ValueError(
+                f"Expected {warm.truss.get_number_of_dofs()} forces per load"
+                f" case, got {block.shape[0]}."
+            )
+
+        pending = _PendingSolve(
+            block, asyncio.get_running_loop().create_future()
+        )
+        warm.pending.append(pending)
+        self.queue_depth += block.shape[1]
+        self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+        if len(warm.pending) == 1:
+            flush = asyncio.create_task(self.__flush(warm))
+            self.__flushes.add(flush)
+            flush.add_done_callback(self.__flushes.discard)
+        results = await pending.future
+        return {
+            "displacements": results.displacements.T.tolist(),
+            "stresses": results.stresses.T.tolist(),
+            "reactions": results.reactions.T.tolist(),
+        }
+
+    async def __flush(self, warm: _WarmModel) -> None:
+        await asyncio.sleep(self.batch_window)
+        async with warm.lock:
+            batch, warm.pending = warm.pending, []
+            if not batch:
+                return
+            forces = np.hstack([pending.forces for pending in batch])
+            self.queue_depth -= forces.shape[1]
+            self.batches += 1
+            self.batched_cases += forces.shape[1]
+            loop = asyncio.get_running_loop()
+            try:
+                results = await loop.run_in_executor(
+                    self.executor, warm.truss.solve_load_cases, forces
+                )
+            except Exception as error:
+                for pending in batch:
+                    pending.future.set_exception(error)
+                return
+
+        start = 0
+        for pending in batch:
+            stop = start + pending.forces.shape[1]
+            pending.future.set_result(
+                LoadCaseResults(
+                    displacements=results.displacements[:, start:stop],
+                    stresses=results.stresses[:, start:stop],
+                    reactions=results.reactions[:, start:stop],
+                )
+            )
+            start = stop
+
+    def metrics(self) -> dict[str, Any]:
+        return {
+            "latency": {
+                op: histogram.as_dict()
+                for op, histogram in self.latency.items()
+            },
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "batches": self.batches,
+            "batched_cases": self.batched_cases,
+            "models": list(self.models),
+        }
+
+    async def serve_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Serve the JSON lines of a connection until it is closed."""
+
+        lock = asyncio.Lock()
+
+        async def respond(line: bytes) -> None:
+            try:
+                request = json.loads(line)
+            except json.JSONDecodeError as error:
+                response: dict[str, Any] = {"error": f"Invalid JSON: {error}"}
+            else:
+                response = await self.handle(request)
+            async with lock:
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+
+        tasks = []
+        try:
+            while line := await reader.readline():
+                if line.strip():
+                    tasks.append(asyncio.create_task(respond(line)))
+            await asyncio.gather(*tasks)
+        finally:
+            writer.close()
+
+    async def start(
+        self,
+        socket: Optional[str] = None,
+        host: str = "127.0.0.1",
+        port: int = 8765,
+    ) -> asyncio.AbstractServer:
+        """Start listening on the Unix socket, or else on host and port."""
+
+        if socket is not None:
+            return await asyncio.start_unix_server(
+                self.serve_connection, path=socket, limit=1 << 26
+            )
+        return await asyncio.start_server(
+            self.serve_connection, host=host, port=port, limit=1 << 26
+        )
+
+    def close(self) -> None:
+        self.executor.shutdown(wait=False)
+
+
+def parse_arguments(argv: Optional[list[str]]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Serve truss analyses over a local socket."
+    )
+    parser.add_argument("--socket", help="path of a Unix socket to serve on")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument(
+        "--models", type=int, default=16, help="number of warm models"
+    )
+    parser.add_argument("-w", "--workers", type=int, default=4)
+    parser.add_argument(
+        "--batch-window",
+        type=float,
+        default=0.002,
+        help="seconds to wait for load cases to merge",
+    )
+    parser.add_argument(
+        "--solver",
+        default="auto",
+        choices=["auto", "dense", "sparse", "banded", "cg"],
+    )
+    return parser.parse_args(argv)
+
+
+async def serve(arguments: argparse.Namespace) -> None:
+    service = AnalysisService(
+        max_models=arguments.models,
+        workers=arguments.workers,
+        batch_window=arguments.batch_window,
+        solver=arguments.solver,
+    )
+    server = await service.start(
+        arguments.socket, arguments.host, arguments.port
+    )
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    try:
+        asyncio.run(serve(parse_arguments(argv)))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
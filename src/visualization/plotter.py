@@ -1,17 +1,19 @@
 from dataclasses import dataclass
-from typing import Union
+from pathlib import Path
+from typing import Optional, Union
 
 import matplotlib
 import matplotlib.lines as mlines
-import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib.collections import LineCollection
+from matplotlib.colors import TwoSlopeNorm
 from models.node import Node
 from models.truss import Truss
+from numpy.typing import NDArray
 
 from .annotate_helper import AnnotateHelper
 from .spacing import Spacing
 
-matplotlib.use("TkAgg")
-
 
 @dataclass
 class MinMax:
@@ -30,7 +32,16 @@ class Plotter:
             "color": "r",
             "lw": 1.5,
         },
+        backend: Optional[str] = None,
     ) -> None:
+        # pyplot, and so the backend, is only loaded when a plotter is
+        # created. Without a backend matplotlib picks an interactive one
+        # when a display is available and Agg otherwise.
+        if backend is not None:
+            matplotlib.use(backend)
+        import matplotlib.pyplot as plt
+
+        self.plt = plt
         self.truss = truss
         self.arrowprops = arrowprops
         self.fig, self.ax = plt.subplots()
@@ -94,61 +105,82 @@ class Plotter:
         color = "red"
         linestyle = "None"
 
-        for node in self.truss.nodes:
-            self.plot_nodal_forces(node)
-            self.ax.plot(node.x, node.y, color=color, marker=marker)
+        forces = self.truss.node_store.forces
+        for index in np.flatnonzero((forces != 0).any(axis=1)):
+            self.plot_nodal_forces(self.truss.nodes[int(index)])
+        coordinates = self.truss.node_store.coordinates
+        self.ax.plot(
+            coordinates[:, 0],
+            coordinates[:, 1],
+            color=color,
+            marker=marker,
+            linestyle=linestyle,
+        )
         node_legend = Plotter.__line2d_for_legend(
             label="Nodes", marker=marker, color=color, linestyle=linestyle
         )
         self.legend_handlers.append(node_legend)
 
-    def plot_undeformed_elements(self) -> None:
+    def __add_elements(
+        self,
+        coordinates: NDArray[np.float64],
+        color_by_stress: bool,
+        **kwargs,
+    ) -> LineCollection:
+        """
+        Adds all the elements as a single LineCollection, colored by their
+        stress if color_by_stress.
+        """
+        segments = coordinates[self.truss.element_store.connectivity]
+        collection = LineCollection(list(segments), **kwargs)
+        if color_by_stress:
+            stresses = self.truss.element_store.stresses
+            limit = float(np.abs(stresses).max(initial=0.0)) or 1.0
+            collection.set_array(stresses)
+            collection.set_cmap("coolwarm")
+            collection.set_norm(TwoSlopeNorm(0.0, -limit, limit))
+            self.fig.colorbar(collection, ax=self.ax, label="Stress")
+        self.ax.add_collection(collection)
+        if len(segments):
+            for key, axis in (("x", 0), ("y", 1)):
+                self.__set_min_max(key, float(segments[..., axis].min()))
+                self.__set_min_max(key, float(segments[..., axis].max()))
+        self.ax.autoscale_view()
+        return collection
+
+    def plot_undeformed_elements(self, color_by_stress: bool = False) -> None:
         """
         Plot the undeformed elements of the truss.
         """
         color = "black"
         linestyle = "--"
 
-        for element in self.truss.elements:
-            self.ax.plot(
-                [element.node1.x, element.node2.x],
-                [element.node1.y, element.node2.y],
-                color=color,
-                linestyle=linestyle,
-            )
+        self.__add_elements(
+            self.truss.node_store.coordinates,
+            color_by_stress,
+            colors=color,
+            linestyles=linestyle,
+        )
         undeformed_legend = Plotter.__line2d_for_legend(
             color=color, linestyle=linestyle, label="Undeformed elements"
         )
         self.legend_handlers.append(undeformed_legend)
 
-    def plot_deformed_elements(self) -> None:
+    def plot_deformed_elements(self, color_by_stress: bool = False) -> None:
         """
-        Plot the deformed elements of the truss.
+        Plot the deformed elements of the truss, with the displacements
+        magnified to be visible.
         """
 
         color = "blue"
         linestyle = "-"
-        for element in self.truss.elements:
-            self.ax.plot(
-                [
-                    element.node1.x
-                    + element.node1.nodal_displacements.x
-                    * self.space_map[150],
-                    element.node2.x
-                    + element.node2.nodal_displacements.x
-                    * self.space_map[150],
-                ],
-                [
-                    element.node1.y
-                    + element.node1.nodal_displacements.y
-                    * self.space_map[150],
-                    element.node2.y
-                    + element.node2.nodal_displacements.y
-                    * self.space_map[150],
-                ],
-                color=color,
-                linestyle=linestyle,
-            )
+        self.__add_elements(
+            self.truss.node_store.coordinates
+            + self.truss.node_store.displacements * self.space_map[150],
+            color_by_stress,
+            colors=color,
+            linestyles=linestyle,
+        )
         deformed_legend = Plotter.__line2d_for_legend(
             color=color, linestyle=linestyle, label="Deformed elements"
         )
@@ -171,11 +203,32 @@ class Plotter:
         if self.minmaxes["y"].min != 0 or self.minmaxes["y"].max != 0:
             self.ax.set_ylim(self.minmaxes["y"].min, self.minmaxes["y"].max)
 
-    def plot_truss(self):
+    def save(
+        self, path: Union[str, Path], dpi: Optional[float] = None
+    ) -> None:
+        """
+        Saves the figure, in the format given by the suffix of the path,
+        e.g. .png, .svg or .pdf, and closes it.
+        """
+        self.fig.savefig(path, dpi=dpi)
+        self.plt.close(self.fig)
+
+    def plot_truss(
+        self,
+        path: Optional[Union[str, Path]] = None,
+        color_by_stress: bool = False,
+    ) -> None:
+        """
+        Plots the whole truss and saves it to path, or shows it when no
+        path is given.
+        """
         self.plot_nodes()
         self.plot_undeformed_elements()
-        self.plot_deformed_elements()
+        self.plot_deformed_elements(color_by_stress)
         self.set_axis_limits()
         self.plot_legend()
 
-        plt.show()
+        if path is not None:
+            self.save(path)
+        else:
+            self.plt.show()
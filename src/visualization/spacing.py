@@ -1,5 +1,6 @@
 from dataclasses import dataclass, field
 
+from models.kernels import element_geometry
 from models.truss import Truss
 
 
@@ -10,24 +11,21 @@ class Spacing:
 
     def __get_longest_elements_length(self) -> float:
         """
-        Returns the length of the longest element of the truss.
+        Returns the length of the longest element of the truss, computed
+        once for all the elements from the store arrays.
         """
-        element_lengths = [
-            float(element.get_length()) for element in self.__truss.elements
-        ]
-        return max(element_lengths)
-
-    def __percentage_to_longest(self, percentage: float) -> float:
-        """
-        Returns the absolute units of the longest element's length.
-        """
-        return percentage * self.__get_longest_elements_length()
+        lengths = element_geometry(
+            self.__truss.node_store.coordinates,
+            self.__truss.element_store.connectivity,
+        ).lengths
+        return float(lengths.max(initial=0.0))
 
     def __post_init__(self) -> None:
         """
         Initializes the spacing map.
         """
+        longest = self.__get_longest_elements_length()
         self.spacing_map = {
-            percentage: self.__percentage_to_longest(percentage) / 100
+            percentage: percentage * longest / 100
             for percentage in range(0, 210, 10)
         }
@@ -0,0 +1,49 @@
+from typing import Callable, Optional
+
+import numpy as np
+import pytest
+from src.models.boundary_conditions import FullyRestricted, RestrictedInY
+from src.models.element import Element
+from src.models.node import NodalForce, Node
+from src.models.truss import Truss
+
+
+def build_girder(
+    bays: int,
+    load: float = -1e3,
+    braced: bool = False,
+    seed: Optional[int] = None,
+    **kwargs,
+) -> Truss:
+    """Simply supported girder with a bottom and a top chord, verticals and
+    diagonals, loaded at every bottom node.
+
+    A braced girder has both diagonals in every bay, so removing one of
+    them keeps it stable. With a seed the nodes are listed in a random
+    order, which gives the natural dof numbering a large bandwidth."""
+
+    bottom = [Node(i, 0, force=NodalForce(0, load)) for i in range(bays + 1)]
+    top = [Node(i, 1) for i in range(bays + 1)]
+    bottom[0].boundary_condition = FullyRestricted()
+    bottom[-1].boundary_condition = RestrictedInY()
+    elements = [
+        Element(a, b, 2e11, 1e-3)
+        for chord in (bottom, top)
+        for a, b in zip(chord, chord[1:])
+    ]
+    elements += [Element(b, t, 2e11, 1e-3) for b, t in zip(bottom, top)]
+    elements += [Element(b, t, 2e11, 1e-3) for b, t in zip(bottom, top[1:])]
+    if braced:
+        elements += [
+            Element(t, b, 2e11, 1e-3) for t, b in zip(top, bottom[1:])
+        ]
+    nodes = bottom + top
+    if seed is not None:
+        order = np.random.default_rng(seed).permutation(len(nodes))
+        nodes = [nodes[i] for i in order]
+    return Truss(elements, nodes, **kwargs)
+
+
+@pytest.fixture
+def make_girder() -> Callable[..., Truss]:
+    return build_girder
@@ -0,0 +1,52 @@
+import sys
+
+import numpy as np
+from src.batch import find_models, main
+from src.models.io import load_model, save_model
+from test.test_truss import build_three_bar_truss
+
+
+def test_model_file_round_trip(tmp_path):
+    truss = build_three_bar_truss()
+    save_model(truss, tmp_path / "three_bar.npz")
+    loaded = load_model(tmp_path / "three_bar.npz")
+    assert np.allclose(
+        loaded.solve_for_displacements(), truss.solve_for_displacements()
+    )
+
+
+def test_batch_writes_results_without_matplotlib(tmp_path, capsys):
+    truss = build_three_bar_truss()
+    (tmp_path / "models").mkdir()
+    for name in ("a", "b"):
+        save_model(truss, tmp_path / "models" / f"{name}.npz")
+    assert len(find_models([str(tmp_path / "models")])) == 2
+    assert find_models([str(tmp_path / "models" / "a*")]) == [
+        tmp_path / "models" / "a.npz"
+    ]
+
+    output = tmp_path / "results"
+    assert main([str(tmp_path / "models"), "-o", str(output), "-w", "1"]) == 0
+
+    truss.set_nodal_displacements()
+    results = np.load(output / "a.results.npz")
+    assert np.allclose(
+        results["displacements"], truss.node_store.displacements
+    )
+    assert "2 models in" in capsys.readouterr().out
+    assert "matplotlib.pyplot" not in sys.modules
+
+
+def test_batch_reports_failed_models_and_keeps_going(tmp_path, capsys):
+    (tmp_path / "models").mkdir()
+    save_model(build_three_bar_truss(), tmp_path / "models" / "good.npz")
+    (tmp_path / "models" / "corrupt.npz").write_bytes(b"not a model")
+
+    output = tmp_path / "results"
+    assert main([str(tmp_path / "models"), "-o", str(output), "-w", "1"]) == 1
+
+    captured = capsys.readouterr()
+    assert "good.npz: 6 dofs" in captured.out
+    assert "1 models in" in captured.out
+    assert "corrupt.npz: failed" in captured.err
+    assert (output / "good.results.npz").exists()
@@ -0,0 +1,45 @@
+import json
+
+import numpy as np
+import pytest
+from src.benchmark import compare, main
+from src.models.generators import FAMILIES, generate
+
+
+@pytest.mark.parametrize("family", list(FAMILIES))
+def test_generated_trusses_are_in_equilibrium(family):
+    truss = generate(family, 200)
+    assert 150 <= truss.get_number_of_dofs() <= 200
+    truss.set_nodal_displacements()
+    truss.set_reactions()
+    # Loads applied on restrained dofs go straight into the supports.
+    free_forces = np.where(truss.node_store.free, truss.node_store.forces, 0)
+    assert np.allclose(
+        truss.node_store.reactions.sum(axis=0),
+        -free_forces.sum(axis=0),
+        atol=1e-6,
+    )
+
+
+def test_benchmark_writes_comparable_results(tmp_path, capsys):
+    output = tmp_path / "bench.json"
+    arguments = ["--families", "pratt", "delaunay", "--dofs", "50", "-r", "1"]
+    assert main(arguments + ["-o", str(output)]) == 0
+    results = json.loads(output.read_text())
+    assert len(results["records"]) == 2
+    record = results["records"][0]
+    assert set(record["seconds"]) == {
+        "generation",
+        "assembly",
+        "boundary_conditions",
+        "solve",
+        "stresses",
+        "reactions",
+    }
+    assert set(record["peak_megabytes"]) == set(record["seconds"])
+    assert "pratt" in capsys.readouterr().out
+
+    slower = json.loads(output.read_text())["records"]
+    slower[0]["seconds"]["solve"] = 10 * record["seconds"]["solve"] + 1
+    (regression,) = compare(results["records"], slower)
+    assert regression.startswith("pratt 50 dofs solve")
@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+import scipy.linalg
+from src.analysis.buckling import BucklingAnalysis
+from src.models.boundary_conditions import FullyRestricted, RestrictedInY
+from src.models.element import Element
+from src.models.node import NodalForce, Node, SpringSupport
+from src.models.truss import Truss
+
+
+def build_braced_column(bays: int, spring: float, sparse: bool = True):
+    """Column of unit bays along x, pinned at x = 0 and compressed by a
+    unit force at its roller end, every inner node held by a transverse
+    spring."""
+
+    nodes = [Node(0, 0, FullyRestricted())]
+    nodes += [
+        Node(i, 0, spring=SpringSupport(ky=spring)) for i in range(1, bays)
+    ]
+    nodes.append(Node(bays, 0, RestrictedInY(), force=NodalForce(-1, 0)))
+    return Truss(
+        [Element(a, b, 2e11, 1e-2) for a, b in zip(nodes, nodes[1:])],
+        nodes,
+        sparse=sparse,
+    )
+
+
+@pytest.mark.parametrize("sparse", [True, False])
+def test_two_bay_column_buckles_at_spring_load(sparse):
+    # The inner node moves by d, the bars turn by d and P 2d = k d.
+    result = BucklingAnalysis(number_of_modes=1).run(
+        build_braced_column(2, 1e3, sparse)
+    )
+    assert result.critical_load_factor == pytest.approx(500, rel=1e-6)
+    assert np.allclose(result.axial_forces, -1)
+    assert result.mode_shapes[3, 0] == pytest.approx(1)
+    assert np.allclose(result.mode_shapes[[0, 1, 2, 5], 0], 0, atol=1e-9)
+
+
+@pytest.mark.parametrize("shift", [0.0, 1e6])
+def test_lanczos_matches_dense_eigensolution(shift, make_girder):
+    truss = make_girder(20, sparse=True)
+    result = BucklingAnalysis(number_of_modes=3, shift=shift).run(truss)
+
+    free = truss.get_partitioned_system().free_dofs
+    stiffness = truss.get_sparse_stiffness_matrix().toarray()
+    geometric = truss.get_geometric_stiffness_matrix().toarray()
+    inverses = scipy.linalg.eigvalsh(
+        -geometric[np.ix_(free, free)], stiffness[np.ix_(free, free)]
+    )
+    factors = 1 / inverses[inverses > 0]
+    # A shift selects the factors closest to it.
+    factors = factors[np.argsort(np.abs(factors - shift))]
+    expected = np.sort(factors[:3])
+    assert result.number_of_modes == 3
+    assert np.allclose(result.load_factors, expected, rtol=1e-6)
+    assert np.all(np.diff(result.load_factors) >= 0)
+
+
+def test_tension_only_truss_does_not_buckle():
+    truss = build_braced_column(3, 1e3)
+    truss.node_store.forces *= -1
+    truss.node_store.touch_boundary_conditions()
+    with pytest.raises(Exception, match="does not buckle"):
+        BucklingAnalysis(number_of_modes=1).run(truss)
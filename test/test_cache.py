@@ -0,0 +1,78 @@
+import os
+
+import numpy as np
+from src.analysis.cache import AnalysisCache
+from src.models.node import NodalForce
+from test.test_truss import build_three_bar_truss
+
+
+def test_fingerprint_ignores_node_ids():
+    truss = build_three_bar_truss()
+    other = build_three_bar_truss()
+    assert truss.fingerprint() == other.fingerprint()
+    other.reorder_dofs("rcm")
+    assert truss.fingerprint() == other.fingerprint()
+    other.nodes[2].force = NodalForce(50e3)
+    assert truss.fingerprint() != other.fingerprint()
+
+
+def test_repeat_analysis_is_read_from_disk(tmp_path):
+    cache = AnalysisCache(tmp_path, store_factorizations=True)
+    truss = build_three_bar_truss()
+    assert not cache.analyse(truss)
+    assert len(list(tmp_path.glob("*.factorization"))) == 1
+
+    repeat = build_three_bar_truss()
+    assert AnalysisCache(tmp_path).analyse(repeat)
+    assert repeat.solve_report is None
+    assert np.allclose(
+        repeat.node_store.displacements, truss.node_store.displacements
+    )
+    assert np.allclose(
+        repeat.element_store.stresses, truss.element_store.stresses
+    )
+    assert np.allclose(repeat.node_store.reactions, truss.node_store.reactions)
+
+    loaded = build_three_bar_truss()
+    factorization = cache.factorize(loaded)
+    assert cache.stats.entry_hits == {"factorization": 1}
+    assert loaded.factorize() is factorization
+    assert np.allclose(
+        loaded.solve_for_displacements(), truss.solve_for_displacements()
+    )
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    first = build_three_bar_truss()
+    cache = AnalysisCache(tmp_path)
+    cache.analyse(first)
+    entry_size = cache.size()
+    cache.max_bytes = 2 * entry_size
+    (entry,) = tmp_path.glob("*.results")
+    os.utime(entry, ns=(0, 0))
+
+    for force in (50e3, 80e3):
+        truss = build_three_bar_truss()
+        truss.nodes[2].force = NodalForce(force)
+        cache.analyse(truss)
+    assert cache.size() <= 2 * entry_size
+    assert not entry.exists()
+    assert not cache.analyse(first)
+
+
+def test_factors_are_stored_as_plain_arrays(tmp_path):
+    cache = AnalysisCache(tmp_path, store_factorizations=True)
+    truss = build_three_bar_truss(sparse=True)
+    truss.solver = "banded"
+    cache.factorize(truss)
+    (entry,) = tmp_path.glob("*.banded.factorization")
+    with np.load(entry, allow_pickle=False) as data:
+        assert str(data["backend"]) == "banded"
+
+    loaded = build_three_bar_truss(sparse=True)
+    loaded.solver = "banded"
+    assert cache.factorize(loaded).backend == "banded"
+    assert cache.stats.entry_hits == {"factorization": 1}
+    assert np.allclose(
+        loaded.solve_for_displacements(), truss.solve_for_displacements()
+    )
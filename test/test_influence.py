@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+from src.analysis.influence import AxleTrain, influence_lines
+
+
+@pytest.fixture
+def girder_lines(make_girder):
+    truss = make_girder(10, sparse=True)
+    return truss, influence_lines(truss, np.arange(11))
+
+
+def test_influence_matrix_matches_single_load_solves(girder_lines):
+    truss, lines = girder_lines
+    assert lines.member_forces.shape == (len(truss.element_store), 11)
+    assert np.allclose(lines.positions, np.arange(11))
+    truss.node_store.forces[:] = 0
+    truss.node_store.forces[4, 1] = -1
+    truss.set_nodal_displacements()
+    truss.set_element_stresses()
+    assert np.allclose(
+        lines.member_forces[:, 4],
+        truss.element_store.stresses * truss.element_store.area,
+    )
+    assert np.allclose(
+        lines.forces_at([4.0, 4.5])[:, 0], lines.member_forces[:, 4]
+    )
+    assert np.allclose(
+        lines.forces_at([4.5])[:, 0],
+        lines.member_forces[:, 4:6].mean(axis=1),
+    )
+    assert np.allclose(lines.forces_at([-1.0, 11.0]), 0)
+
+
+def test_envelope_of_axle_train_matches_brute_force(girder_lines):
+    _, lines = girder_lines
+    train = AxleTrain(loads=[100e3, 150e3, 150e3], offsets=[0, 1.3, 2.6])
+    envelope = lines.envelope(train, chunk_size=7)
+
+    leads = np.linspace(-3, 14, 17001)
+    forces = sum(
+        load * lines.forces_at(leads - offset)
+        for load, offset in zip(train.loads, train.offsets)
+    )
+    reverse = sum(
+        load * lines.forces_at(leads + offset)
+        for load, offset in zip(train.loads, train.offsets)
+    )
+    forces = np.hstack((forces, reverse))
+    assert np.allclose(envelope.max, forces.max(axis=1))
+    assert np.allclose(envelope.min, forces.min(axis=1))
+    governing = np.argmax(np.abs(envelope.max))
+    sign = -1 if envelope.max_reversed[governing] else 1
+    axles = envelope.max_position[governing] - sign * train.offsets
+    assert lines.forces_at(axles)[governing] @ train.loads == pytest.approx(
+        envelope.max[governing]
+    )
@@ -0,0 +1,61 @@
+import io
+import json
+import logging
+
+import numpy as np
+
+from src.models.instrumentation import (
+    JsonLinesSink,
+    LoggingSink,
+    MemorySink,
+    instrument,
+    phase,
+)
+
+
+def test_phases_are_recorded_only_when_enabled(caplog, make_girder):
+    truss = make_girder(10, sparse=True, solver="sparse")
+    truss.set_nodal_displacements()
+    assert phase("anything").gauge("size", 1) is None
+
+    truss.invalidate()
+    lines = io.StringIO()
+    with caplog.at_level(logging.INFO, logger="truss.instrumentation"):
+        with instrument(
+            MemorySink(), LoggingSink(), JsonLinesSink(lines), allocations=True
+        ) as sink:
+            truss.set_nodal_displacements()
+            truss.set_element_stresses()
+            truss.set_reactions()
+
+    paths = [record.path for record in sink.records]
+    assert "solve/factorization" in paths
+    assert "solve/boundary_conditions/partition" in paths
+    assert "solve/substitution" in paths
+    assert {"stresses", "reactions"} <= set(paths)
+    (assembly,) = [r for r in sink.records if r.name == "assembly"]
+    assert assembly.gauges == {"dofs": 44, "nnz": assembly.gauges["nnz"]}
+    assert assembly.gauges["nnz"] > 44
+    (solve,) = [r for r in sink.records if r.path == "solve"]
+    assert solve.wall_time >= sum(
+        r.wall_time for r in sink.records if r.path.count("/") == 1
+    )
+    assert solve.peak_bytes >= assembly.peak_bytes > 0
+    assert set(sink.totals()) == set(paths)
+
+    records = [json.loads(line) for line in lines.getvalue().splitlines()]
+    assert [record["path"] for record in records] == paths
+    assert "solve/factorization wall=" in caplog.text
+
+
+def test_nested_phase_keeps_the_peak_of_its_parent():
+    with instrument(allocations=True) as sink:
+        with phase("outer"):
+            transient = np.ones(1_000_000)
+            del transient
+            with phase("inner"):
+                pass
+
+    records = {record.path: record for record in sink.records}
+    assert records["outer"].peak_bytes >= 8_000_000
+    assert records["outer/inner"].peak_bytes < 1_000_000
@@ -0,0 +1,99 @@
+import numpy as np
+import pytest
+from src.models.io import (
+    load_results,
+    load_truss,
+    read_csv_table,
+    save_results,
+    validate_connectivity,
+)
+from test.test_truss import build_three_bar_truss
+
+NODES = """x,y,free_x,free_y,fx
+0,0,0,0,0
+4,0,1,0,0
+4,6,1,1,100e3
+"""
+ELEMENTS = """node1,node2,area
+0,1,2300e-6
+1,2,2300e-6
+0,2,2300e-6
+"""
+
+
+def test_csv_tables_load_in_chunks(tmp_path):
+    (tmp_path / "nodes.csv").write_text(NODES)
+    (tmp_path / "elements.csv").write_text(ELEMENTS)
+    truss = load_truss(
+        tmp_path / "nodes.csv",
+        tmp_path / "elements.csv",
+        youngs_modulus=2e11,
+        chunk_size=2,
+    )
+    assert np.allclose(
+        truss.solve_for_displacements(),
+        build_three_bar_truss().solve_for_displacements(),
+    )
+
+    table = read_csv_table(
+        tmp_path / "nodes.csv", {"y": None, "ky": 5.0}, chunk_size=1
+    )
+    assert np.allclose(table["y"], [0, 0, 6])
+    assert np.allclose(table["ky"], 5.0)
+    with pytest.raises(ValueError, match="no youngs_modulus"):
+        load_truss(tmp_path / "nodes.csv", tmp_path / "elements.csv")
+
+
+def test_npy_tables_are_memory_mapped(tmp_path):
+    arrays = build_three_bar_truss().to_arrays()
+    np.save(tmp_path / "coordinates.npy", arrays.coordinates)
+    np.save(tmp_path / "connectivity.npy", arrays.connectivity)
+    truss = load_truss(
+        tmp_path / "coordinates.npy",
+        tmp_path / "connectivity.npy",
+        youngs_modulus=2e11,
+        area=2300e-6,
+    )
+    assert isinstance(truss.node_store.coordinates, np.memmap)
+    assert isinstance(truss.element_store.connectivity, np.memmap)
+    assert np.allclose(
+        truss.get_stiffness_matrix(),
+        build_three_bar_truss().get_stiffness_matrix(),
+    )
+
+
+def test_invalid_connectivity_is_reported():
+    validate_connectivity(np.array([[0, 1], [1, 2]]), 3)
+    with pytest.raises(Exception, match="2 element.*element 1 with nodes"):
+        validate_connectivity(
+            np.array([[0, 1], [1, 3], [2, 2]]), 3, chunk_size=2
+        )
+
+
+def test_results_file_is_memory_mapped(tmp_path):
+    truss = build_three_bar_truss()
+    truss.set_nodal_displacements()
+    truss.set_element_stresses()
+    truss.set_reactions()
+    forces = np.zeros((6, 3))
+    forces[4] = [100e3, 50e3, -20e3]
+    forces[5, 2] = 10e3
+    cases = truss.solve_load_cases(forces)
+    save_results(truss, tmp_path / "three_bar.results", load_cases=cases)
+
+    results = load_results(tmp_path / "three_bar.results")
+    assert results.version == 1
+    assert isinstance(results.stresses, np.memmap)
+    assert np.allclose(results.displacements, truss.node_store.displacements)
+    assert np.allclose(results.reactions, truss.node_store.reactions)
+    assert np.allclose(results.stresses[1:], truss.element_store.stresses[1:])
+    assert np.array_equal(results.supported_dofs, truss.get_supported_dofs())
+    assert results.number_of_cases == 3
+    case = results.load_case(2)
+    assert np.allclose(case.stresses, cases.case(2).stresses)
+    assert np.allclose(case.displacements, cases.case(2).displacements)
+    assert np.allclose(results.load_cases.reactions, cases.reactions)
+
+    (tmp_path / "other.results").write_bytes(b"not results")
+    with pytest.raises(ValueError, match="not a truss results file"):
+        load_results(tmp_path / "other.results")
@@ -0,0 +1,35 @@
+import numpy as np
+from src.models.kernels import (
+    element_dofs,
+    element_geometry,
+    global_stiffness_matrices,
+)
+
+
+def test_element_geometry():
+    coordinates = np.array([[0, 0], [192, 144], [192, 0]])
+    connectivity = np.array([[0, 1], [2, 1]])
+    geometry = element_geometry(coordinates, connectivity)
+    assert np.allclose(geometry.lengths, [240, 144])
+    assert np.allclose(geometry.cos, [0.8, 0])
+    assert np.allclose(geometry.sin, [0.6, 1])
+
+
+def test_global_stiffness_matrices_batch():
+    coordinates = np.array([[0, 0], [192, 144], [192, 0]])
+    connectivity = np.array([[0, 1], [2, 1]])
+    batch = global_stiffness_matrices(coordinates, connectivity, 3e4, 10)
+    assert batch.stiffness.shape == (2, 4, 4)
+    assert np.allclose(batch.stiffness[0, 0], [800, 600, -800, -600])
+    assert np.allclose(
+        batch.stiffness[1, 1], [0, 3e4 * 10 / 144, 0, -3e4 * 10 / 144]
+    )
+    assert np.array_equal(batch.dofs, [[0, 1, 2, 3], [4, 5, 2, 3]])
+
+
+def test_element_dofs_with_node_dofs_map():
+    node_dofs = np.array([[4, 5], [0, 1], [2, 3]])
+    assert np.array_equal(
+        element_dofs([[0, 1], [1, 2]], node_dofs),
+        [[4, 5, 0, 1], [0, 1, 2, 3]],
+    )
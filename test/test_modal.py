@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+import scipy.linalg
+from src.analysis.modal import ModalAnalysis
+from src.models.boundary_conditions import FullyRestricted, RestrictedInY
+from src.models.element import Element
+from src.models.node import Node
+from src.models.truss import Truss
+
+
+def build_axial_bar(elements: int, sparse: bool = True) -> Truss:
+    """Bar of unit length clamped at x = 0, free to vibrate axially."""
+
+    nodes = [Node(0, 0, FullyRestricted())] + [
+        Node((i + 1) / elements, 0, RestrictedInY()) for i in range(elements)
+    ]
+    return Truss(
+        [Element(a, b, 2e11, 1e-3, 7850) for a, b in zip(nodes, nodes[1:])],
+        nodes,
+        sparse=sparse,
+    )
+
+
+@pytest.mark.parametrize("lumped", [True, False])
+def test_axial_bar_converges_to_exact_frequency(lumped):
+    exact = np.pi / 2 * np.sqrt(2e11 / 7850)
+    result = ModalAnalysis(number_of_modes=3, lumped=lumped).run(
+        build_axial_bar(200)
+    )
+    assert result.number_of_modes == 3
+    assert result.angular_frequencies[0] == pytest.approx(exact, rel=1e-4)
+    assert result.angular_frequencies[1] == pytest.approx(3 * exact, rel=1e-3)
+    assert np.allclose(result.mode_shapes[1::2], 0)
+
+
+def test_lumped_mass_preserves_total_mass(make_girder):
+    truss = make_girder(5)
+    for element in truss.elements:
+        element.density = 7850
+    total = 7850 * 1e-3 * sum(e.get_length() for e in truss.elements)
+    assert truss.get_mass_matrix().sum() == pytest.approx(2 * total)
+    assert truss.get_mass_matrix(lumped=False).sum() == pytest.approx(
+        2 * total
+    )
+
+
+@pytest.mark.parametrize("shift", [0.0, 1e3])
+def test_shift_invert_matches_dense_eigensolution(shift, make_girder):
+    truss = make_girder(20, sparse=True)
+    for element in truss.elements:
+        element.density = 7850
+    result = ModalAnalysis(number_of_modes=4, lumped=False, shift=shift).run(
+        truss
+    )
+
+    free = truss.get_partitioned_system().free_dofs
+    stiffness = truss.get_sparse_stiffness_matrix().toarray()
+    mass = truss.get_mass_matrix(lumped=False).toarray()
+    eigenvalues = scipy.linalg.eigh(
+        stiffness[np.ix_(free, free)],
+        mass[np.ix_(free, free)],
+        eigvals_only=True,
+    )
+    assert np.allclose(result.angular_frequencies ** 2, eigenvalues[:4])
+    with pytest.raises(ValueError, match="no mass"):
+        ModalAnalysis().run(make_girder(5, sparse=True))
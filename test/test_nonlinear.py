@@ -0,0 +1,124 @@
+import numpy as np
+import pytest
+from src.analysis.nonlinear import NewtonRaphson
+from src.models.boundary_conditions import FreeMoving, FullyRestricted
+from src.models.element import Element
+from src.models.node import NodalForce, Node, SpringSupport
+from src.models.truss import Truss
+from test.test_truss import build_three_bar_truss
+
+SPAN, RISE, STIFFNESS = 1.0, 0.1, 1e6
+
+
+def build_arch(load: float) -> Truss:
+    """Shallow two bar (von Mises) arch loaded downwards at its apex."""
+
+    left = Node(-SPAN, 0, FullyRestricted())
+    right = Node(SPAN, 0, FullyRestricted())
+    apex = Node(0, RISE, force=NodalForce(0, -load))
+    return Truss(
+        [
+            Element(left, apex, STIFFNESS, 1),
+            Element(apex, right, STIFFNESS, 1),
+        ],
+        [left, apex, right],
+    )
+
+
+def arch_load(deflection: np.ndarray) -> np.ndarray:
+    """Apex load in equilibrium with a downward deflection of the apex."""
+
+    length = np.hypot(SPAN, RISE)
+    deformed = np.hypot(SPAN, RISE - deflection)
+    axial = STIFFNESS * (deformed - length) / length
+    return -2 * axial * (RISE - deflection) / deformed
+
+
+LIMIT_LOAD = arch_load(RISE * (1 - 1 / np.sqrt(3)))
+
+
+def test_small_load_matches_linear_solution(make_girder):
+    truss = make_girder(6, load=-1.0)
+    truss.set_nodal_displacements()
+    linear = truss.node_store.displacements.ravel().copy()
+
+    result = NewtonRaphson(make_girder(6, load=-1.0), steps=2).run()
+    assert result.converged
+    assert np.allclose(result.displacements, linear, rtol=1e-4, atol=1e-12)
+
+
+def test_load_control_reports_every_step():
+    truss = build_arch(0.5 * LIMIT_LOAD)
+    result = NewtonRaphson(truss, steps=4).run()
+
+    assert result.converged
+    assert [step.load_factor for step in result.steps] == pytest.approx(
+        [0.25, 0.5, 0.75, 1.0]
+    )
+    for step in result.steps:
+        assert step.converged
+        assert step.iterations == len(step.residual_norms) - 1
+        assert step.residual_norms[-1] <= 1e-8
+        assert step.time >= 0
+
+    deflection = -result.displacements[3]
+    assert arch_load(deflection) == pytest.approx(0.5 * LIMIT_LOAD)
+    assert np.allclose(
+        truss.node_store.displacements.ravel(), result.displacements
+    )
+    reactions = truss.node_store.reactions
+    assert reactions[:, 1].sum() == pytest.approx(0.5 * LIMIT_LOAD)
+
+
+def test_load_control_recovers_from_a_cutback():
+    result = NewtonRaphson(
+        build_arch(0.9 * LIMIT_LOAD), steps=2, max_iterations=4
+    ).run()
+
+    assert result.converged
+    assert result.load_factor == pytest.approx(1.0)
+    assert any(step.cutbacks for step in result.steps)
+    assert all(step.converged for step in result.steps)
+    assert result.load_factors == pytest.approx([0.5, 0.75, 1.0])
+    assert arch_load(-result.displacements[3]) == pytest.approx(
+        0.9 * LIMIT_LOAD
+    )
+
+
+def test_arc_length_traces_snap_through():
+    load = 1.5 * LIMIT_LOAD
+    truss = build_arch(load)
+    result = NewtonRaphson(truss, steps=20, arc_length=True).run()
+
+    assert result.converged
+    factors = np.array(result.load_factors)
+    # The path rises past the limit load, unloads and loads again.
+    unloading = np.flatnonzero(np.diff(factors) < 0)
+    assert len(unloading)
+    assert factors[: unloading[0] + 1].max() * load == pytest.approx(
+        LIMIT_LOAD, rel=0.05
+    )
+    deflections = -np.array([u[3] for u in result.history])
+    assert np.allclose(
+        factors * load, arch_load(deflections), rtol=1e-6, atol=1e-8 * load
+    )
+    assert deflections[-1] > 2 * RISE
+    assert arch_load(-result.displacements[3]) == pytest.approx(load)
+
+
+def test_spring_reactions_balance_the_loads():
+    truss = build_three_bar_truss()
+    truss.nodes[1].boundary_condition = FreeMoving()
+    truss.nodes[1].spring = SpringSupport(ky=1e9)
+    result = NewtonRaphson(truss, steps=2).run()
+
+    assert result.converged
+    assert np.allclose(
+        truss.node_store.reactions.sum(axis=0)
+        + truss.node_store.forces.sum(axis=0),
+        0,
+        atol=1e-3,
+    )
+    assert truss.node_store.reactions[1, 1] == pytest.approx(
+        -1e9 * result.displacements[3]
+    )
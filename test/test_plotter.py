@@ -0,0 +1,34 @@
+import sys
+
+import pytest
+from matplotlib.collections import LineCollection
+from src.visualization.plotter import Plotter
+from src.visualization.spacing import Spacing
+from test.test_truss import build_three_bar_truss
+
+
+def test_spacing_is_relative_to_the_longest_element():
+    spacing = Spacing(build_three_bar_truss()).spacing_map
+    assert spacing[100] == pytest.approx(52 ** 0.5)
+    assert spacing[10] == pytest.approx(0.1 * 52 ** 0.5)
+
+
+@pytest.mark.parametrize("suffix", ["png", "svg", "pdf"])
+def test_elements_are_drawn_as_one_collection_per_layer(
+    tmp_path, suffix, make_girder
+):
+    truss = make_girder(50)
+    truss.set_nodal_displacements()
+    truss.set_element_stresses()
+    plotter = Plotter(truss=truss, backend="Agg")
+    plotter.plot_truss(tmp_path / f"girder.{suffix}", color_by_stress=True)
+
+    collections = [
+        c for c in plotter.ax.collections if isinstance(c, LineCollection)
+    ]
+    assert len(collections) == 2
+    assert all(len(c.get_segments()) == 201 for c in collections)
+    assert collections[1].get_array() is not None
+    assert len(plotter.ax.lines) == 1
+    assert (tmp_path / f"girder.{suffix}").stat().st_size > 0
+    assert "matplotlib.pyplot" in sys.modules
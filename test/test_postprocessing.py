@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+from src.models.postprocessing import element_results
+
+
+@pytest.fixture
+def results():
+    # Three horizontal bars of length 1 stretched by 1, -2 and 3 mm.
+    coordinates = np.array([[0, 0], [1, 0], [0, 1], [1, 1], [0, 2], [1, 2]])
+    connectivity = np.array([[0, 1], [2, 3], [4, 5]])
+    displacements = np.zeros(12)
+    displacements[[2, 6, 10]] = [1e-3, -2e-3, 3e-3]
+    return element_results(
+        coordinates,
+        connectivity,
+        youngs_modulus=2e11,
+        area=np.array([1e-3, 2e-3, 1e-3]),
+        displacements=displacements,
+        allowable_stress=4e8,
+    )
+
+
+def test_element_results(results):
+    assert np.allclose(results.strains, [1e-3, -2e-3, 3e-3])
+    assert np.allclose(results.stresses, [2e8, -4e8, 6e8])
+    assert np.allclose(results.axial_forces, [2e5, -8e5, 6e5])
+    assert np.allclose(results.utilization, [0.5, 1, 1.5])
+
+
+def test_critical_member_queries(results):
+    assert results.max() == (2, pytest.approx(6e8))
+    assert results.min() == (1, pytest.approx(-4e8))
+    assert results.top_k(2).tolist() == [2, 1]
+    assert results.top_k(2, "stresses", absolute=False).tolist() == [2, 0]
+
+
+def test_element_results_per_load_case():
+    coordinates = np.array([[0, 0], [1, 0], [1, 1]])
+    connectivity = np.array([[0, 1], [1, 2]])
+    displacements = np.zeros((6, 2))
+    displacements[2, 0] = 1e-3
+    displacements[5, 1] = 1e-3
+    results = element_results(
+        coordinates, connectivity, 2e11, 1e-3, displacements
+    )
+    assert results.stresses.shape == (2, 2)
+    assert np.allclose(results.stresses, [[2e8, 0], [0, 2e8]])
+    assert results.max()[0].tolist() == [0, 1]
+    assert results.utilization is None
+    with pytest.raises(ValueError):
+        results.top_k(1)
@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+
+def test_rcm_reduces_bandwidth(make_girder):
+    truss = make_girder(30, seed=0)
+    report = truss.reorder_dofs()
+    assert report.after.bandwidth < report.before.bandwidth
+    assert report.after.profile < report.before.profile
+    assert report.after == truss.get_band_statistics()
+    assert sorted(report.node_order) == list(range(len(truss.nodes)))
+
+
+@pytest.mark.parametrize("solver", ["dense", "sparse", "banded"])
+def test_reordered_results_map_back_to_nodes(solver: str, make_girder):
+    reference = make_girder(30, seed=0, sparse=True)
+    reference.set_nodal_displacements()
+
+    truss = make_girder(30, seed=0, sparse=True, solver=solver)
+    truss.reorder_dofs()
+    truss.set_nodal_displacements()
+
+    assert np.allclose(
+        truss.node_store.displacements, reference.node_store.displacements
+    )
+    forces = truss.node_store.forces.ravel()
+    assert np.allclose(
+        truss.solve_load_cases(forces).displacements[:, 0],
+        reference.solve_load_cases(forces).displacements[:, 0],
+    )
+
+
+def test_force_vector_stays_in_dof_order(make_girder):
+    truss = make_girder(5, seed=0, sparse=True)
+    truss.reorder_dofs()
+    forces = truss.node_store.forces.ravel()
+    dof_forces = truss.get_force_vector().ravel()
+
+    assert not np.array_equal(dof_forces, forces)
+    assert np.array_equal(dof_forces[truss.node_store.dofs.ravel()], forces)
+    assert np.array_equal(truss.node_store.gather(dof_forces).ravel(), forces)
+    truss.set_nodal_displacements()
+    assert np.allclose(
+        truss.solve_load_cases(forces).displacements[:, 0],
+        truss.node_store.displacements.ravel(),
+    )
+
+
+def test_natural_order_restores_numbering(make_girder):
+    truss = make_girder(5, seed=0)
+    truss.reorder_dofs()
+    truss.reorder_dofs("natural")
+    assert [node.dofs for node in truss.nodes[:2]] == [(0, 1), (2, 3)]
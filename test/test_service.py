@@ -0,0 +1,91 @@
+import asyncio
+import json
+
+import numpy as np
+from src.models.io import save_model
+from src.service import AnalysisService, LatencyHistogram
+from test.test_truss import build_three_bar_truss
+
+
+async def _request_all(path, requests):
+    reader, writer = await asyncio.open_unix_connection(str(path))
+    for request in requests:
+        writer.write(json.dumps(request).encode() + b"\n")
+    await writer.drain()
+    responses = [json.loads(await reader.readline()) for _ in requests]
+    writer.close()
+    return {response.pop("id"): response for response in responses}
+
+
+def test_concurrent_load_cases_are_merged(tmp_path):
+    truss = build_three_bar_truss()
+    save_model(truss, tmp_path / "three_bar.npz")
+    forces = np.zeros((4, 6))
+    forces[:, 4] = [100e3, 50e3, 0, -20e3]
+    forces[:, 5] = [0, 10e3, 30e3, 0]
+    expected = truss.solve_load_cases(forces.T)
+
+    async def run():
+        service = AnalysisService(batch_window=0.05)
+        server = await service.start(socket=str(tmp_path / "truss.sock"))
+        async with server:
+            (loaded,) = (
+                await _request_all(
+                    tmp_path / "truss.sock",
+                    [
+                        {
+                            "op": "load",
+                            "path": str(tmp_path / "three_bar.npz"),
+                            "id": 0,
+                        }
+                    ],
+                )
+            ).values()
+            requests = [
+                {
+                    "op": "solve",
+                    "model": loaded["model"],
+                    "forces": f.tolist(),
+                    "id": i,
+                }
+                for i, f in enumerate(forces)
+            ]
+            requests.append(
+                {
+                    "op": "solve",
+                    "model": "missing",
+                    "forces": [],
+                    "id": "missing",
+                }
+            )
+            responses = await _request_all(tmp_path / "truss.sock", requests)
+            metrics = service.metrics()
+        service.close()
+        return loaded, responses, metrics
+
+    loaded, responses, metrics = asyncio.run(run())
+    assert loaded["number_of_dofs"] == 6
+    for case in range(4):
+        assert np.allclose(
+            responses[case]["displacements"][0],
+            expected.displacements[:, case],
+        )
+        assert np.allclose(
+            responses[case]["stresses"][0], expected.stresses[:, case]
+        )
+    assert "KeyError" in responses["missing"]["error"]
+    assert metrics["batches"] == 1
+    assert metrics["batched_cases"] == 4
+    assert metrics["max_queue_depth"] == 4
+    assert metrics["queue_depth"] == 0
+    assert metrics["latency"]["solve"]["count"] == 5
+
+
+def test_latency_histogram_quantiles():
+    histogram = LatencyHistogram(bounds=(0.001, 0.01))
+    for seconds in (0.0005, 0.0005, 0.005, 1.0):
+        histogram.observe(seconds)
+    assert histogram.counts == [2, 1, 1]
+    assert histogram.quantile(0.5) == 0.001
+    assert histogram.quantile(0.75) == 0.01
+    assert histogram.quantile(1.0) == np.inf
@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+from src.analysis.sizing import FullyStressedDesign
+
+
+def test_fully_stressed_design_of_determinate_truss(make_girder):
+    truss = make_girder(6, load=-1e4, sparse=True)
+    result = FullyStressedDesign(
+        truss, allowable_stress=2e8, min_area=1e-6
+    ).run()
+
+    assert result.converged
+    assert len(result.weight_history) == len(result.iterations)
+    initial_weight = 1e-3 * (12 + 7 + 6 * np.sqrt(2))
+    assert result.weight_history[-1] < initial_weight
+    truss.set_nodal_displacements()
+    stress_ratio = np.abs(truss.get_element_results().stresses) / 2e8
+    loaded = result.areas > 1e-6
+    assert np.allclose(stress_ratio[loaded], 1)
+    assert truss.cache_stats.entry_misses["sparsity_pattern"] == 1
+
+
+def test_member_groups_share_area(make_girder):
+    truss = make_girder(4, load=-1e4, sparse=True)
+    groups = ["bottom"] * 4 + ["top"] * 4 + ["web"] * 9
+    result = FullyStressedDesign(
+        truss, allowable_stress=2e8, groups=groups, max_area=5e-4
+    ).run()
+    assert len(set(result.areas[:4])) == 1
+    assert len(set(result.areas[4:8])) == 1
+    assert len(set(result.areas[8:])) == 1
+    assert result.areas.max() <= 5e-4
+    assert result.iterations[-1].solve_time >= 0
+
+
+def test_stops_at_max_iterations(make_girder):
+    result = FullyStressedDesign(
+        make_girder(4, load=-1e4, sparse=True),
+        allowable_stress=2e8,
+        tolerance=0,
+        max_iterations=3,
+    ).run()
+    assert not result.converged
+    assert [it.iteration for it in result.iterations] == [1, 2, 3]
+    assert result.iterations[0].weight == pytest.approx(
+        result.weight_history[0]
+    )
@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+from scipy import sparse as sp
+from src.models.solvers import (
+    AutoSolver,
+    ConjugateGradientSolver,
+    DenseSolver,
+    SparseDirectSolver,
+    get_solver,
+)
+
+
+@pytest.mark.parametrize(
+    "solver",
+    [
+        "dense",
+        "sparse",
+        ConjugateGradientSolver(preconditioner="jacobi", tolerance=1e-12),
+        ConjugateGradientSolver(preconditioner="ilu", tolerance=1e-12),
+    ],
+)
+def test_backends_agree(solver, make_girder):
+    reference = make_girder(20, solver="dense").solve_for_displacements()
+    truss = make_girder(20, sparse=True, solver=solver)
+    assert np.allclose(truss.solve_for_displacements(), reference)
+    assert truss.solve_report.iterations >= 1
+    assert truss.solve_report.factorization_time >= 0
+
+
+def test_cg_reports_iterations(make_girder):
+    truss = make_girder(20, sparse=True, solver="cg")
+    truss.solve_for_displacements()
+    assert truss.solve_report.backend == "cg"
+    assert truss.solve_report.iterations > 1
+    assert truss.solve_report.residual_norm <= 1e-10
+
+
+def test_cg_raises_when_not_converged(make_girder):
+    truss = make_girder(
+        20,
+        sparse=True,
+        solver=ConjugateGradientSolver(preconditioner=None, max_iterations=2),
+    )
+    with pytest.raises(Exception, match="did not converge"):
+        truss.solve_for_displacements()
+
+
+def test_auto_solver_selection():
+    auto = AutoSolver(dense_limit=10, direct_limit=100)
+    assert isinstance(auto.select(np.eye(5)), DenseSolver)
+    assert isinstance(
+        auto.select(sp.eye(50, format="csr")), SparseDirectSolver
+    )
+    assert isinstance(
+        auto.select(sp.eye(500, format="csr")), ConjugateGradientSolver
+    )
+    assert isinstance(auto.select(np.ones((50, 50))), DenseSolver)
+
+
+def test_get_solver_rejects_unknown_names():
+    with pytest.raises(ValueError):
+        get_solver("qr")
@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+from src.models.spatial import (
+    SpatialIndex,
+    merge_coincident,
+    truss_from_segments,
+)
+
+
+def girder_segments(truss) -> np.ndarray:
+    """End points of the elements of a truss, each segment with its own
+    copies of the end points, slightly perturbed."""
+
+    coordinates = truss.node_store.coordinates
+    segments = coordinates[truss.element_store.connectivity].reshape(-1, 4)
+    noise = np.random.default_rng(0).uniform(-1e-7, 1e-7, segments.shape)
+    return segments + noise
+
+
+def test_merge_numbers_points_in_order_of_appearance():
+    points = [[1, 1], [0, 0], [1, 1 + 1e-9], [2, 0], [0, 1e-10]]
+    coordinates, inverse = merge_coincident(points, 1e-6)
+    assert np.array_equal(coordinates, [[1, 1], [0, 0], [2, 0]])
+    assert np.array_equal(inverse, [0, 1, 0, 2, 1])
+
+
+def test_segments_rebuild_the_truss(make_girder):
+    girder = make_girder(6)
+    segments = np.concatenate(
+        (
+            girder_segments(girder),
+            # A repeated, reversed member and a member of zero length.
+            girder_segments(girder)[:1, [2, 3, 0, 1]],
+            [[5, 5, 5, 5]],
+        )
+    )
+    truss = truss_from_segments(segments, 2e11, 1e-3, tolerance=1e-5)
+
+    assert len(truss.node_store) == len(girder.node_store)
+    assert len(truss.element_store) == len(girder.element_store)
+    index = SpatialIndex(truss.node_store.coordinates)
+    _, nodes = index.nearest(girder.node_store.coordinates)
+    assert len(np.unique(nodes)) == len(nodes)
+    assert np.array_equal(
+        np.sort(np.sort(nodes[girder.element_store.connectivity]), axis=0),
+        np.sort(np.sort(truss.element_store.connectivity), axis=0),
+    )
+
+    # Supports and loads by region give the girder displacements.
+    bottom = index.in_box((-0.5, -0.5), (6.5, 0.5))
+    truss.node_store.forces[bottom] = (0, -1e3)
+    left, right = index.nearest([[0, 0], [6, 0]])[1]
+    truss.node_store.free[left] = False
+    truss.node_store.free[right, 1] = False
+    truss.node_store.touch_boundary_conditions()
+    truss.set_nodal_displacements()
+    girder.set_nodal_displacements()
+    assert np.allclose(
+        truss.node_store.displacements[nodes],
+        girder.node_store.displacements,
+        rtol=1e-4,
+        atol=1e-9,
+    )
+
+
+def test_section_properties_follow_kept_segments():
+    segments = [[0, 0, 1, 0], [1, 0, 0, 0], [1, 0, 1, 1]]
+    truss = truss_from_segments(segments, [1.0, 2.0, 3.0], [4.0, 5.0, 6.0])
+    assert np.array_equal(truss.element_store.youngs_modulus, [1, 3])
+    assert np.array_equal(truss.element_store.area, [4, 6])
+
+
+def test_queries_match_brute_force():
+    coordinates = np.random.default_rng(1).uniform(0, 10, (500, 2))
+    index = SpatialIndex(coordinates)
+
+    lower, upper = np.array([2.0, 3.0]), np.array([7.0, 4.0])
+    inside = np.all((coordinates >= lower) & (coordinates <= upper), axis=1)
+    assert np.array_equal(index.in_box(lower, upper), np.flatnonzero(inside))
+
+    distances = np.linalg.norm(coordinates - [5, 5], axis=1)
+    assert np.array_equal(
+        index.within([5, 5], 1.5), np.flatnonzero(distances <= 1.5)
+    )
+    distance, nearest = index.nearest([5, 5])
+    assert nearest == np.argmin(distances)
+    assert distance == pytest.approx(distances.min())
+
+    distance, nearest = index.nearest([[50, 50]], max_distance=1)
+    assert np.isinf(distance[0]) and nearest[0] == len(index)
+
+    with pytest.raises(ValueError, match="lower corner"):
+        index.in_box(upper, lower)
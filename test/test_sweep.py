@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+from src.analysis.sweep import ParameterGrid, RandomPerturbation, Sweep
+from src.models.truss import Truss
+
+
+@pytest.fixture
+def girder(make_girder) -> Truss:
+    return make_girder(4, sparse=True)
+
+
+def test_parameter_grid_scales_results(girder: Truss):
+    grid = ParameterGrid(area_factors=[1, 2], force_factors=[1, 3])
+    results = Sweep(girder, grid, workers=1).run()
+    assert results.displacements.shape == (4, 20)
+    base, tripled, stiffer, _ = results.displacements
+    assert np.allclose(tripled, 3 * base)
+    assert np.allclose(stiffer, base / 2)
+    assert np.allclose(results.stresses[1], 3 * results.stresses[0])
+
+
+def test_monte_carlo_sweep_is_reproducible(girder: Truss):
+    sampler = RandomPerturbation(
+        samples=20, youngs_modulus_cov=0.05, area_cov=0.1, force_cov=0.2
+    )
+    serial = Sweep(girder, sampler, workers=1, chunk_size=20, seed=7).run()
+    parallel = Sweep(girder, sampler, workers=2, chunk_size=3, seed=7).run()
+    assert np.array_equal(serial.displacements, parallel.displacements)
+    assert np.array_equal(serial.reactions, parallel.reactions)
+    assert not np.allclose(serial.stresses[0], serial.stresses[1])
+
+    reseeded = Sweep(girder, sampler, workers=1, seed=8).run()
+    assert not np.allclose(reseeded.stresses, serial.stresses)
@@ -0,0 +1,253 @@
+from dataclasses import FrozenInstanceError, astuple
+
+import numpy as np
+import pytest
+from scipy import sparse as sp
+from src.models.boundary_conditions import (
+    FreeMoving,
+    FullyRestricted,
+    RestrictedInY,
+)
+from src.models.element import Element
+from src.models.node import (
+    NodalDisplacement,
+    NodalForce,
+    Node,
+    SpringSupport,
+)
+from src.models.truss import Truss
+
+
+def build_three_bar_truss(sparse: bool = False) -> Truss:
+    n1 = Node(0, 0, FullyRestricted())
+    n2 = Node(4, 0, RestrictedInY())
+    n3 = Node(4, 6, FreeMoving(), NodalForce(100e3))
+    el1 = Element(n1, n2, 2e11, 2300e-6)
+    el2 = Element(n2, n3, 2e11, 2300e-6)
+    el3 = Element(n1, n3, 2e11, 2300e-6)
+    return Truss([el1, el2, el3], [n1, n2, n3], sparse=sparse)
+
+
+@pytest.fixture
+def three_bar_truss():
+    return build_three_bar_truss()
+
+
+@pytest.fixture
+def sparse_three_bar_truss():
+    return build_three_bar_truss(sparse=True)
+
+
+def test_sparse_stiffness_matches_dense(three_bar_truss: Truss):
+    matrix = three_bar_truss.get_sparse_stiffness_matrix()
+    assert sp.isspmatrix_csr(matrix)
+    assert np.allclose(
+        matrix.toarray(), three_bar_truss.get_stiffness_matrix()
+    )
+
+
+def test_sparse_solve_matches_dense(
+    three_bar_truss: Truss, sparse_three_bar_truss: Truss
+):
+    assert np.allclose(
+        sparse_three_bar_truss.solve_for_displacements(),
+        three_bar_truss.solve_for_displacements(),
+    )
+
+
+def test_sparse_reactions_match_dense(
+    three_bar_truss: Truss, sparse_three_bar_truss: Truss
+):
+    three_bar_truss.set_nodal_displacements()
+    sparse_three_bar_truss.set_nodal_displacements()
+    assert np.allclose(
+        sparse_three_bar_truss.get_reactions(),
+        three_bar_truss.get_reactions(),
+    )
+
+
+def test_dofs_are_numbered_per_truss():
+    first = build_three_bar_truss()
+    second = build_three_bar_truss()
+    assert first.get_number_of_dofs() == second.get_number_of_dofs() == 6
+    assert [node.dofs for node in second.nodes] == [(0, 1), (2, 3), (4, 5)]
+    assert second.get_supported_dofs() == [0, 1, 3]
+
+
+def test_set_nodal_displacements_scatters_to_nodes(three_bar_truss: Truss):
+    three_bar_truss.set_nodal_displacements()
+    free_displacements = three_bar_truss.solve_for_displacements().ravel()
+    n1, n2, n3 = three_bar_truss.nodes
+    assert n1.nodal_displacements == NodalDisplacement(0, 0)
+    assert n2.nodal_displacements.y == 0
+    assert np.allclose(
+        [n2.nodal_displacements.x, n3.nodal_displacements.x],
+        free_displacements[[0, 1]],
+    )
+    assert n3.nodal_displacements.y == pytest.approx(free_displacements[2])
+
+
+def test_solve_load_cases_matches_single_solves(three_bar_truss: Truss):
+    forces = np.zeros((6, 3))
+    forces[4, 0] = 100e3
+    forces[5, 1] = -50e3
+    forces[[4, 5], 2] = [20e3, 30e3]
+    results = three_bar_truss.solve_load_cases(forces)
+    assert results.number_of_cases == 3
+
+    for case in range(3):
+        three_bar_truss.nodes[2].force = NodalForce(*forces[[4, 5], case])
+        three_bar_truss.set_nodal_displacements()
+        three_bar_truss.set_element_stresses()
+        assert np.allclose(
+            results.displacements[:, case],
+            [
+                displacement
+                for node in three_bar_truss.nodes
+                for displacement in astuple(node.nodal_displacements)
+            ],
+        )
+        assert np.allclose(
+            results.stresses[:, case],
+            [element.get_stress() for element in three_bar_truss.elements],
+        )
+        assert np.allclose(
+            results.reactions[:, case], three_bar_truss.get_reactions()
+        )
+
+
+def test_iter_load_cases_streams_results(sparse_three_bar_truss: Truss):
+    forces = np.zeros((6, 2))
+    forces[4, 0] = 100e3
+    forces[5, 1] = -50e3
+    block = sparse_three_bar_truss.solve_load_cases(forces)
+    streamed = list(sparse_three_bar_truss.iter_load_cases(forces.T))
+    for case, results in enumerate(streamed):
+        assert np.allclose(
+            results.displacements[:, 0], block.displacements[:, case]
+        )
+
+
+def test_changing_forces_keeps_factorization(three_bar_truss: Truss):
+    factorization = three_bar_truss.factorize()
+    three_bar_truss.nodes[2].force = NodalForce(0, -10e3)
+    three_bar_truss.set_nodal_displacements()
+    assert three_bar_truss.factorize() is factorization
+    assert three_bar_truss.cache_stats.entry_misses["factorization"] == 1
+    assert three_bar_truss.cache_stats.entry_hits["factorization"] == 2
+
+
+def test_node_values_change_by_assignment(three_bar_truss: Truss):
+    node = three_bar_truss.nodes[2]
+    with pytest.raises(FrozenInstanceError):
+        node.force.fy = -5e4  # type: ignore[misc]
+    assert node.force == NodalForce(100e3, 0)
+
+    node.force = NodalForce(100e3, -5e4)
+    assert np.array_equal(three_bar_truss.node_store.forces[2], (1e5, -5e4))
+    three_bar_truss.set_nodal_displacements()
+    three_bar_truss.set_reactions()
+    with pytest.raises(FrozenInstanceError):
+        node.nodal_displacements.x = 0  # type: ignore[misc]
+    with pytest.raises(FrozenInstanceError):
+        three_bar_truss.nodes[0].reaction.fx = 0  # type: ignore[misc]
+    assert sum(
+        three_bar_truss.nodes[i].reaction.fy for i in range(2)
+    ) == pytest.approx(5e4)
+
+
+def test_changing_stiffness_invalidates_factorization(
+    three_bar_truss: Truss,
+):
+    displacements = three_bar_truss.solve_for_displacements()
+    factorization = three_bar_truss.factorize()
+
+    three_bar_truss.elements[2].area *= 2
+    assert three_bar_truss.factorize() is not factorization
+    assert not np.allclose(
+        three_bar_truss.solve_for_displacements(), displacements
+    )
+
+    factorization = three_bar_truss.factorize()
+    three_bar_truss.nodes[1].boundary_condition = FullyRestricted()
+    assert three_bar_truss.factorize() is not factorization
+    assert three_bar_truss.solve_for_displacements().shape == (2, 1)
+
+
+@pytest.mark.parametrize("sparse", [False, True])
+def test_settlement_keeps_equilibrium(sparse: bool):
+    truss = build_three_bar_truss(sparse=sparse)
+    truss.nodes[1].settlement = NodalDisplacement(0, -0.01)
+    truss.set_nodal_displacements()
+    assert truss.nodes[1].nodal_displacements.y == -0.01
+
+    r1x, r1y, r2y = truss.get_reactions()
+    assert r1x + 100e3 == pytest.approx(0, abs=1e-6)
+    assert r1y + r2y == pytest.approx(0, abs=1e-6)
+
+    results = truss.solve_load_cases(truss.get_force_vector())
+    assert np.allclose(results.reactions[:, 0], [r1x, r1y, r2y])
+
+
+@pytest.mark.parametrize("sparse", [False, True])
+def test_stiff_spring_acts_as_support(sparse: bool):
+    restrained = build_three_bar_truss(sparse=sparse)
+    restrained.set_nodal_displacements()
+
+    elastic = build_three_bar_truss(sparse=sparse)
+    elastic.nodes[1].boundary_condition = FreeMoving()
+    elastic.nodes[1].spring = SpringSupport(ky=1e18)
+    elastic.set_nodal_displacements()
+
+    assert np.allclose(
+        elastic.node_store.displacements,
+        restrained.node_store.displacements,
+        atol=1e-9,
+    )
+    assert elastic.get_free_dofs() == [2, 3, 4, 5]
+
+
+def test_set_reactions_writes_supported_nodes(three_bar_truss: Truss):
+    three_bar_truss.set_nodal_displacements()
+    three_bar_truss.set_reactions()
+    r1x, r1y, r2y = three_bar_truss.get_reactions()
+    n1, n2, n3 = three_bar_truss.nodes
+    assert astuple(n1.reaction) == pytest.approx((r1x, r1y))
+    assert astuple(n2.reaction) == pytest.approx((0, r2y))
+    assert astuple(n3.reaction) == (0, 0)
+
+
+def test_from_arrays_round_trip(three_bar_truss: Truss):
+    rebuilt = Truss.from_arrays(three_bar_truss.to_arrays(), sparse=True)
+    assert np.allclose(
+        rebuilt.solve_for_displacements(),
+        three_bar_truss.solve_for_displacements(),
+    )
+    node = rebuilt.nodes[2]
+    assert (node.x, node.y) == (4, 6)
+    assert rebuilt.nodes[-1] is node
+    assert rebuilt.elements[1].node2 is node
+    assert rebuilt.elements[1].area == pytest.approx(2300e-6)
+
+
+@pytest.mark.parametrize("sparse", [False, True])
+def test_spring_reactions_balance_the_loads(sparse: bool):
+    truss = build_three_bar_truss(sparse=sparse)
+    truss.nodes[1].boundary_condition = FreeMoving()
+    truss.nodes[1].spring = SpringSupport(ky=1e9)
+    truss.set_nodal_displacements()
+    truss.set_reactions()
+
+    assert truss.get_supported_dofs() == [0, 1, 3]
+    r1x, r1y, r2y = truss.get_reactions()
+    assert (r1x, r1y, r2y) == pytest.approx((-100e3, -150e3, 150e3))
+    assert r2y == pytest.approx(-1e9 * truss.nodes[1].nodal_displacements.y)
+    assert np.allclose(
+        truss.node_store.reactions.sum(axis=0)
+        + truss.node_store.forces.sum(axis=0),
+        0,
+        atol=1e-6,
+    )
+
+    results = truss.solve_load_cases(truss.node_store.forces.ravel())
+    assert np.allclose(results.reactions[:, 0], [r1x, r1y, r2y])
@@ -0,0 +1,113 @@
+import numpy as np
+import pytest
+from src.models.node import NodalDisplacement
+from src.models.updates import LowRankUpdatedFactorization
+
+
+@pytest.fixture
+def reference_displacements(make_girder):
+    def solve(**changes) -> np.ndarray:
+        truss = make_girder(10, braced=True, sparse=True)
+        for index, area in changes.items():
+            truss.elements[int(index[1:])].area = area
+        return truss.solve_for_displacements()
+
+    return solve
+
+
+@pytest.mark.parametrize("sparse", [False, True])
+def test_low_rank_update_matches_refactorization(
+    sparse: bool, make_girder, reference_displacements
+):
+    truss = make_girder(10, braced=True, sparse=sparse)
+    truss.solve_for_displacements()
+    factorization = truss.update_elements([3, 25], area=[2e-3, 5e-4])
+
+    assert isinstance(factorization, LowRankUpdatedFactorization)
+    assert factorization.rank == 2
+    assert truss.factorize() is factorization
+    assert np.allclose(
+        truss.solve_for_displacements(),
+        reference_displacements(e3=2e-3, e25=5e-4),
+    )
+
+    truss.update_elements(7, area=3e-3)
+    assert truss.factorize().rank == 3
+    assert np.allclose(
+        truss.solve_for_displacements(),
+        reference_displacements(e3=2e-3, e25=5e-4, e7=3e-3),
+    )
+
+
+def test_removed_member_matches_zero_area(
+    make_girder, reference_displacements
+):
+    truss = make_girder(10, braced=True)
+    truss.update_elements(45, remove=True)
+    assert truss.elements[45].area == 0
+    assert np.allclose(
+        truss.solve_for_displacements(), reference_displacements(e45=0)
+    )
+
+
+def test_repeated_indices_are_rejected(make_girder, reference_displacements):
+    truss = make_girder(10, braced=True)
+    truss.solve_for_displacements()
+    with pytest.raises(ValueError):
+        truss.update_elements([3, 3], area=2e-3)
+
+    assert truss.elements[3].area == 1e-3
+    assert not isinstance(truss.factorize(), LowRankUpdatedFactorization)
+    assert np.allclose(
+        truss.solve_for_displacements(), reference_displacements()
+    )
+
+
+def test_refactorizes_after_max_updates(make_girder):
+    truss = make_girder(10, braced=True)
+    truss.update_elements([1, 2], area=2e-3, max_updates=3)
+    factorization = truss.update_elements([4, 5], area=2e-3, max_updates=3)
+    assert not isinstance(factorization, LowRankUpdatedFactorization)
+    assert truss.factorize() is factorization
+
+
+def test_refactorizes_on_drift(make_girder):
+    truss = make_girder(10, braced=True)
+    factorization = truss.update_elements(1, area=2e-3, drift_tolerance=0)
+    assert not isinstance(factorization, LowRankUpdatedFactorization)
+
+
+@pytest.mark.parametrize("sparse", [False, True])
+def test_update_refreshes_the_system_without_assembly(
+    sparse: bool, make_girder
+):
+    truss = make_girder(10, braced=True, sparse=sparse)
+    truss.nodes[-1].settlement = NodalDisplacement(0, -1e-3)
+    truss.set_nodal_displacements()
+    stats = truss.cache_stats
+    misses = {
+        name: stats.entry_misses.get(name, 0)
+        for name in ("stiffness", "partition")
+    }
+
+    truss.update_elements([3, 25], area=[2e-3, 5e-4])
+    truss.update_elements(7, area=3e-3, max_updates=2)
+    truss.set_nodal_displacements()
+    truss.set_reactions()
+    assert {
+        name: stats.entry_misses.get(name, 0)
+        for name in ("stiffness", "partition")
+    } == misses
+
+    reference = make_girder(10, braced=True, sparse=sparse)
+    reference.nodes[-1].settlement = NodalDisplacement(0, -1e-3)
+    for index, area in ((3, 2e-3), (25, 5e-4), (7, 3e-3)):
+        reference.elements[index].area = area
+    reference.set_nodal_displacements()
+    reference.set_reactions()
+    assert np.allclose(
+        truss.node_store.displacements, reference.node_store.displacements
+    )
+    assert np.allclose(
+        truss.node_store.reactions, reference.node_store.reactions
+    )